@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'priority', 'attempts', 'run_after', 'created_time')
+    list_filter = ('status', 'name')
+    readonly_fields = ('created_time', 'started_at', 'finished_at', 'worker')
@@ -0,0 +1,63 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.process import work_in_process
+from jobs.worker import requeue_stale_jobs, work
+
+
+class Command(BaseCommand):
+    help = "Lance les workers qui exécutent les tâches de fond de la table Job (sans broker externe)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=2, help="Nombre de workers")
+        parser.add_argument(
+            '--mode', choices=['thread', 'process'], default='thread',
+            help="Workers sous forme de threads ou de processus"
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Attente (s) quand la file est vide")
+        parser.add_argument('--once', action='store_true', help="Vide la file puis s'arrête")
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"{requeued} tâche(s) abandonnée(s) remise(s) en file")
+
+        if options['mode'] == 'process':
+            # Les connexions ne doivent pas être partagées avec les processus enfants
+            connections.close_all()
+            stop_event = multiprocessing.Event()
+            worker_class = multiprocessing.Process
+            target = work_in_process
+        else:
+            stop_event = threading.Event()
+            worker_class = threading.Thread
+            target = work
+
+        workers = [
+            worker_class(
+                target=target,
+                args=(stop_event, options['poll_interval'], options['once']),
+                name=f"worker-{i}",
+            )
+            for i in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"{len(workers)} worker(s) démarré(s) en mode {options['mode']}")
+
+        def stop(signum, frame):
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            stop_event.set()
+            for worker in workers:
+                worker.join()
+        self.stdout.write(self.style.SUCCESS("Workers arrêtés"))
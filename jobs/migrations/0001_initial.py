@@ -0,0 +1,44 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Tâche')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Paramètres')),
+                ('status', models.CharField(choices=[('queued', 'En attente'), ('running', 'En cours'), ('succeeded', 'Terminée'), ('failed', 'Échouée')], default='queued', max_length=10, verbose_name='Statut')),
+                ('priority', models.SmallIntegerField(default=0, verbose_name='Priorité')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Tentatives')),
+                ('max_attempts', models.PositiveSmallIntegerField(default=3, verbose_name='Tentatives maximum')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Exécuter après')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Résultat')),
+                ('error', models.TextField(blank=True, verbose_name='Erreur')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('created_time', models.DateTimeField(auto_now_add=True, verbose_name='Date de création')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Démarrée le')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminée le')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL, verbose_name='Demandée par')),
+            ],
+            options={
+                'verbose_name': 'Tâche de fond',
+                'verbose_name_plural': 'Tâches de fond',
+                'ordering': ['-created_time'],
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['-priority', 'run_after', 'id'], name='job_queue_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+# Create your models here.
+
+
+class Job(models.Model):
+    """Tâche de fond stockée en base, exécutée par manage.py runworker."""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'En attente'),
+        (RUNNING, 'En cours'),
+        (SUCCEEDED, 'Terminée'),
+        (FAILED, 'Échouée'),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name="Tâche")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Paramètres")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, verbose_name="Statut")
+    # Plus la priorité est élevée, plus la tâche est prise tôt
+    priority = models.SmallIntegerField(default=0, verbose_name="Priorité")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Tentatives")
+    max_attempts = models.PositiveSmallIntegerField(default=3, verbose_name="Tentatives maximum")
+    run_after = models.DateTimeField(default=timezone.now, verbose_name="Exécuter après")
+    result = models.JSONField(null=True, blank=True, verbose_name="Résultat")
+    error = models.TextField(blank=True, verbose_name="Erreur")
+    worker = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        verbose_name="Demandée par"
+    )
+    created_time = models.DateTimeField(auto_now_add=True, verbose_name="Date de création")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Démarrée le")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Terminée le")
+
+    class Meta:
+        verbose_name = "Tâche de fond"
+        verbose_name_plural = "Tâches de fond"
+        ordering = ['-created_time']
+        indexes = [
+            # Index partiel de la file : seules les tâches en attente sont parcourues par les workers
+            models.Index(
+                fields=['-priority', 'run_after', 'id'],
+                condition=models.Q(status='queued'),
+                name='job_queue_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.get_status_display()})"
@@ -0,0 +1,20 @@
+"""
+Point d'entrée des workers lancés en processus (runworker --mode process).
+
+Avec les méthodes de démarrage spawn et forkserver (macOS, Windows), l'enfant
+repart d'un interpréteur vierge et importe sa cible avant toute initialisation :
+ce module n'importe donc aucun modèle au niveau du module, et Django est
+initialisé dans l'enfant avant d'importer la boucle des workers.
+"""
+import django
+
+
+def work_in_process(stop_event, poll_interval=1.0, once=False):
+    django.setup()
+    from django.db import connections
+
+    # Avec fork, les connexions héritées du parent ne doivent pas être réutilisées
+    connections.close_all()
+
+    from .worker import work
+    work(stop_event, poll_interval, once)
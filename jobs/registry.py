@@ -0,0 +1,50 @@
+"""
+Registre des tâches de fond et mise en file.
+
+Usage dans le module tasks.py d'une application :
+
+    @task('projects.purge_deleted')
+    def purge(days=30):
+        ...
+
+    enqueue('projects.purge_deleted', {'days': 30}, priority=-10)
+"""
+from django.utils import timezone
+
+from .models import Job
+
+_tasks = {}
+
+
+def task(name):
+    """Décorateur enregistrant une fonction comme tâche de fond sous le nom `name`."""
+    def decorator(func):
+        if name in _tasks and _tasks[name] is not func:
+            raise ValueError(f"La tâche '{name}' est déjà enregistrée")
+        _tasks[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise LookupError(f"Tâche inconnue : '{name}'") from None
+
+
+def enqueue(name, payload=None, priority=0, user=None, max_attempts=3, run_after=None):
+    """
+    Ajoute une tâche dans la file et renvoie le Job créé.
+    Dans une transaction, la tâche n'est visible des workers qu'après le commit.
+    """
+    get_task(name)
+    return Job.objects.create(
+        name=name,
+        payload=payload or {},
+        priority=priority,
+        user=user,
+        max_attempts=max_attempts,
+        run_after=run_after or timezone.now(),
+    )
+
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            'id',
+            'name',
+            'status',
+            'priority',
+            'attempts',
+            'max_attempts',
+            'result',
+            'error',
+            'created_time',
+            'started_at',
+            'finished_at'
+        ]
+        read_only_fields = fields
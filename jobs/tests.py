@@ -0,0 +1,109 @@
+import threading
+from unittest import mock
+
+from colorama import Fore, Style
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from projects.tests import print_result, print_step, print_test_header, say
+
+from .models import Job
+from .registry import enqueue, task
+from .worker import JOB_REQUEUE_INTERVAL, JOB_TIMEOUT, claim_next_job, requeue_stale_jobs, run_pending, work
+
+
+@task('tests.always_fail')
+def always_fail():
+    raise RuntimeError("Échec volontaire")
+
+
+class JobQueueTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS FILE DE TÂCHES{Style.RESET_ALL}\n")
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+
+    def test_01_retry_then_fail(self):
+        """Test les nouvelles tentatives puis l'échec définitif d'une tâche"""
+        try:
+            job = enqueue('tests.always_fail', max_attempts=2)
+
+            print_step("Première tentative : la tâche est replanifiée")
+            with self.assertLogs('jobs.worker', level='ERROR'):
+                run_pending()
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+            self.assertGreater(job.run_after, timezone.now())
+
+            print_step("Seconde tentative : la tâche échoue définitivement")
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            with self.assertLogs('jobs.worker', level='ERROR'):
+                run_pending()
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+            self.assertIn("Échec volontaire", job.error)
+            print_result(True, "La tâche est réessayée puis marquée en échec")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_priority_order(self):
+        """Test que les tâches prioritaires sont exécutées en premier"""
+        try:
+            low = enqueue('projects.purge_deleted', priority=-5)
+            high = enqueue('projects.purge_deleted', priority=5)
+
+            print_step("Réservation de la prochaine tâche")
+            self.assertEqual(claim_next_job('test').pk, high.pk)
+            self.assertEqual(claim_next_job('test').pk, low.pk)
+            self.assertIsNone(claim_next_job('test'))
+            print_result(True, "Les tâches sont réservées par priorité décroissante")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_requeue_stale_jobs(self):
+        """Test la reprise des tâches abandonnées et l'échec de celles qui ont épuisé leurs tentatives"""
+        try:
+            print_step("Deux tâches réservées par un worker arrêté, dont une à sa dernière tentative")
+            retried = enqueue('projects.purge_deleted', max_attempts=3)
+            exhausted = enqueue('projects.purge_deleted', max_attempts=1)
+            claim_next_job('test')
+            claim_next_job('test')
+            Job.objects.update(started_at=timezone.now() - JOB_TIMEOUT * 2)
+
+            with self.assertLogs('jobs.worker', level='ERROR'):
+                self.assertEqual(requeue_stale_jobs(), 1)
+            retried.refresh_from_db()
+            exhausted.refresh_from_db()
+            self.assertEqual(retried.status, Job.QUEUED)
+            self.assertEqual(exhausted.status, Job.FAILED)
+            self.assertIsNotNone(exhausted.finished_at)
+            print_result(True, "Seules les tâches ayant encore des tentatives sont remises en file")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_04_worker_requeues_periodically(self):
+        """Test la reprise périodique des tâches abandonnées par la boucle des workers"""
+        try:
+            print_step("Trois tours de boucle : au démarrage, avant puis après l'intervalle")
+            interval = JOB_REQUEUE_INTERVAL.total_seconds()
+            stop_event = mock.Mock(spec=threading.Event)
+            stop_event.is_set.side_effect = [False, False, False, True]
+            with mock.patch('jobs.worker.requeue_stale_jobs', return_value=0) as requeue, \
+                    mock.patch('jobs.worker.time.monotonic', side_effect=[0, interval / 2, interval, interval]), \
+                    mock.patch('jobs.worker.close_old_connections'), \
+                    mock.patch('jobs.worker.connection'):
+                work(stop_event, poll_interval=0)
+            self.assertEqual(requeue.call_count, 2)
+            print_result(True, "Les tâches abandonnées sont reprises sans redémarrer les workers")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
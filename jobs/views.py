@@ -0,0 +1,19 @@
+from rest_framework import permissions, viewsets
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Statut des tâches de fond.
+    Un utilisateur ne voit que ses propres tâches, un administrateur les voit toutes.
+    """
+    serializer_class = JobSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_staff:
+            return Job.objects.all()
+        return Job.objects.filter(user=user)
@@ -0,0 +1,124 @@
+"""
+Boucle d'exécution des tâches de fond.
+
+Pas de broker externe : la file est la table Job. Une tâche est réservée par
+un UPDATE conditionnel (status='queued' -> 'running') ; si deux workers visent
+la même ligne, un seul voit une ligne modifiée.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+# Durée au-delà de laquelle une tâche "running" est considérée comme abandonnée (worker arrêté)
+JOB_TIMEOUT = getattr(settings, 'JOB_TIMEOUT', timedelta(hours=1))
+# Délai de base entre deux tentatives, doublé à chaque échec
+JOB_RETRY_DELAY = getattr(settings, 'JOB_RETRY_DELAY', timedelta(seconds=10))
+# Fréquence à laquelle chaque worker reprend les tâches abandonnées par un worker arrêté
+JOB_REQUEUE_INTERVAL = getattr(settings, 'JOB_REQUEUE_INTERVAL', timedelta(minutes=1))
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+
+def claim_next_job(worker_id):
+    """Réserve la prochaine tâche prête (priorité décroissante) et la renvoie, ou None."""
+    now = timezone.now()
+    candidates = (
+        Job.objects.filter(status=Job.QUEUED, run_after__lte=now)
+        .order_by('-priority', 'run_after', 'id')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidates:
+        claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING, started_at=now, worker=worker_id, attempts=F('attempts') + 1
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """Exécute une tâche réservée et enregistre son résultat, ou la replanifie en cas d'échec."""
+    try:
+        result = get_task(job.name)(**job.payload)
+    except Exception:
+        logger.exception("Échec de la tâche %s", job)
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + JOB_RETRY_DELAY * 2 ** (job.attempts - 1)
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.SUCCEEDED
+        job.result = result
+        job.error = ''
+        job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'run_after', 'finished_at'])
+    return job
+
+
+def requeue_stale_jobs():
+    """
+    Remet en file les tâches restées "running" trop longtemps. Celles qui ont épuisé
+    leurs tentatives (une tâche qui arrête son worker à chaque exécution) sont
+    marquées en échec au lieu d'être relancées indéfiniment.
+    """
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=now - JOB_TIMEOUT)
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status=Job.FAILED, finished_at=now, error="Worker arrêté pendant l'exécution : tentatives épuisées"
+    )
+    if failed:
+        logger.error("%d tâche(s) abandonnée(s) marquée(s) en échec", failed)
+    return stale.update(status=Job.QUEUED)
+
+
+def run_pending(max_jobs=None):
+    """Exécute les tâches prêtes jusqu'à épuisement de la file. Renvoie le nombre exécuté."""
+    worker_id = worker_name()
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        job = claim_next_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
+
+
+def work(stop_event, poll_interval=1.0, once=False):
+    """
+    Boucle d'un worker : exécute les tâches disponibles puis attend `poll_interval` secondes.
+    Les tâches abandonnées sont reprises toutes les JOB_REQUEUE_INTERVAL, sans attendre
+    le redémarrage des workers.
+    """
+    last_requeue = None
+    try:
+        while not stop_event.is_set():
+            close_old_connections()
+            if last_requeue is None or time.monotonic() - last_requeue >= JOB_REQUEUE_INTERVAL.total_seconds():
+                requeue_stale_jobs()
+                last_requeue = time.monotonic()
+            run_pending()
+            if once:
+                break
+            stop_event.wait(poll_interval)
+    finally:
+        connection.close()
@@ -0,0 +1,231 @@
+"""
+Historique d'activité des projets (qui a changé le statut d'une issue, ajouté un contributeur...).
+
+Les vues appellent record() depuis leurs hooks perform_* ; l'événement n'est
+retenu qu'au commit de la transaction, puis placé dans un tampon du processus.
+Le tampon est écrit en un seul INSERT multi-lignes quand il atteint
+ACTIVITY_BUFFER_SIZE événements, sinon ACTIVITY_FLUSH_INTERVAL secondes après
+son premier événement (minuteur en arrière-plan, même si le processus ne reçoit
+plus de requêtes) et à l'arrêt normal du processus : les écritures de l'API ne
+paient pas un INSERT par événement. Contrepartie : un processus tué brutalement
+perd son tampon (ACTIVITY_BUFFER_SIZE=1 écrit à chaque commit).
+
+Les identifiants sont attribués à l'écriture du lot, pas à l'événement :
+l'historique est trié par created_at (heure de l'événement), puis par id.
+
+Stockage compact : verbe en entier (ActivityVerb), différences empaquetées
+sous des clés courtes, statut/priorité/tag en entiers, textes longs réduits
+à un indicateur de modification. Les événements plus vieux que
+ACTIVITY_HOT_DAYS sont déplacés par lots vers ActivityArchive
+(manage.py archive_activity) : la table chaude reste petite.
+"""
+import atexit
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .deletion import DELETE_BATCH_SIZE
+from .models import ActivityArchive, ActivityEvent, ActivityVerb
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_BUFFER_SIZE = getattr(settings, 'ACTIVITY_BUFFER_SIZE', 100)
+ACTIVITY_FLUSH_INTERVAL = getattr(settings, 'ACTIVITY_FLUSH_INTERVAL', 2.0)
+ACTIVITY_HOT_DAYS = getattr(settings, 'ACTIVITY_HOT_DAYS', 90)
+
+
+def background_flush_enabled():
+    # Lu à chaque appel : le lanceur de tests le désactive après l'import du module
+    return getattr(settings, 'ACTIVITY_BACKGROUND_FLUSH', True)
+
+# Codes entiers des valeurs à choix (ne jamais renuméroter : les événements stockés en dépendent)
+VALUE_CODES = {
+    'status': {'To Do': 1, 'In Progress': 2, 'Finished': 3},
+    'priority': {'LOW': 1, 'MEDIUM': 2, 'HIGH': 3},
+    'tag': {'BUG': 1, 'FEATURE': 2, 'TASK': 3},
+    'type': {'back-end': 1, 'front-end': 2, 'iOS': 3, 'Android': 4},
+}
+VALUE_NAMES = {field: {code: value for value, code in codes.items()} for field, codes in VALUE_CODES.items()}
+
+# Champ suivi -> clé courte dans `changes`
+FIELD_KEYS = {
+    'status': 's',
+    'priority': 'p',
+    'tag': 't',
+    'type': 'ty',
+    'assignee_id': 'a',
+    'title': 'ti',
+    'description': 'd',
+}
+KEY_FIELDS = {key: field for field, key in FIELD_KEYS.items()}
+# Textes longs : seule la modification est notée, pas le contenu
+FLAG_FIELDS = {'description'}
+# Nombre d'issues d'un import en masse
+COUNT_KEY = 'n'
+
+
+def snapshot(instance):
+    """Valeurs des champs suivis avant une modification."""
+    return {field: getattr(instance, field) for field in FIELD_KEYS if hasattr(instance, field)}
+
+
+def pack_changes(before, instance):
+    """Différences entre `before` (snapshot) et l'instance, sous forme compacte ; None si rien ne change."""
+    changes = {}
+    for field, old in before.items():
+        new = getattr(instance, field)
+        if new == old:
+            continue
+        if field in FLAG_FIELDS:
+            changes[FIELD_KEYS[field]] = 1
+        elif field in VALUE_CODES:
+            codes = VALUE_CODES[field]
+            changes[FIELD_KEYS[field]] = [codes.get(old), codes.get(new)]
+        else:
+            changes[FIELD_KEYS[field]] = [old, new]
+    return changes or None
+
+
+def unpack_changes(changes):
+    """Forme lisible : {"status": ["To Do", "Finished"], "description": true, "count": 120}."""
+    if not changes:
+        return None
+    readable = {}
+    for key, value in changes.items():
+        if key == COUNT_KEY:
+            readable['count'] = value
+            continue
+        field = KEY_FIELDS.get(key, key)
+        if field in FLAG_FIELDS:
+            readable[field] = True
+        elif field in VALUE_NAMES:
+            readable[field] = [VALUE_NAMES[field].get(code) for code in value]
+        else:
+            readable[field.removesuffix('_id')] = value
+    return readable
+
+
+class ActivityBuffer:
+    """Tampon d'événements du processus, écrit par lots."""
+
+    def __init__(self, size, interval):
+        self.size = size
+        self.interval = interval
+        self._events = []
+        self._oldest = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, event):
+        with self._lock:
+            self._events.append(event)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                self._schedule()
+            full = len(self._events) >= self.size
+        if full:
+            self.flush()
+
+    def _schedule(self):
+        """Minuteur de vidage armé au premier événement d'un lot (appelé sous le verrou)."""
+        if not background_flush_enabled():
+            return
+        self._timer = threading.Timer(self.interval, self._flush_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_in_background(self):
+        try:
+            self.flush()
+        finally:
+            # Connexions propres au thread du minuteur
+            connections.close_all()
+
+    def is_stale(self):
+        oldest = self._oldest
+        return oldest is not None and time.monotonic() - oldest >= self.interval
+
+    def flush(self):
+        """Écrit les événements en attente ; renvoie leur nombre."""
+        with self._lock:
+            events, self._events, self._oldest = self._events, [], None
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        if not events:
+            return 0
+        try:
+            ActivityEvent.objects.bulk_create(events, batch_size=DELETE_BATCH_SIZE)
+        except Exception:
+            # La modification elle-même est déjà validée : l'historique ne doit pas la faire échouer
+            logger.exception("Écriture de %d événement(s) d'activité impossible", len(events))
+            return 0
+        return len(events)
+
+
+_buffer = ActivityBuffer(ACTIVITY_BUFFER_SIZE, ACTIVITY_FLUSH_INTERVAL)
+
+
+def record(project_id, actor, verb, object_id, changes=None):
+    """Ajoute un événement à l'historique, au commit de la transaction en cours."""
+    event = ActivityEvent(
+        project_id=project_id,
+        actor_id=actor.pk if actor is not None and actor.is_authenticated else None,
+        verb=verb,
+        object_id=object_id,
+        changes=changes,
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(lambda: _buffer.add(event))
+
+
+def record_update(project_id, actor, verb, instance, before):
+    """Événement de modification, seulement si un champ suivi a changé."""
+    changes = pack_changes(before, instance)
+    if changes:
+        record(project_id, actor, verb, instance.pk, changes)
+
+
+def record_import(project_id, actor, count):
+    record(project_id, actor, ActivityVerb.ISSUES_IMPORTED, project_id, {COUNT_KEY: count})
+
+
+def flush_activity():
+    return _buffer.flush()
+
+
+@receiver(request_finished)
+def flush_stale_activity(sender, **kwargs):
+    if _buffer.is_stale():
+        _buffer.flush()
+
+
+@atexit.register
+def flush_activity_at_exit():
+    if background_flush_enabled():
+        _buffer.flush()
+
+
+def archive_activity(days=None, batch_size=None):
+    """Déplace par lots vers ActivityArchive les événements plus vieux que `days` jours."""
+    cutoff = timezone.now() - timedelta(days=ACTIVITY_HOT_DAYS if days is None else days)
+    batch_size = batch_size or DELETE_BATCH_SIZE
+    columns = [field.attname for field in ActivityEvent._meta.concrete_fields]
+    moved = 0
+    while True:
+        rows = list(
+            ActivityEvent.objects.filter(created_at__lt=cutoff).order_by('id').values(*columns)[:batch_size]
+        )
+        if not rows:
+            return moved
+        with transaction.atomic():
+            ActivityArchive.objects.bulk_create([ActivityArchive(**row) for row in rows], ignore_conflicts=True)
+            ActivityEvent.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+        moved += len(rows)
@@ -1,22 +1,83 @@
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.html import format_html
 
-from .models import Contributor, Project
+from softdesk.admin_tools import LargeTableAdmin, PaginatedTabularInline, SoftDeleteAdminMixin, related_id_filter
 
+from .models import Comment, Contributor, Issue, Project
 
-class ContributorInline(admin.TabularInline):
+# Toutes les clés étrangères passent par des widgets d'autocomplétion (recherche paginée)
+# au lieu de listes déroulantes chargeant toute la table liée.
+
+
+class ContributorInline(PaginatedTabularInline):
     model = Contributor
     extra = 1
     readonly_fields = ('created_time',)
+    autocomplete_fields = ('user',)
+
+    def get_queryset(self, request):
+        # __str__ (ligne "original" de l'inline) lit user et project
+        return super().get_queryset(request).select_related('user', 'project')
+
+
+class CommentInline(PaginatedTabularInline):
+    model = Comment
+    fields = ('description', 'author', 'created_time', 'deleted_at')
+    readonly_fields = ('created_time', 'deleted_at')
+    autocomplete_fields = ('author',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author', 'issue')
 
 
 @admin.register(Project)
-class ProjectAdmin(admin.ModelAdmin):
-    list_display = ('title', 'type', 'author', 'created_time')
+class ProjectAdmin(SoftDeleteAdminMixin, LargeTableAdmin):
+    list_display = ('title', 'type', 'author', 'created_time', 'deleted_at', 'issues_link')
+    list_select_related = ('author',)
+    list_filter = ('type', ('deleted_at', admin.EmptyFieldListFilter), related_id_filter('author', "auteur"))
     search_fields = ('title', 'description')
-    inlines = [ContributorInline]  
+    autocomplete_fields = ('author',)
+    readonly_fields = ('deleted_at',)
+    inlines = [ContributorInline]
+
+    @admin.display(description="Issues")
+    def issues_link(self, obj):
+        return format_html('<a href="{}?project={}">Issues</a>', reverse('admin:projects_issue_changelist'), obj.pk)
 
 
 @admin.register(Contributor)
-class ContributorAdmin(admin.ModelAdmin):
+class ContributorAdmin(LargeTableAdmin):
     list_display = ('user', 'project', 'created_time')
-    list_filter = ('project', 'user')
+    list_select_related = ('user', 'project')
+    list_filter = (related_id_filter('project', "projet"), related_id_filter('user', "utilisateur"))
+    search_fields = ('user__username', 'project__title')
+    autocomplete_fields = ('user', 'project')
+
+
+@admin.register(Issue)
+class IssueAdmin(SoftDeleteAdminMixin, LargeTableAdmin):
+    list_display = ('title', 'project', 'status', 'priority', 'tag', 'author', 'assignee', 'created_time', 'deleted_at')
+    list_select_related = ('project', 'author', 'assignee')
+    list_filter = (
+        'status', 'priority', 'tag', ('deleted_at', admin.EmptyFieldListFilter),
+        related_id_filter('project', "projet"), related_id_filter('assignee', "assigné"),
+    )
+    search_fields = ('title',)
+    autocomplete_fields = ('project', 'author', 'assignee')
+    readonly_fields = ('created_time', 'deleted_at')
+    inlines = [CommentInline]
+
+
+@admin.register(Comment)
+class CommentAdmin(SoftDeleteAdminMixin, LargeTableAdmin):
+    list_display = ('uuid', 'issue', 'author', 'created_time', 'deleted_at')
+    list_select_related = ('issue', 'author')
+    list_filter = (
+        ('deleted_at', admin.EmptyFieldListFilter),
+        related_id_filter('issue', "issue"), related_id_filter('author', "auteur"),
+    )
+    # Recherche exacte par uuid (index unique) : pas de LIKE sur la description
+    search_fields = ('=uuid',)
+    autocomplete_fields = ('issue', 'author')
+    readonly_fields = ('uuid', 'created_time', 'deleted_at')
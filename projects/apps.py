@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        # Branche les receveurs du cache des représentations, de la dénormalisation et de l'historique
+        from . import activity, caching, denormalization  # noqa: F401
@@ -0,0 +1,113 @@
+"""
+Outils communs aux commandes de benchmark (manage.py bench_*).
+"""
+import statistics
+import threading
+import time
+
+from django.db import close_old_connections
+
+
+def percentile(samples, pct):
+    """Retourne le percentile `pct` (0-100) d'une liste de mesures."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Résume une série de durées (en secondes) en millisecondes."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+def measure(func, iterations, warmup=3):
+    """Exécute `func` plusieurs fois et renvoie le résumé des durées."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def format_summary(label, summary):
+    """Formate un résumé sur une ligne pour l'affichage console."""
+    throughput = f"{summary['throughput_rps']:.1f}/s " if 'throughput_rps' in summary else ''
+    return (
+        f"{label:<30} n={summary['count']:<5} {throughput}"
+        f"moy={summary['mean_ms']:.2f}ms p50={summary['p50_ms']:.2f}ms "
+        f"p95={summary['p95_ms']:.2f}ms p99={summary['p99_ms']:.2f}ms"
+    )
+
+
+def run_load(make_worker, iterations, concurrency=1):
+    """
+    Exécute `iterations` appels répartis sur `concurrency` threads.
+    `make_worker()` est appelé dans chaque thread et renvoie la fonction à mesurer
+    (chaque thread a ainsi son propre client et sa propre connexion).
+    Renvoie le résumé des latences, enrichi du débit (requêtes/s).
+    Une exception levée dans un thread (threading.Thread la perdrait) arrête ce
+    thread et est relevée une fois tous les threads terminés.
+    """
+    samples = []
+    errors = []
+    lock = threading.Lock()
+    per_thread = [iterations // concurrency + (i < iterations % concurrency) for i in range(concurrency)]
+
+    def worker(count):
+        local = []
+        try:
+            func = make_worker()
+            for _ in range(count):
+                start = time.perf_counter()
+                func()
+                local.append(time.perf_counter() - start)
+        except Exception as exc:
+            with lock:
+                errors.append(exc)
+        finally:
+            with lock:
+                samples.extend(local)
+            close_old_connections()
+
+    threads = [threading.Thread(target=worker, args=(count,)) for count in per_thread]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    wall = time.perf_counter() - start
+    summary = summarize(samples)
+    summary['throughput_rps'] = len(samples) / wall if wall else 0.0
+    return summary
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Compare des résultats à une référence. Renvoie la liste des régressions :
+    p95 plus lent ou débit plus faible que la référence au-delà de la tolérance.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if current['p95_ms'] > reference['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name} : p95 {current['p95_ms']:.2f}ms > {reference['p95_ms']:.2f}ms")
+        if current.get('throughput_rps', 0) < reference.get('throughput_rps', 0) * (1 - tolerance):
+            regressions.append(
+                f"{name} : débit {current['throughput_rps']:.1f}/s < {reference['throughput_rps']:.1f}/s"
+            )
+    return regressions
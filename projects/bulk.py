@@ -0,0 +1,83 @@
+"""
+Import en masse d'issues (POST /api/projects/{id}/issues/bulk/).
+
+Les éléments arrivent un à un depuis le parser en flux (softdesk.parsers).
+Chaque élément est validé puis écrit dans un fichier temporaire : la lecture
+réseau du corps (jusqu'à BULK_MAX_BODY_BYTES, au rythme du client) se fait
+hors transaction et ne retient pas le verrou d'écriture de la base. Une fois
+le corps entièrement lu et valide, les lignes du fichier sont insérées par
+paquets de BULK_CHUNK_SIZE (bulk_create) dans une transaction courte : un
+élément invalide annule l'import entier sans avoir rien écrit.
+Les contributeurs du projet sont chargés une seule fois pour valider les
+assignés, sans requête par élément.
+"""
+import json
+import tempfile
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from .denormalization import denormalization_enabled
+from .models import Contributor, Issue
+from .serializers import IssueSerializer
+
+BULK_CHUNK_SIZE = getattr(settings, 'BULK_CHUNK_SIZE', 500)
+
+
+class BulkIssueSerializer(IssueSerializer):
+    """Validation d'une issue importée : l'assigné est cherché parmi context['contributors']."""
+    assignee = serializers.IntegerField(source='assignee_id', required=False, allow_null=True)
+
+    class Meta(IssueSerializer.Meta):
+        fields = ['title', 'description', 'tag', 'priority', 'status', 'assignee']
+
+    def validate_assignee(self, value):
+        if value is not None and value not in self.context['contributors']:
+            raise serializers.ValidationError("L'utilisateur assigné doit être un contributeur du projet")
+        return value
+
+
+class BulkItemError(Exception):
+    """Élément invalide : l'import est annulé (la transaction est défaite avant la réponse)."""
+
+    def __init__(self, index, errors):
+        super().__init__(index, errors)
+        self.index = index
+        self.errors = errors
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_issues(project, author, items, chunk_size=None):
+    """Crée les issues décrites par `items` (itérable de dicts) ; renvoie le nombre d'issues créées."""
+    # user_id -> username : validation des assignés et valeurs dénormalisées
+    contributors = dict(Contributor.objects.filter(project=project).values_list('user_id', 'user__username'))
+    context = {'contributors': contributors}
+    with tempfile.TemporaryFile(mode='w+', encoding='utf-8') as spool:
+        for index, item in enumerate(items):
+            serializer = BulkIssueSerializer(data=item, context=context)
+            if not serializer.is_valid():
+                raise BulkItemError(index, serializer.errors)
+            spool.write(json.dumps(serializer.validated_data) + '\n')
+        spool.seek(0)
+
+        denormalize = denormalization_enabled()
+        created = 0
+        with transaction.atomic():
+            for chunk in chunked(spool, chunk_size or BULK_CHUNK_SIZE):
+                issues = []
+                for line in chunk:
+                    issue = Issue(project=project, author=author, **json.loads(line))
+                    if denormalize:
+                        issue.author_username = author.username
+                        issue.assignee_username = contributors.get(issue.assignee_id)
+                    issues.append(issue)
+                Issue.objects.bulk_create(issues)
+                created += len(issues)
+    return created
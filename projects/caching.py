@@ -0,0 +1,97 @@
+"""
+Cache des représentations sérialisées (détail d'un projet, détail d'une issue).
+
+Seul le contenu est partagé entre utilisateurs, sous la clé (modèle, pk) : le
+contrôle d'accès (queryset filtré par utilisateur) est refait à chaque requête
+par une simple requête EXISTS. Les entrées sont invalidées par les signaux
+post_save/post_delete/soft_deleted.
+
+Le backend est un alias de CACHES (OBJECT_CACHE_ALIAS, "objects" par défaut) :
+LocMemCache borné en LRU dans le processus, ou Redis/Memcached pour partager le
+cache et ses invalidations entre processus. La durée de vie est le TIMEOUT de l'alias.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.http import Http404
+from rest_framework.response import Response
+
+from softdesk.routers import primary_reads
+
+from .models import Issue, Project, soft_deleted
+
+OBJECT_CACHE_ALIAS = getattr(settings, 'OBJECT_CACHE_ALIAS', 'objects')
+
+
+def get_object_cache():
+    return caches[OBJECT_CACHE_ALIAS]
+
+
+def cache_key(model, pk):
+    return f'repr:{model._meta.label_lower}:{pk}'
+
+
+def invalidate(model, *pks):
+    if pks:
+        get_object_cache().delete_many([cache_key(model, pk) for pk in pks])
+
+
+class CachedRetrieveMixin:
+    """
+    Mixin de ModelViewSet : retrieve() sert la représentation mise en cache.
+
+    En cas de succès du cache, l'accès est vérifié par un EXISTS sur get_queryset() ;
+    en cas d'échec, retrieve() s'exécute normalement sur la base principale (jamais
+    sur un réplica en retard) et son résultat est mis en cache.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        if request.query_params:
+            # ?expand= etc. : représentation propre à la requête, non partagée
+            return super().retrieve(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            pk = queryset.model._meta.pk.to_python(lookup)
+        except ValidationError:
+            raise Http404
+        key = cache_key(queryset.model, pk)
+        object_cache = get_object_cache()
+
+        data = object_cache.get(key)
+        if data is not None:
+            if not queryset.filter(pk=pk).exists():
+                raise Http404
+            response = Response(data)
+            response['X-Object-Cache'] = 'HIT'
+            return response
+
+        with primary_reads():
+            response = super().retrieve(request, *args, **kwargs)
+        object_cache.set(key, response.data)
+        response['X-Object-Cache'] = 'MISS'
+        return response
+
+
+@receiver([post_save, post_delete, soft_deleted], sender=Project)
+@receiver([post_save, post_delete, soft_deleted], sender=Issue)
+def invalidate_instance(sender, instance, **kwargs):
+    invalidate(sender, instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(pre_delete, sender=get_user_model())
+def invalidate_user_issues(sender, instance, update_fields=None, **kwargs):
+    """Les issues embarquent author_username/assignee_username"""
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    if kwargs.get('created'):
+        return
+    pks = Issue.all_objects.filter(
+        models.Q(author=instance) | models.Q(assignee=instance)
+    ).values_list('pk', flat=True)
+    invalidate(Issue, *pks)
@@ -0,0 +1,76 @@
+"""
+Contrôle de concurrence optimiste des modifications (issues, commentaires).
+
+Le client annonce la version qu'il a lue, par l'en-tête If-Match (l'ETag
+renvoyé par le détail : "3", ou W/"3" après compression) ou par le champ
+"version" du corps. L'enregistrement est un UPDATE conditionnel sur cette
+version (VersionedModel) : si la ligne a changé entre-temps, la réponse est
+412 et le client relit avant de réessayer. Sans version annoncée, la
+modification s'applique à la dernière version (comportement historique).
+"""
+import re
+
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import VersionConflict
+
+ETAG = re.compile(r'(?:W/)?"([^"]*)"')
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "La ressource a été modifiée depuis sa lecture : relisez-la avant de réessayer."
+    default_code = 'precondition_failed'
+
+
+def parse_if_match(header):
+    """Version attendue d'après If-Match ; None pour "*" (n'importe quelle version)."""
+    if header.strip() == '*':
+        return None
+    tags = ETAG.findall(header)
+    if len(tags) > 1:
+        raise ValidationError({'If-Match': "Une seule version attendue"})
+    if not tags or not tags[0].isdigit():
+        # Aucune version ne peut correspondre à cet ETag
+        raise PreconditionFailed()
+    return int(tags[0])
+
+
+class OptimisticConcurrencyMixin:
+    """
+    Mixin de ModelViewSet : save_versioned() remplace serializer.save() dans
+    perform_update(), et les réponses de détail portent l'ETag de la version.
+    """
+
+    def get_expected_version(self):
+        header = self.request.headers.get('If-Match')
+        if header:
+            return parse_if_match(header)
+        data = self.request.data
+        version = data.get('version') if hasattr(data, 'get') else None
+        if version in (None, ''):
+            return None
+        try:
+            return int(version)
+        except (TypeError, ValueError):
+            raise ValidationError({'version': "Un entier est attendu"})
+
+    def save_versioned(self, serializer):
+        expected = self.get_expected_version()
+        if expected is not None:
+            # Version déjà dépassée à la lecture : inutile d'envoyer l'UPDATE. Sert aussi
+            # quand aucune colonne ne change (update() n'écrit alors rien)
+            if expected != serializer.instance.version:
+                raise PreconditionFailed()
+        try:
+            serializer.save()
+        except VersionConflict:
+            raise PreconditionFailed()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        data = getattr(response, 'data', None)
+        if response.status_code < 300 and isinstance(data, dict) and 'version' in data and 'id' in data:
+            response['ETag'] = f'"{data["version"]}"'
+        return response
@@ -0,0 +1,112 @@
+"""
+Suppression par lots des projets et des utilisateurs.
+
+Le collecteur de Django (on_delete=CASCADE) charge en mémoire tous les objets
+liés avant de les supprimer, dans une seule transaction. Ici on supprime les
+enfants en premier, par lots de clés primaires, chaque lot dans sa propre
+transaction : la mémoire et la taille des transactions restent bornées.
+
+Quand aucun receveur pre_delete/post_delete n'est branché sur un modèle, Django
+bascule de lui-même sur un DELETE direct (fast delete) sans charger les lignes ;
+dans le cas contraire les signaux sont envoyés normalement, lot par lot.
+
+Les lignes supprimées logiquement (deleted_at) sont incluses : ces fonctions
+servent aussi à la purge physique (manage.py purge_deleted).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import invalidate
+from .models import Comment, Contributor, Issue, Project, Tombstone
+
+DELETE_BATCH_SIZE = getattr(settings, 'DELETE_BATCH_SIZE', 500)
+# Délai (en jours) entre la suppression logique et la purge physique
+SOFT_DELETE_RETENTION_DAYS = getattr(settings, 'SOFT_DELETE_RETENTION_DAYS', 30)
+
+
+def delete_in_batches(queryset, batch_size=None):
+    """Supprime les lignes du queryset par lots et renvoie le nombre d'objets supprimés."""
+    batch_size = batch_size or DELETE_BATCH_SIZE
+    model = queryset.model
+    pks = queryset.order_by().values_list('pk', flat=True)
+    total = 0
+    while True:
+        batch = list(pks[:batch_size])
+        if not batch:
+            return total
+        with transaction.atomic():
+            deleted, _ = model._base_manager.filter(pk__in=batch).delete()
+        total += deleted
+
+
+def update_in_batches(queryset, batch_size=None, after_batch=None, **values):
+    """
+    Applique un UPDATE par lots (utilisé pour les relations SET_NULL). Les signaux
+    pre_save/post_save ne sont pas envoyés : after_batch(pks) est appelé après chaque lot.
+    """
+    batch_size = batch_size or DELETE_BATCH_SIZE
+    model = queryset.model
+    pks = queryset.order_by().values_list('pk', flat=True)
+    total = 0
+    while True:
+        batch = list(pks[:batch_size])
+        if not batch:
+            return total
+        with transaction.atomic():
+            total += model._base_manager.filter(pk__in=batch).update(**values)
+        if after_batch is not None:
+            after_batch(batch)
+
+
+def delete_project(project, batch_size=None):
+    """Supprime un projet et tout son contenu, des feuilles vers la racine."""
+    delete_in_batches(Comment.all_objects.filter(issue__project=project), batch_size)
+    delete_in_batches(Issue.all_objects.filter(project=project), batch_size)
+    delete_in_batches(Contributor.objects.filter(project=project), batch_size)
+    project.delete()
+
+
+def delete_user(user, batch_size=None):
+    """Supprime un utilisateur, ses projets, ses issues et ses commentaires par lots."""
+    for project in Project.all_objects.filter(author=user).only('pk').iterator():
+        delete_project(project, batch_size)
+    delete_in_batches(Comment.all_objects.filter(author=user), batch_size)
+    delete_in_batches(Comment.all_objects.filter(issue__author=user), batch_size)
+    delete_in_batches(Issue.all_objects.filter(author=user), batch_size)
+    # Sans pre_save, la copie dénormalisée du nom est effacée dans le même UPDATE ;
+    # sans post_save, les représentations en cache des issues sont invalidées ici
+    update_in_batches(
+        Issue.all_objects.filter(assignee=user), batch_size,
+        after_batch=lambda pks: invalidate(Issue, *pks),
+        assignee=None, assignee_username=None,
+    )
+    delete_in_batches(Contributor.objects.filter(user=user), batch_size)
+    user.delete()
+
+
+def purge_deleted(older_than, batch_size=None):
+    """
+    Supprime physiquement les objets marqués comme supprimés avant `older_than`,
+    ainsi que les pierres tombales plus anciennes. Renvoie le nombre d'objets purgés.
+    """
+    total = 0
+    for project in Project.all_objects.filter(deleted_at__lt=older_than).only('pk').iterator():
+        delete_project(project, batch_size)
+        total += 1
+    total += delete_in_batches(
+        Comment.all_objects.filter(issue__deleted_at__lt=older_than), batch_size
+    )
+    total += delete_in_batches(Comment.all_objects.filter(deleted_at__lt=older_than), batch_size)
+    total += delete_in_batches(Issue.all_objects.filter(deleted_at__lt=older_than), batch_size)
+    delete_in_batches(Tombstone.objects.filter(deleted_at__lt=older_than), batch_size)
+    return total
+
+
+def purge_cutoff(days=None):
+    """Date limite de purge : tout ce qui a été supprimé il y a plus de `days` jours."""
+    if days is None:
+        days = SOFT_DELETE_RETENTION_DAYS
+    return timezone.now() - timedelta(days=days)
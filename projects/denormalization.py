@@ -0,0 +1,174 @@
+"""
+Dénormalisation optionnelle des valeurs d'affichage (DENORMALIZE_DISPLAY_FIELDS).
+
+Quand le mode est actif, les lignes enfants stockent les valeurs affichées par
+les serializers :
+
+- Issue.author_username / Issue.assignee_username
+- Comment.author_username / Comment.issue_title
+- Contributor.username
+
+Les listes lisent alors une seule table (pas de select_related). Les colonnes
+sont remplies à l'enregistrement de la ligne (pre_save) ; un renommage
+d'utilisateur ou de titre d'issue est propagé par lots en tâche de fond.
+Après activation du mode, `manage.py sync_display_fields` remplit les lignes existantes.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from jobs.registry import enqueue
+
+from .caching import invalidate
+from .deletion import DELETE_BATCH_SIZE
+from .models import Comment, Contributor, Issue
+
+User = get_user_model()
+
+
+def denormalization_enabled():
+    return getattr(settings, 'DENORMALIZE_DISPLAY_FIELDS', False)
+
+
+def with_display_relations(queryset, *relations):
+    """Ajoute le select_related des valeurs d'affichage, inutile en mode dénormalisé."""
+    if denormalization_enabled():
+        return queryset
+    return queryset.select_related(*relations)
+
+
+def update_by_pk_batches(queryset, batch_size=None, **values):
+    """UPDATE par tranches de clés primaires croissantes, une transaction par tranche."""
+    batch_size = batch_size or DELETE_BATCH_SIZE
+    model = queryset.model
+    last_pk = 0
+    total = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return total
+        with transaction.atomic():
+            total += model._base_manager.filter(pk__in=batch).update(**values)
+        last_pk = batch[-1]
+
+
+def propagate_username(user_id, batch_size=None):
+    """Recopie le nom d'utilisateur courant sur les issues, commentaires et contributions."""
+    username = User.objects.filter(pk=user_id).values_list('username', flat=True).first()
+    if username is None:
+        return 0
+    updated = sum([
+        update_by_pk_batches(Issue.all_objects.filter(author_id=user_id), batch_size, author_username=username),
+        update_by_pk_batches(Issue.all_objects.filter(assignee_id=user_id), batch_size, assignee_username=username),
+        update_by_pk_batches(Comment.all_objects.filter(author_id=user_id), batch_size, author_username=username),
+        update_by_pk_batches(Contributor.objects.filter(user_id=user_id), batch_size, username=username),
+    ])
+    # Une issue relue entre le renommage et la propagation a pu être remise en cache avec l'ancien nom
+    invalidate(Issue, *Issue.all_objects.filter(
+        Q(author_id=user_id) | Q(assignee_id=user_id)
+    ).values_list('pk', flat=True))
+    return updated
+
+
+def propagate_issue_title(issue_id, batch_size=None):
+    """Recopie le titre courant de l'issue sur ses commentaires."""
+    title = Issue.all_objects.filter(pk=issue_id).values_list('title', flat=True).first()
+    if title is None:
+        return 0
+    return update_by_pk_batches(Comment.all_objects.filter(issue_id=issue_id), batch_size, issue_title=title)
+
+
+def _username_of(field):
+    return Subquery(User.objects.filter(pk=OuterRef(field)).values('username')[:1])
+
+
+def sync_display_fields(batch_size=None):
+    """Remplit toutes les colonnes dénormalisées depuis les tables d'origine (activation du mode)."""
+    title = Subquery(Issue.all_objects.filter(pk=OuterRef('issue_id')).values('title')[:1])
+    return sum([
+        update_by_pk_batches(
+            Issue.all_objects.all(), batch_size,
+            author_username=_username_of('author_id'), assignee_username=_username_of('assignee_id'),
+        ),
+        update_by_pk_batches(
+            Comment.all_objects.all(), batch_size, author_username=_username_of('author_id'), issue_title=title,
+        ),
+        update_by_pk_batches(Contributor.objects.all(), batch_size, username=_username_of('user_id')),
+    ])
+
+
+# Relation -> colonnes dénormalisées qui en dépendent, par modèle
+DISPLAY_SOURCES = {
+    Issue: {'author': ('author_username',), 'assignee': ('assignee_username',)},
+    Comment: {'author': ('author_username',), 'issue': ('issue_title',)},
+    Contributor: {'user': ('username',)},
+}
+
+
+def with_display_update_fields(model, update_fields):
+    """Ajoute à update_fields les colonnes dénormalisées dépendant des relations modifiées."""
+    fields = set(update_fields)
+    if denormalization_enabled():
+        for relation, columns in DISPLAY_SOURCES.get(model, {}).items():
+            if relation in fields:
+                fields.update(columns)
+    return fields
+
+
+def _needs_fill(column, update_fields):
+    """Enregistrement partiel : la colonne n'est recalculée que si elle fait partie de update_fields."""
+    return denormalization_enabled() and (update_fields is None or column in update_fields)
+
+
+@receiver(pre_save, sender=Issue)
+def fill_issue(sender, instance, update_fields=None, **kwargs):
+    if _needs_fill('author_username', update_fields):
+        instance.author_username = instance.author.username
+    if _needs_fill('assignee_username', update_fields):
+        instance.assignee_username = instance.assignee.username if instance.assignee_id else None
+
+
+@receiver(pre_save, sender=Comment)
+def fill_comment(sender, instance, update_fields=None, **kwargs):
+    if _needs_fill('author_username', update_fields):
+        instance.author_username = instance.author.username
+    if _needs_fill('issue_title', update_fields):
+        instance.issue_title = instance.issue.title
+
+
+@receiver(pre_save, sender=Contributor)
+def fill_contributor(sender, instance, update_fields=None, **kwargs):
+    if _needs_fill('username', update_fields):
+        instance.username = instance.user.username
+
+
+def _field_changed(instance, field, update_fields):
+    """Compare la valeur à celle en base (une requête, seulement si le champ peut avoir changé)."""
+    if instance._state.adding or (update_fields is not None and field not in update_fields):
+        return False
+    stored = type(instance)._base_manager.filter(pk=instance.pk).values_list(field, flat=True).first()
+    return stored is not None and stored != getattr(instance, field)
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Issue)
+def detect_display_change(sender, instance, update_fields=None, **kwargs):
+    field = 'username' if sender is User else 'title'
+    instance._display_changed = denormalization_enabled() and _field_changed(instance, field, update_fields)
+
+
+@receiver(post_save, sender=User)
+def schedule_username_propagation(sender, instance, **kwargs):
+    if getattr(instance, '_display_changed', False):
+        enqueue('projects.propagate_username', {'user_id': instance.pk})
+
+
+@receiver(post_save, sender=Issue)
+def schedule_title_propagation(sender, instance, **kwargs):
+    if getattr(instance, '_display_changed', False):
+        enqueue('projects.propagate_issue_title', {'issue_id': instance.pk})
@@ -0,0 +1,85 @@
+"""
+Ressources liées embarquées : ?expand=project,author,assignee,comments.
+
+La vue déclare, pour chaque nom accepté, comment charger la relation
+(select_related / prefetch_related) ; le serializer déclare le champ imbriqué
+qui remplace l'identifiant. Une page complète revient en une requête HTTP et un
+nombre de requêtes SQL borné, indépendant du nombre de lignes.
+"""
+from django.conf import settings
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+from .models import Comment, Contributor
+
+# Nombre de commentaires embarqués par issue avec ?expand=comments (les plus récents)
+EXPAND_COMMENTS_LIMIT = getattr(settings, 'EXPAND_COMMENTS_LIMIT', 20)
+
+
+def parse_expand(raw, allowed):
+    names = {name.strip() for name in (raw or '').split(',') if name.strip()}
+    unknown = names - set(allowed)
+    if unknown:
+        raise ValidationError({
+            'expand': f"Valeurs inconnues : {', '.join(sorted(unknown))} (acceptées : {', '.join(sorted(allowed))})"
+        })
+    return names
+
+
+def latest_comments(queryset):
+    """
+    Prefetch des EXPAND_COMMENTS_LIMIT derniers commentaires de chaque issue dans issue.latest_comments.
+    Le queryset découpé est exécuté par Django avec une fonction fenêtre (ROW_NUMBER() par issue) :
+    une seule requête quel que soit le nombre d'issues.
+    """
+    comments = Comment.objects.select_related('author').order_by('-created_time', '-id')[:EXPAND_COMMENTS_LIMIT]
+    return queryset.prefetch_related(Prefetch('comments', queryset=comments, to_attr='latest_comments'))
+
+
+def contributors_with_users(queryset):
+    return queryset.prefetch_related(
+        Prefetch('contributors', queryset=Contributor.objects.select_related('user').order_by('id'))
+    )
+
+
+class ExpandViewMixin:
+    """
+    Mixin de vue : `expansions` associe chaque nom accepté dans ?expand= à une
+    fonction queryset -> queryset. get_queryset() appelle expand_queryset().
+    """
+    expansions = {}
+
+    def get_expand(self):
+        if not hasattr(self, '_expand'):
+            if self.request is not None and self.request.method in SAFE_METHODS:
+                self._expand = parse_expand(self.request.query_params.get('expand'), self.expansions)
+            else:
+                self._expand = set()
+        return self._expand
+
+    def expand_queryset(self, queryset):
+        for name in sorted(self.get_expand()):
+            queryset = self.expansions[name](queryset)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
+
+
+class ExpandableFieldsMixin:
+    """
+    Mixin de serializer : `expandable_fields` associe un nom à une fabrique de champ
+    imbriqué (lecture seule). Seul le serializer racine est étendu, pas les imbriqués.
+    """
+    expandable_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.root is self or self.root is self.parent:
+            for name in self.context.get('expand', ()):
+                if name in self.expandable_fields:
+                    fields[name] = self.expandable_fields[name]()
+        return fields
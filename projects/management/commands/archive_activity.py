@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from projects.activity import ACTIVITY_HOT_DAYS, archive_activity
+from projects.deletion import DELETE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        "Déplace par lots vers la table d'archive les événements d'activité "
+        "de plus de --days jours, pour garder la table chaude petite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=ACTIVITY_HOT_DAYS, help="Âge des événements gardés dans la table chaude")
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        archived = archive_activity(options['days'], options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{archived} événement(s) archivé(s)"))
@@ -0,0 +1,136 @@
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.test import APIClient
+
+from projects.benchmarks import compare_to_baseline, format_summary, run_load
+from projects.models import Issue, Project
+from projects.seeding import BENCH_USER_PREFIX, DEFAULT_PASSWORD
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark des routes de l'API sur un jeu généré par seed_bench, en processus "
+        "(client de test) ou en HTTP (--url). Rapporte débit et latences p50/p95/p99 "
+        "et peut comparer le résultat à une référence enregistrée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="Base HTTP du serveur à tester (ex. http://localhost:8000) ; en processus sinon")
+        parser.add_argument('--iterations', type=int, default=200, help="Requêtes par scénario")
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--token-iterations', type=int, default=10, help="Requêtes du scénario /api/token/ (coûteux)")
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+        parser.add_argument('--save-baseline', help="Enregistre les résultats dans ce fichier JSON")
+        parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+        parser.add_argument('--tolerance', type=float, default=0.2, help="Écart toléré avant régression (0.2 = 20 %%)")
+
+    def handle(self, *args, **options):
+        user, project, issue = self._fixtures()
+        self.url = options['url']
+        self.password = options['password']
+        self.username = user.username
+        token = self._obtain_token()
+
+        scenarios = {
+            'project_list': '/api/projects/',
+            'project_issues': f'/api/projects/{project.id}/issues/',
+            'issue_comments': f'/api/projects/{project.id}/issues/{issue.id}/comments/',
+            'my_issues': '/api/me/issues/',
+        }
+        results = {}
+        for name, path in scenarios.items():
+            results[name] = run_load(
+                lambda path=path: self._get_worker(path, token), options['iterations'], options['concurrency']
+            )
+            self.stdout.write(format_summary(name, results[name]))
+        results['token_obtain'] = run_load(
+            lambda: self._token_worker(), options['token_iterations'], min(options['concurrency'], options['token_iterations'])
+        )
+        self.stdout.write(format_summary('token_obtain', results['token_obtain']))
+
+        if options['save_baseline']:
+            Path(options['save_baseline']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Référence enregistrée dans {options['save_baseline']}")
+        if options['baseline']:
+            regressions = compare_to_baseline(results, json.loads(Path(options['baseline']).read_text()), options['tolerance'])
+            if regressions:
+                raise CommandError("Régressions détectées :\n" + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS("Aucune régression par rapport à la référence"))
+
+    def _fixtures(self):
+        """Utilisateur le plus actif du jeu, son projet le plus chargé et l'issue la plus commentée."""
+        user = (
+            User.objects.filter(username__startswith=BENCH_USER_PREFIX)
+            .annotate(n=Count('contributions')).order_by('-n').first()
+        )
+        if user is None:
+            raise CommandError("Aucun jeu de benchmark : lancez d'abord manage.py seed_bench")
+        project = (
+            Project.objects.filter(contributors__user=user)
+            .annotate(n=Count('issues')).order_by('-n').first()
+        )
+        issue = Issue.objects.filter(project=project).annotate(n=Count('comments')).order_by('-n').first()
+        if issue is None:
+            raise CommandError("Le projet du benchmark n'a pas d'issue")
+        return user, project, issue
+
+    def _request(self, client, method, path, body=None, token=None):
+        """Exécute une requête en processus (client) ou en HTTP et renvoie (statut, JSON)."""
+        if self.url is None:
+            headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+            response = getattr(client, method.lower())(path, body, format='json', **headers)
+            return response.status_code, response.json()
+        request = urllib.request.Request(
+            self.url.rstrip('/') + path,
+            data=json.dumps(body).encode() if body else None,
+            method=method,
+            headers={'Content-Type': 'application/json', **({'Authorization': f'Bearer {token}'} if token else {})},
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read() or b'null')
+        except urllib.error.HTTPError as exc:
+            # urlopen lève une exception pour les statuts hors 2xx : on les rend comme les autres
+            with exc:
+                body = exc.read()
+            try:
+                return exc.code, json.loads(body or b'null')
+            except ValueError:
+                return exc.code, body.decode(errors='replace')
+
+    def _client(self):
+        return APIClient(SERVER_NAME='localhost') if self.url is None else None
+
+    def _obtain_token(self):
+        status, data = self._request(
+            self._client(), 'POST', '/api/token/', {'username': self.username, 'password': self.password}
+        )
+        if status != 200:
+            raise CommandError(f"Impossible d'obtenir un jeton ({status})")
+        return data['access']
+
+    def _get_worker(self, path, token):
+        client = self._client()
+
+        def call():
+            status, _ = self._request(client, 'GET', path, token=token)
+            if status != 200:
+                raise CommandError(f"GET {path} : statut {status}")
+        return call
+
+    def _token_worker(self):
+        client = self._client()
+
+        def call():
+            status, _ = self._request(
+                client, 'POST', '/api/token/', {'username': self.username, 'password': self.password}
+            )
+            if status != 200:
+                raise CommandError(f"POST /api/token/ : statut {status}")
+        return call
@@ -0,0 +1,125 @@
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+
+from softdesk import compression
+
+STATUSES = ('To Do', 'In Progress', 'Finished')
+PRIORITIES = ('LOW', 'MEDIUM', 'HIGH')
+TAGS = ('BUG', 'FEATURE', 'TASK')
+WORDS = (
+    'erreur', 'connexion', 'page', 'utilisateur', 'export', 'projet', 'lenteur', 'affichage',
+    'formulaire', 'mobile', 'serveur', 'notification', 'recherche', 'paiement', 'rapport',
+)
+
+
+def sample_issues(count, seed=0):
+    """Liste d'issues au format de l'API (valeurs réalistes, répétitives comme en production)."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    issues = []
+    for index in range(1, count + 1):
+        created = start + timedelta(minutes=rng.randrange(500_000))
+        issues.append({
+            'id': index,
+            'title': ' '.join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize(),
+            'description': ' '.join(rng.choices(WORDS, k=rng.randint(10, 60))),
+            'status': rng.choice(STATUSES),
+            'priority': rng.choice(PRIORITIES),
+            'tag': rng.choice(TAGS),
+            'project': rng.randint(1, 50),
+            'author': rng.randint(1, 500),
+            'author_username': f'user_{rng.randint(1, 500)}',
+            'assignee': rng.randint(1, 500),
+            'assignee_username': f'user_{rng.randint(1, 500)}',
+            'created_time': created.isoformat() + 'Z',
+        })
+    return issues
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare les niveaux gzip et qualités brotli sur des réponses JSON de tailles "
+        "croissantes : taux de compression, débit de compression et de décompression, "
+        "surcoût de la compression en flux (vidage à chaque morceau)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1,10,100,1000,10000', help="Nombres d'issues par réponse")
+        parser.add_argument('--repeat', type=int, default=20, help="Répétitions par mesure (médiane retenue)")
+        parser.add_argument('--gzip-levels', default='1,6,9')
+        parser.add_argument('--brotli-qualities', default='1,4,6,11')
+        parser.add_argument('--chunk-size', type=int, default=8192, help="Taille des morceaux du mode flux")
+
+    def handle(self, *args, **options):
+        codecs = [('gzip', level, self._gzip(level)) for level in self._ints(options['gzip_levels'])]
+        if compression.brotli is None:
+            self.stdout.write("brotli non installé (pip install brotli) : gzip seulement")
+        else:
+            codecs += [('br', quality, self._brotli(quality)) for quality in self._ints(options['brotli_qualities'])]
+
+        self.stdout.write(
+            f"{'issues':>7} {'octets':>10} {'codec':>8} {'ratio':>7} {'comp MB/s':>10} "
+            f"{'décomp MB/s':>12} {'ratio flux':>11}"
+        )
+        for count in self._ints(options['sizes']):
+            body = json.dumps(sample_issues(count)).encode()
+            chunks = [body[i:i + options['chunk_size']] for i in range(0, len(body), options['chunk_size'])]
+            for name, level, (compress, decompress, stream) in codecs:
+                compressed = compress(body)
+                compress_time = self._median(lambda: compress(body), options['repeat'])
+                decompress_time = self._median(lambda: decompress(compressed), options['repeat'])
+                streamed = sum(len(part) for part in stream(chunks))
+                self.stdout.write(
+                    f"{count:>7} {len(body):>10} {f'{name}-{level}':>8} "
+                    f"{len(body) / len(compressed):>7.2f} {self._throughput(len(body), compress_time):>10.1f} "
+                    f"{self._throughput(len(body), decompress_time):>12.1f} {len(body) / streamed:>11.2f}"
+                )
+
+    def _gzip(self, level):
+        def stream(chunks):
+            encoder = compression.GzipEncoder(level)
+            for chunk in chunks:
+                yield encoder.compress(chunk) + encoder.flush()
+            yield encoder.finish()
+
+        return (
+            lambda data: gzip.compress(data, compresslevel=level),
+            gzip.decompress,
+            stream,
+        )
+
+    def _brotli(self, quality):
+        def stream(chunks):
+            encoder = compression.BrotliEncoder(quality)
+            for chunk in chunks:
+                yield encoder.compress(chunk) + encoder.flush()
+            yield encoder.finish()
+
+        return (
+            lambda data: compression.brotli.compress(data, quality=quality),
+            compression.brotli.decompress,
+            stream,
+        )
+
+    @staticmethod
+    def _ints(raw):
+        return [int(value) for value in raw.split(',') if value.strip()]
+
+    @staticmethod
+    def _median(func, repeat):
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2]
+
+    @staticmethod
+    def _throughput(size, elapsed):
+        return size / elapsed / 1_000_000 if elapsed else float('inf')
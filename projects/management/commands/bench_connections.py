@@ -0,0 +1,39 @@
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+
+from projects.benchmarks import format_summary, measure
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure le coût de connexion par requête : une connexion par requête (CONN_MAX_AGE=0) "
+        "contre des connexions persistantes, sur la base configurée (PostgreSQL ou SQLite)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--max-age', type=int, default=60, help="CONN_MAX_AGE du scénario persistant")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Base : {connection.vendor} ({connection.settings_dict['NAME']})")
+        results = {}
+        for label, max_age in (("connexion par requête", 0), (f"persistante ({options['max_age']}s)", options['max_age'])):
+            connection.close()
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+            results[label] = measure(self._simulated_request, options['iterations'])
+            self.stdout.write(format_summary(label, results[label]))
+        connection.close()
+
+        per_request, persistent = results.values()
+        overhead = per_request['mean_ms'] - persistent['mean_ms']
+        self.stdout.write(f"Surcoût moyen de connexion par requête : {overhead:.3f}ms")
+
+    def _simulated_request(self):
+        """Cycle de vie d'une requête : les signaux déclenchent close_old_connections comme en production."""
+        request_started.send(sender=WSGIHandler)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        request_finished.send(sender=WSGIHandler)
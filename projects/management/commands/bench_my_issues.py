@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from projects.benchmarks import format_summary, measure
+from projects.models import Issue, Project
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    """Permet d'annuler les données générées à la fin du benchmark."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure la latence de /api/me/issues/ quand le nombre de projets augmente. "
+        "Les données générées sont annulées (rollback) à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--issues-per-project', type=int, default=5)
+        parser.add_argument('--assigned', type=int, default=50, help="Issues assignées à l'utilisateur mesuré")
+        parser.add_argument('--iterations', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _run(self, options):
+        me = User.objects.create_user(username='bench_me', password='bench')
+        other = User.objects.create_user(username='bench_other', password='bench')
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(user=me)
+
+        created = 0
+        for target in sorted(options['projects']):
+            # Ajout des projets manquants pour atteindre la taille cible
+            projects = Project.objects.bulk_create(
+                Project(title=f"Projet {i}", description="bench", type='back-end', author=other)
+                for i in range(created, target)
+            )
+            Issue.objects.bulk_create(
+                Issue(
+                    title=f"Issue {project.id}-{n}", description="bench", priority='LOW', tag='TASK',
+                    project=project, author=other, assignee=other,
+                )
+                for project in projects
+                for n in range(options['issues_per_project'])
+            )
+            created = target
+
+            # Le nombre d'issues assignées à l'utilisateur reste fixe : seule la taille globale varie
+            Issue.objects.filter(assignee=me).delete()
+            first_projects = list(Project.objects.order_by('id')[:options['assigned']])
+            Issue.objects.bulk_create(
+                Issue(
+                    title=f"Mon issue {n}", description="bench", priority='HIGH', tag='BUG',
+                    project=first_projects[n % len(first_projects)], author=other, assignee=me,
+                )
+                for n in range(options['assigned'])
+            )
+
+            summary = measure(lambda: client.get('/api/me/issues/'), options['iterations'])
+            self.stdout.write(format_summary(f"{target} projets", summary))
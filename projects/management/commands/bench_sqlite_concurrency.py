@@ -0,0 +1,103 @@
+import copy
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import OperationalError, load_backend
+
+from projects.benchmarks import format_summary, summarize
+
+ROWS = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare le débit lecture/écriture concurrent sur SQLite entre la configuration par défaut "
+        "de Django et le profil optimisé de settings.DATABASES (WAL, busy_timeout, file d'écriture)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=5.0, help="Durée de chaque scénario (s)")
+        parser.add_argument('--write-ratio', type=float, default=0.2, help="Part des opérations d'écriture")
+
+    def handle(self, *args, **options):
+        default_settings = settings.DATABASES['default']
+        tuned_options = default_settings.get('OPTIONS', {}) if default_settings['ENGINE'] == 'softdesk.sqlite' else {}
+        profiles = [
+            ("défaut", 'django.db.backends.sqlite3', {}),
+            ("optimisé", 'softdesk.sqlite', tuned_options),
+        ]
+        for label, engine, db_options in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'bench.sqlite3')
+                self._create_schema(path)
+                stats = self._run(engine, path, db_options, options)
+            elapsed = options['duration']
+            self.stdout.write(
+                f"[{label}] lectures={stats['reads'] / elapsed:.0f}/s écritures={stats['writes'] / elapsed:.0f}/s "
+                f"erreurs 'database is locked'={stats['errors']}"
+            )
+            self.stdout.write(format_summary(f"  latence écriture ({label})", summarize(stats['write_samples'])))
+
+    def _create_schema(self, path):
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE bench_item (id INTEGER PRIMARY KEY, value INTEGER NOT NULL)")
+        conn.executemany("INSERT INTO bench_item (id, value) VALUES (?, 0)", ((i,) for i in range(ROWS)))
+        conn.commit()
+        conn.close()
+
+    def _run(self, engine, path, db_options, options):
+        settings_dict = copy.deepcopy(connections['default'].settings_dict)
+        settings_dict.update({'ENGINE': engine, 'NAME': path, 'OPTIONS': copy.deepcopy(db_options)})
+        backend = load_backend(engine)
+        stats = {'reads': 0, 'writes': 0, 'errors': 0, 'write_samples': []}
+        stats_lock = threading.Lock()
+        end = time.monotonic() + options['duration']
+
+        def worker(index):
+            wrapper = backend.DatabaseWrapper(copy.deepcopy(settings_dict), alias=f'bench_{index}')
+            local = {'reads': 0, 'writes': 0, 'errors': 0, 'write_samples': []}
+            rng = random.Random(index)
+            while time.monotonic() < end:
+                item_id = rng.randrange(ROWS)
+                if rng.random() < options['write_ratio']:
+                    start = time.perf_counter()
+                    try:
+                        # Transaction lecture puis écriture, comme un perform_update
+                        wrapper.set_autocommit(False, force_begin_transaction_with_broken_autocommit=True)
+                        with wrapper.cursor() as cursor:
+                            cursor.execute("SELECT value FROM bench_item WHERE id = %s", [item_id])
+                            cursor.fetchone()
+                            cursor.execute("UPDATE bench_item SET value = value + 1 WHERE id = %s", [item_id])
+                        wrapper.commit()
+                        local['writes'] += 1
+                        local['write_samples'].append(time.perf_counter() - start)
+                    except OperationalError:
+                        local['errors'] += 1
+                        wrapper.rollback()
+                    finally:
+                        wrapper.set_autocommit(True)
+                else:
+                    with wrapper.cursor() as cursor:
+                        cursor.execute("SELECT value FROM bench_item WHERE id = %s", [item_id])
+                        cursor.fetchone()
+                    local['reads'] += 1
+            wrapper.close()
+            with stats_lock:
+                for key in ('reads', 'writes', 'errors'):
+                    stats[key] += local[key]
+                stats['write_samples'].extend(local['write_samples'])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return stats
@@ -0,0 +1,113 @@
+import itertools
+import json
+import threading
+from pathlib import Path
+
+from django.core.management.base import CommandError
+
+from projects.benchmarks import compare_to_baseline, format_summary, run_load
+from projects.seeding import BENCH_USER_PREFIX, DEFAULT_PASSWORD
+from softdesk.querycheck import record_queries
+from users.models import User
+
+from .bench_api import Command as BenchApiCommand
+
+
+class Command(BenchApiCommand):
+    help = (
+        "Benchmark des écritures de l'API (création de projets, d'issues, de commentaires, "
+        "ajout de contributeurs en masse) sur un jeu généré par seed_bench : créations/s et "
+        "latences p50/p95/p99 sous concurrence. Les lignes créées restent en base : "
+        "utiliser une base de benchmark."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help="Base HTTP du serveur à tester (ex. http://localhost:8000) ; en processus sinon")
+        parser.add_argument('--iterations', type=int, default=200, help="Requêtes par scénario")
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--onboarding-size', type=int, default=50, help="Utilisateurs par ajout en masse")
+        parser.add_argument('--password', default=DEFAULT_PASSWORD)
+        parser.add_argument('--save-baseline', help="Enregistre les résultats dans ce fichier JSON")
+        parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+        parser.add_argument('--tolerance', type=float, default=0.2, help="Écart toléré avant régression (0.2 = 20 %%)")
+
+    def handle(self, *args, **options):
+        user, project, issue = self._fixtures()
+        self.url = options['url']
+        self.password = options['password']
+        self.username = user.username
+        token = self._obtain_token()
+        sequence = itertools.count()
+
+        scenarios = {
+            'project_create': lambda: (
+                'POST', '/api/projects/',
+                {'title': f"bench-write {next(sequence)}", 'description': "Benchmark", 'type': 'back-end'},
+            ),
+            'issue_create': lambda: (
+                'POST', f'/api/projects/{project.id}/issues/',
+                {'title': f"bench-write {next(sequence)}", 'description': "Benchmark", 'priority': 'LOW', 'tag': 'TASK'},
+            ),
+            'comment_create': lambda: (
+                'POST', f'/api/projects/{project.id}/issues/{issue.id}/comments/',
+                {'description': f"bench-write {next(sequence)}"},
+            ),
+        }
+        results = {}
+        for name, make_request in scenarios.items():
+            results[name] = self._run(name, make_request, token, options)
+
+        # Ajout en masse : chaque appel vise un projet neuf, créé avant la mesure
+        user_ids = list(
+            User.objects.filter(username__startswith=BENCH_USER_PREFIX)
+            .exclude(pk=user.pk).values_list('pk', flat=True)[:options['onboarding_size']]
+        )
+        project_ids = iter(self._create_projects(token, options['iterations']))
+        lock = threading.Lock()
+
+        def onboarding_request():
+            with lock:
+                project_id = next(project_ids)
+            return 'POST', f'/api/projects/{project_id}/contributors/bulk/', {'users': user_ids}
+
+        results['contributors_bulk'] = self._run('contributors_bulk', onboarding_request, token, options)
+
+        if options['save_baseline']:
+            Path(options['save_baseline']).write_text(json.dumps(results, indent=2))
+            self.stdout.write(f"Référence enregistrée dans {options['save_baseline']}")
+        if options['baseline']:
+            regressions = compare_to_baseline(results, json.loads(Path(options['baseline']).read_text()), options['tolerance'])
+            if regressions:
+                raise CommandError("Régressions détectées :\n" + '\n'.join(regressions))
+            self.stdout.write(self.style.SUCCESS("Aucune régression par rapport à la référence"))
+
+    def _run(self, name, make_request, token, options):
+        if self.url is None:
+            # Une requête témoin : nombre d'instructions SQL d'une écriture
+            with record_queries() as recorder:
+                self._post(self._client(), make_request, token)
+            self.stdout.write(f"{name} : {recorder.total} instruction(s) SQL par requête")
+
+        def make_worker():
+            client = self._client()
+            return lambda: self._post(client, make_request, token)
+
+        summary = run_load(make_worker, options['iterations'], options['concurrency'])
+        self.stdout.write(format_summary(name, summary))
+        return summary
+
+    def _post(self, client, make_request, token):
+        method, path, body = make_request()
+        status, data = self._request(client, method, path, body, token=token)
+        if status not in (200, 201):
+            raise CommandError(f"{method} {path} : statut {status} {data}")
+        return data
+
+    def _create_projects(self, token, count):
+        client = self._client()
+        return [
+            self._post(client, lambda: (
+                'POST', '/api/projects/', {'title': "bench-write onboarding", 'description': "Benchmark", 'type': 'back-end'},
+            ), token)['id']
+            for _ in range(count + 1)
+        ]
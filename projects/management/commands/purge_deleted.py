@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from projects.deletion import DELETE_BATCH_SIZE, SOFT_DELETE_RETENTION_DAYS, purge_cutoff, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprime physiquement, par lots, les projets, issues et commentaires "
+        "supprimés logiquement depuis plus de --days jours."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=SOFT_DELETE_RETENTION_DAYS, help="Durée de rétention des suppressions logiques")
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        purged = purge_deleted(purge_cutoff(options['days']), options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{purged} objet(s) purgé(s)"))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.seeding import BENCH_USER_PREFIX, DEFAULT_PASSWORD, DatasetGenerator
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données réaliste pour les benchmarks "
+        "(par défaut 10k utilisateurs, 50k projets, 1M issues, 5M commentaires)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--projects', type=int, default=50_000)
+        parser.add_argument('--issues', type=int, default=1_000_000)
+        parser.add_argument('--comments', type=int, default=5_000_000)
+        parser.add_argument('--scale', type=float, default=1.0, help="Multiplie tous les volumes (ex. 0.01)")
+        parser.add_argument('--seed', type=int, default=0, help="Graine aléatoire (jeu reproductible)")
+        parser.add_argument('--batch-size', type=int, default=50_000)
+        parser.add_argument('--password', default=DEFAULT_PASSWORD, help="Mot de passe de tous les comptes générés")
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=BENCH_USER_PREFIX).exists():
+            raise CommandError("Un jeu de benchmark existe déjà dans cette base")
+
+        scale = options['scale']
+        counts = {key: max(1, int(options[key] * scale)) for key in ('users', 'projects', 'issues', 'comments')}
+        generator = DatasetGenerator(
+            **counts,
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            password=options['password'],
+            log=self.stdout.write,
+        )
+        start = time.perf_counter()
+        generator.run()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f"Jeu de données généré en {elapsed:.1f}s"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from projects.deletion import DELETE_BATCH_SIZE
+from projects.denormalization import sync_display_fields
+
+
+class Command(BaseCommand):
+    help = (
+        "Remplit par lots les colonnes dénormalisées (noms d'utilisateur, titres d'issue) "
+        "depuis les tables d'origine. À lancer après l'activation de DENORMALIZE_DISPLAY_FIELDS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=DELETE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        updated = sync_display_fields(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{updated} ligne(s) mise(s) à jour"))
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_issue_assignee_status_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=20, verbose_name='Modèle')),
+                ('object_id', models.BigIntegerField(verbose_name="Identifiant de l'objet")),
+                ('project_id', models.BigIntegerField(verbose_name='Identifiant du projet')),
+                ('deleted_at', models.DateTimeField(verbose_name='Supprimé le')),
+            ],
+            options={
+                'verbose_name': 'Pierre tombale',
+                'verbose_name_plural': 'Pierres tombales',
+                'ordering': ['deleted_at', 'id'],
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_assignee_status_idx',
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Supprimé le'),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Supprimé le'),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Supprimé le'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['issue', 'created_time'], name='comment_issue_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='comment_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['assignee', 'status', 'created_time'], name='issue_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['project', 'created_time'], name='issue_project_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='issue_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['author', 'created_time'], name='project_author_alive_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='project_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['project_id', 'deleted_at'], name='tombstone_project_idx'),
+        ),
+    ]
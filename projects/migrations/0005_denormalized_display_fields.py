@@ -0,0 +1,38 @@
+# Generated by Django 5.1.5 on 2026-10-19 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='author_username',
+            field=models.CharField(blank=True, editable=False, max_length=150, null=True),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='issue_title',
+            field=models.CharField(blank=True, editable=False, max_length=128, null=True),
+        ),
+        migrations.AddField(
+            model_name='contributor',
+            name='username',
+            field=models.CharField(blank=True, editable=False, max_length=150, null=True),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='assignee_username',
+            field=models.CharField(blank=True, editable=False, max_length=150, null=True),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='author_username',
+            field=models.CharField(blank=True, editable=False, max_length=150, null=True),
+        ),
+    ]
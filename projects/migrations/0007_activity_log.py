@@ -0,0 +1,52 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:12
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_optimistic_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityArchive',
+            fields=[
+                ('project_id', models.BigIntegerField(verbose_name='Identifiant du projet')),
+                ('actor_id', models.BigIntegerField(null=True, verbose_name="Identifiant de l'auteur")),
+                ('verb', models.PositiveSmallIntegerField(choices=[(1, 'Project Created'), (2, 'Project Updated'), (3, 'Project Deleted'), (4, 'Contributor Added'), (5, 'Contributor Removed'), (6, 'Issue Created'), (7, 'Issue Updated'), (8, 'Issue Deleted'), (9, 'Issues Imported'), (10, 'Comment Created'), (11, 'Comment Updated'), (12, 'Comment Deleted')], verbose_name='Événement')),
+                ('object_id', models.BigIntegerField(verbose_name="Identifiant de l'objet")),
+                ('changes', models.JSONField(null=True, verbose_name='Modifications')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date')),
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+            ],
+            options={
+                'verbose_name': "Événement d'activité archivé",
+                'verbose_name_plural': "Événements d'activité archivés",
+                'ordering': ['-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['project_id', 'id'], name='activity_archive_project_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('project_id', models.BigIntegerField(verbose_name='Identifiant du projet')),
+                ('actor_id', models.BigIntegerField(null=True, verbose_name="Identifiant de l'auteur")),
+                ('verb', models.PositiveSmallIntegerField(choices=[(1, 'Project Created'), (2, 'Project Updated'), (3, 'Project Deleted'), (4, 'Contributor Added'), (5, 'Contributor Removed'), (6, 'Issue Created'), (7, 'Issue Updated'), (8, 'Issue Deleted'), (9, 'Issues Imported'), (10, 'Comment Created'), (11, 'Comment Updated'), (12, 'Comment Deleted')], verbose_name='Événement')),
+                ('object_id', models.BigIntegerField(verbose_name="Identifiant de l'objet")),
+                ('changes', models.JSONField(null=True, verbose_name='Modifications')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date')),
+            ],
+            options={
+                'verbose_name': "Événement d'activité",
+                'verbose_name_plural': "Événements d'activité",
+                'ordering': ['-id'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['project_id', 'id'], name='activity_project_idx'), models.Index(fields=['created_at'], name='activity_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_activity_log'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='activityarchive',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': "Événement d'activité archivé", 'verbose_name_plural': "Événements d'activité archivés"},
+        ),
+        migrations.AlterModelOptions(
+            name='activityevent',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': "Événement d'activité", 'verbose_name_plural': "Événements d'activité"},
+        ),
+        migrations.RemoveIndex(
+            model_name='activityarchive',
+            name='activity_archive_project_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='activityevent',
+            name='activity_project_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activityarchive',
+            index=models.Index(fields=['project_id', 'created_at', 'id'], name='activity_archive_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activityevent',
+            index=models.Index(fields=['project_id', 'created_at', 'id'], name='activity_project_time_idx'),
+        ),
+    ]
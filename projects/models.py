@@ -1,12 +1,107 @@
 import uuid
+from contextlib import nullcontext
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.dispatch import Signal
+from django.utils import timezone
 
 # Create your models here.
 
+# Envoyé après soft_delete() (un UPDATE ne déclenche pas post_save) ; argument : instance
+soft_deleted = Signal()
 
-class Project(models.Model):
+
+class SoftDeleteManager(models.Manager):
+    """Manager par défaut : exclut les lignes supprimées logiquement."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class SoftDeleteModel(models.Model):
+    """
+    Modèle abstrait pour la suppression logique.
+    La ligne est seulement marquée (deleted_at) ; la suppression physique
+    est faite plus tard par lots (manage.py purge_deleted).
+    """
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="Supprimé le")
+
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+
+    # Chemin (attribut ou lookup ORM) vers l'identifiant du projet noté sur la pierre tombale
+    tombstone_project_field = 'project_id'
+
+    class Meta:
+        abstract = True
+
+    def get_tombstone_project_id(self):
+        field = self.tombstone_project_field
+        if '__' not in field:
+            return getattr(self, field)
+        return type(self).all_objects.filter(pk=self.pk).values_list(field, flat=True).first()
+
+    def soft_delete(self):
+        """Marque l'objet comme supprimé et enregistre une pierre tombale pour la synchronisation"""
+        self.deleted_at = timezone.now()
+        with transaction.atomic():
+            type(self).all_objects.filter(pk=self.pk).update(deleted_at=self.deleted_at)
+            Tombstone.objects.create(
+                model=self._meta.model_name,
+                object_id=self.pk,
+                project_id=self.get_tombstone_project_id(),
+                deleted_at=self.deleted_at,
+            )
+        soft_deleted.send(sender=type(self), instance=self)
+
+
+class VersionConflict(Exception):
+    """La ligne a changé de version depuis sa lecture : l'UPDATE conditionnel n'a rien modifié."""
+
+
+class VersionedModel(models.Model):
+    """
+    Modèle abstrait pour le contrôle de concurrence optimiste.
+    Tout enregistrement d'une ligne existante est un seul UPDATE conditionnel :
+    UPDATE ... SET ..., version = n + 1 WHERE id = ? AND version = n, où n est
+    self.version (la version lue, ou celle annoncée par le client). Si aucune
+    ligne n'est modifiée, save() lève VersionConflict ; aucun verrou n'est pris.
+    """
+    version = models.PositiveIntegerField(default=1, editable=False, verbose_name="Version")
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if self._state.adding or (update_fields is not None and not update_fields):
+            return super().save(*args, **kwargs)
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        self._expected_version = self.version
+        self.version += 1
+        try:
+            # Dans une transaction, un point de sauvegarde évite qu'un conflit ne la condamne
+            with transaction.atomic(using=using) if connections[using].in_atomic_block else nullcontext():
+                super().save(*args, **kwargs)
+        except VersionConflict:
+            self.version = self._expected_version
+            raise
+        finally:
+            del self._expected_version
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, '_expected_version', None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if not super()._do_update(base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update):
+            raise VersionConflict(f"{self._meta.label} #{pk_val} n'est plus en version {expected}")
+        return True
+
+
+class Project(SoftDeleteModel):
     # Choix pour le type de projet
     TYPE_CHOICES = [('back-end', 'Back-end'), ('front-end', 'Front-end'), ('iOS', 'iOS'), ('Android', 'Android')]
 
@@ -25,6 +120,21 @@ class Project(models.Model):
         verbose_name = "Projet"
         verbose_name_plural = "Projets"
         ordering = ['-created_time']
+        indexes = [
+            # Index partiels : les lectures ne parcourent que les lignes non supprimées
+            models.Index(
+                fields=['author', 'created_time'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='project_author_alive_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='project_deleted_idx',
+            ),
+        ]
+
+    tombstone_project_field = 'id'
 
     def __str__(self):
         return f"{self.title} ({self.type})"
@@ -41,6 +151,8 @@ class Contributor(models.Model):
     )
     # Date d'ajout du contributeur
     created_time = models.DateTimeField(auto_now_add=True)
+    # Copie de user.username, remplie seulement avec DENORMALIZE_DISPLAY_FIELDS (projects/denormalization.py)
+    username = models.CharField(max_length=150, null=True, blank=True, editable=False)
 
     class Meta:
         # Contrainte d'unicité pour éviter les doublons
@@ -51,7 +163,7 @@ class Contributor(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.project.title}"
 
-class Issue(models.Model):
+class Issue(VersionedModel, SoftDeleteModel):
     PRIORITY_CHOICES = [
         ('LOW', 'Low'),
         ('MEDIUM', 'Medium'),
@@ -70,6 +182,9 @@ class Issue(models.Model):
         ('Finished', 'Finished')
     ]
 
+    # Statuts considérés comme "ouverts" (travail restant à faire)
+    OPEN_STATUSES = ['To Do', 'In Progress']
+
     title = models.CharField(max_length=128, verbose_name="Titre")
     description = models.TextField(verbose_name="Description")
     
@@ -110,17 +225,38 @@ class Issue(models.Model):
 
     created_time = models.DateTimeField(auto_now_add=True)
 
+    # Copies des noms d'utilisateur, remplies seulement avec DENORMALIZE_DISPLAY_FIELDS
+    author_username = models.CharField(max_length=150, null=True, blank=True, editable=False)
+    assignee_username = models.CharField(max_length=150, null=True, blank=True, editable=False)
+
     class Meta:
         verbose_name = "Problème"
         verbose_name_plural = "Problèmes"
         ordering = ['-created_time']
+        indexes = [
+            # Index dédié à la boîte "mes issues" : filtre sur l'assigné et le statut, tri par date
+            models.Index(
+                fields=['assignee', 'status', 'created_time'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='issue_assignee_status_idx',
+            ),
+            models.Index(
+                fields=['project', 'created_time'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='issue_project_alive_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='issue_deleted_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
-    
 
 
-class Comment(models.Model):
+class Comment(VersionedModel, SoftDeleteModel):
     description = models.TextField(verbose_name="Description")
     
     # UUID unique généré automatiquement
@@ -153,10 +289,108 @@ class Comment(models.Model):
         verbose_name="Date de création"
     )
 
+    # Copies d'author.username et d'issue.title, remplies seulement avec DENORMALIZE_DISPLAY_FIELDS
+    author_username = models.CharField(max_length=150, null=True, blank=True, editable=False)
+    issue_title = models.CharField(max_length=128, null=True, blank=True, editable=False)
+
     class Meta:
         verbose_name = "Commentaire"
         verbose_name_plural = "Commentaires"
         ordering = ['-created_time']
+        indexes = [
+            models.Index(
+                fields=['issue', 'created_time'],
+                condition=models.Q(deleted_at__isnull=True),
+                name='comment_issue_alive_idx',
+            ),
+            models.Index(
+                fields=['deleted_at'],
+                condition=models.Q(deleted_at__isnull=False),
+                name='comment_deleted_idx',
+            ),
+        ]
+
+    # L'issue peut déjà être supprimée logiquement : le projet est lu par jointure
+    tombstone_project_field = 'issue__project_id'
+
+    def __str__(self):
+        return f"Commentaire de {self.author.username} sur {self.issue.title}"
+
+
+class Tombstone(models.Model):
+    """
+    Trace d'une suppression, lue par les clients de synchronisation.
+    Pas de clé étrangère : la pierre tombale survit à la purge de l'objet.
+    """
+    model = models.CharField(max_length=20, verbose_name="Modèle")
+    object_id = models.BigIntegerField(verbose_name="Identifiant de l'objet")
+    project_id = models.BigIntegerField(verbose_name="Identifiant du projet")
+    deleted_at = models.DateTimeField(verbose_name="Supprimé le")
+
+    class Meta:
+        verbose_name = "Pierre tombale"
+        verbose_name_plural = "Pierres tombales"
+        ordering = ['deleted_at', 'id']
+        indexes = [models.Index(fields=['project_id', 'deleted_at'], name='tombstone_project_idx')]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} supprimé le {self.deleted_at}"
+
+class ActivityVerb(models.IntegerChoices):
+    """Type d'événement d'activité, stocké en entier (ne jamais renuméroter)."""
+    PROJECT_CREATED = 1
+    PROJECT_UPDATED = 2
+    PROJECT_DELETED = 3
+    CONTRIBUTOR_ADDED = 4
+    CONTRIBUTOR_REMOVED = 5
+    ISSUE_CREATED = 6
+    ISSUE_UPDATED = 7
+    ISSUE_DELETED = 8
+    ISSUES_IMPORTED = 9
+    COMMENT_CREATED = 10
+    COMMENT_UPDATED = 11
+    COMMENT_DELETED = 12
+
+
+class ActivityEventBase(models.Model):
+    """
+    Événement d'activité, en ajout seul (jamais modifié).
+    Pas de clé étrangère : l'historique survit à la purge des objets et des utilisateurs.
+    `changes` contient les différences empaquetées par projects/activity.py.
+    """
+    project_id = models.BigIntegerField(verbose_name="Identifiant du projet")
+    actor_id = models.BigIntegerField(null=True, verbose_name="Identifiant de l'auteur")
+    verb = models.PositiveSmallIntegerField(choices=ActivityVerb.choices, verbose_name="Événement")
+    object_id = models.BigIntegerField(verbose_name="Identifiant de l'objet")
+    changes = models.JSONField(null=True, verbose_name="Modifications")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Date")
+
+    class Meta:
+        abstract = True
+        # Les identifiants sont attribués à l'écriture du lot : l'heure de l'événement fait foi
+        ordering = ['-created_at', '-id']
 
     def __str__(self):
-        return f"Commentaire de {self.author.username} sur {self.issue.title}"
\ No newline at end of file
+        return f"{self.get_verb_display()} #{self.object_id} (projet {self.project_id})"
+
+
+class ActivityEvent(ActivityEventBase):
+    """Table chaude : les événements récents, déplacés vers ActivityArchive après ACTIVITY_HOT_DAYS."""
+
+    class Meta(ActivityEventBase.Meta):
+        verbose_name = "Événement d'activité"
+        verbose_name_plural = "Événements d'activité"
+        indexes = [
+            models.Index(fields=['project_id', 'created_at', 'id'], name='activity_project_time_idx'),
+            models.Index(fields=['created_at'], name='activity_created_idx'),
+        ]
+
+
+class ActivityArchive(ActivityEventBase):
+    """Événements archivés, identifiants d'origine conservés."""
+    id = models.BigIntegerField(primary_key=True)
+
+    class Meta(ActivityEventBase.Meta):
+        verbose_name = "Événement d'activité archivé"
+        verbose_name_plural = "Événements d'activité archivés"
+        indexes = [models.Index(fields=['project_id', 'created_at', 'id'], name='activity_archive_time_idx')]
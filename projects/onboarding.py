@@ -0,0 +1,41 @@
+"""
+Ajout de contributeurs en masse (POST /api/projects/{id}/contributors/bulk/).
+
+Trois requêtes quel que soit le nombre d'utilisateurs, dans une transaction :
+lecture des utilisateurs, lecture des contributeurs existants, INSERT
+multi-lignes. L'INSERT ignore les doublons (contrainte user/project) : un
+ajout concurrent du même utilisateur ne fait pas échouer l'import.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .denormalization import denormalization_enabled
+from .models import Contributor
+
+User = get_user_model()
+
+# Nombre maximal d'utilisateurs par appel
+CONTRIBUTOR_BULK_MAX = getattr(settings, 'CONTRIBUTOR_BULK_MAX', 500)
+
+
+def add_contributors(project, user_ids):
+    """Ajoute les utilisateurs au projet ; renvoie (ajoutés, déjà contributeurs, inconnus), dans l'ordre reçu."""
+    user_ids = list(dict.fromkeys(user_ids))
+    with transaction.atomic():
+        usernames = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'username'))
+        existing = set(
+            Contributor.objects.filter(project=project, user_id__in=usernames).values_list('user_id', flat=True)
+        )
+        added = [pk for pk in user_ids if pk in usernames and pk not in existing]
+        # bulk_create n'envoie pas pre_save : la valeur dénormalisée est remplie ici
+        denormalize = denormalization_enabled()
+        Contributor.objects.bulk_create(
+            [Contributor(project=project, user_id=pk, username=usernames[pk] if denormalize else None) for pk in added],
+            ignore_conflicts=True,
+        )
+    return (
+        added,
+        [pk for pk in user_ids if pk in existing],
+        [pk for pk in user_ids if pk not in usernames],
+    )
@@ -0,0 +1,33 @@
+from rest_framework.pagination import CursorPagination
+
+
+class AssignedIssueCursorPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) pour la boîte "mes issues".
+    Le curseur encode la position dans le tri : pas de OFFSET ni de COUNT(*),
+    le coût d'une page reste constant quel que soit le volume.
+    """
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    ordering = ('-created_time', '-id')
+
+
+class TombstoneCursorPagination(CursorPagination):
+    """Pagination par curseur des pierres tombales, de la plus ancienne à la plus récente."""
+    page_size = 100
+    max_page_size = 1000
+    page_size_query_param = 'page_size'
+    ordering = ('deleted_at', 'id')
+
+
+class ActivityCursorPagination(CursorPagination):
+    """
+    Pagination par curseur de l'historique d'activité, du plus récent au plus ancien.
+    Tri sur l'heure de l'événement (index project_id, created_at, id) : les identifiants
+    suivent l'ordre d'écriture des tampons, pas celui des événements.
+    """
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = 'page_size'
+    ordering = ('-created_at', '-id')
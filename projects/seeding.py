@@ -0,0 +1,321 @@
+"""
+Génération de jeux de données réalistes pour les benchmarks (manage.py seed_bench).
+
+Les lignes sont construites directement en tuples et chargées en masse
+(executemany sur SQLite, COPY sur PostgreSQL) : plusieurs millions de lignes
+par minute, contre quelques milliers avec l'ORM et create_user.
+
+Les distributions sont volontairement asymétriques : quelques utilisateurs
+contribuent à beaucoup de projets, quelques projets concentrent beaucoup
+d'issues, quelques issues concentrent beaucoup de commentaires.
+"""
+import io
+import random
+import time
+import uuid
+from array import array
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Comment, Contributor, Issue, Project
+
+User = get_user_model()
+
+BENCH_USER_PREFIX = 'bench_user_'
+DEFAULT_PASSWORD = 'bench-password'
+DEFAULT_SKEW = 3.0
+
+
+def skewed_index(rng, n, skew=DEFAULT_SKEW):
+    """Indice dans [0, n) favorisant fortement les petits indices (loi de puissance)."""
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class RowLoader:
+    """
+    Insertion brute de lignes déjà construites (tuples), sans instancier de modèles :
+    - SQLite : executemany par gros lots, une transaction par table ;
+    - PostgreSQL : COPY ... FROM STDIN ;
+    - autres bases : bulk_create.
+
+    Les colonnes absentes des lignes reçoivent la valeur par défaut du champ
+    (calculée une seule fois). Les clés primaires sont fournies par l'appelant
+    (voir next_id), ce qui évite de relire les identifiants générés.
+    """
+    ADAPTED_TYPES = ('DateField', 'DateTimeField', 'UUIDField')
+
+    def __init__(self, batch_size=50_000, log=None, using='default'):
+        self.batch_size = batch_size
+        self.log = log or (lambda message: None)
+        self.connection = connections[using]
+        self.using = using
+
+    def next_id(self, model):
+        current = model._base_manager.using(self.using).aggregate(current=Max('pk'))['current']
+        return (current or 0) + 1
+
+    def load(self, model, columns, rows):
+        """Insère les lignes (tuples alignés sur `columns`, des attnames) et renvoie leur nombre."""
+        fields = {field.attname: field for field in model._meta.concrete_fields}
+        defaults = [
+            (attname, timezone.now() if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+             else field.get_default())
+            for attname, field in fields.items() if attname not in columns
+        ]
+        all_columns = list(columns) + [attname for attname, _ in defaults]
+        constant = tuple(value for _, value in defaults)
+        full_rows = (row + constant for row in rows)
+
+        start = time.perf_counter()
+        vendor = self.connection.vendor
+        if vendor == 'sqlite':
+            count = self._executemany(model, fields, all_columns, full_rows)
+        elif vendor == 'postgresql':
+            count = self._copy(model, all_columns, full_rows)
+        else:
+            count = self._bulk_create(model, all_columns, full_rows)
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed * 60 if elapsed else 0
+        self.log(f"{model._meta.verbose_name_plural} : {count} ligne(s) en {elapsed:.1f}s ({rate:,.0f} lignes/min)")
+        return count
+
+    def _adapters(self, fields, columns):
+        adapters = []
+        for attname in columns:
+            field = fields[attname]
+            if field.get_internal_type() in self.ADAPTED_TYPES:
+                adapters.append(lambda value, field=field: field.get_db_prep_save(value, self.connection))
+            else:
+                adapters.append(None)
+        return adapters
+
+    def _executemany(self, model, fields, columns, rows):
+        quote = self.connection.ops.quote_name
+        sql = (
+            f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(quote(c) for c in columns)}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})"
+        )
+        adapters = self._adapters(fields, columns)
+        adapted = (
+            tuple(value if adapt is None else adapt(value) for value, adapt in zip(row, adapters))
+            for row in rows
+        )
+        count = 0
+        # Écritures non synchronisées le temps du chargement (impossible dans une transaction ouverte)
+        relax_sync = not self.connection.in_atomic_block
+        with self.connection.cursor() as cursor:
+            if relax_sync:
+                # Valeur en cours (réglage du profil de connexion) restaurée après le chargement
+                cursor.execute("PRAGMA synchronous")
+                previous_sync = int(cursor.fetchone()[0])
+                cursor.execute("PRAGMA synchronous=OFF")
+            try:
+                with transaction.atomic(using=self.using):
+                    for chunk in chunked(adapted, self.batch_size):
+                        cursor.executemany(sql, chunk)
+                        count += len(chunk)
+            finally:
+                if relax_sync:
+                    cursor.execute(f"PRAGMA synchronous={previous_sync}")
+        return count
+
+    def _copy(self, model, columns, rows):
+        quote = self.connection.ops.quote_name
+        sql = f"COPY {quote(model._meta.db_table)} ({', '.join(quote(c) for c in columns)}) FROM STDIN"
+        count = 0
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            raw_cursor = cursor.cursor
+            if hasattr(raw_cursor, 'copy'):
+                # psycopg 3 : adaptation native des types Python
+                with raw_cursor.copy(sql) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                        count += 1
+            else:
+                # psycopg2 : flux au format texte de COPY, par lots
+                for chunk in chunked(rows, self.batch_size):
+                    buffer = io.StringIO()
+                    for row in chunk:
+                        buffer.write('\t'.join(_copy_text(value) for value in row) + '\n')
+                    buffer.seek(0)
+                    raw_cursor.copy_expert(sql, buffer)
+                    count += len(chunk)
+            # Les identifiants ont été fournis : la séquence doit reprendre après le plus grand
+            for statement in self.connection.ops.sequence_reset_sql(no_style(), [model]):
+                cursor.execute(statement)
+        return count
+
+    def _bulk_create(self, model, columns, rows):
+        count = 0
+        for chunk in chunked(rows, self.batch_size):
+            with transaction.atomic(using=self.using):
+                model._base_manager.using(self.using).bulk_create(
+                    model(**dict(zip(columns, row))) for row in chunk
+                )
+            count += len(chunk)
+        return count
+
+
+def _copy_text(value):
+    """Valeur au format texte de COPY (NULL = \\N)."""
+    if value is None:
+        return '\\N'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+class DatasetGenerator:
+    """Génère utilisateurs, projets, contributeurs, issues et commentaires en chargement brut."""
+
+    def __init__(self, users, projects, issues, comments, seed=0, batch_size=50_000,
+                 password=DEFAULT_PASSWORD, log=None, history_days=730):
+        self.counts = {'users': users, 'projects': projects, 'issues': issues, 'comments': comments}
+        self.rng = random.Random(seed)
+        self.password = password
+        self.loader = RowLoader(batch_size=batch_size, log=log)
+        self.now = timezone.now()
+        self.history_seconds = history_days * 86400
+
+    def run(self):
+        user_ids = self.create_users()
+        project_ids, members = self.create_projects(user_ids)
+        self.create_contributors(project_ids, members)
+        issue_ids, issue_projects = self.create_issues(project_ids, members)
+        self.create_comments(issue_ids, issue_projects, members)
+        return self.counts
+
+    def created_time(self):
+        """Date de création répartie sur l'historique simulé."""
+        return self.now - timedelta(seconds=self.rng.randrange(self.history_seconds))
+
+    def insert(self, model, columns, rows, count):
+        """Charge `count` lignes avec des clés primaires consécutives et renvoie ces clés."""
+        first_id = self.loader.next_id(model)
+        ids = range(first_id, first_id + count)
+        self.loader.load(model, ('id', *columns), ((pk, *row) for pk, row in zip(ids, rows)))
+        return ids
+
+    def create_users(self):
+        rng = self.rng
+        # Un seul hachage pour tous les comptes : hacher chaque mot de passe prendrait des heures
+        password = make_password(self.password)
+        count = self.counts['users']
+        return self.insert(
+            User,
+            ('username', 'password', 'date_of_birth', 'can_be_contacted', 'can_data_be_shared', 'date_joined'),
+            (
+                (
+                    f"{BENCH_USER_PREFIX}{i}",
+                    password,
+                    date(1960, 1, 1) + timedelta(days=rng.randrange(45 * 365)),
+                    rng.random() < 0.5,
+                    rng.random() < 0.3,
+                    self.created_time(),
+                )
+                for i in range(count)
+            ),
+            count,
+        )
+
+    def create_projects(self, user_ids):
+        rng = self.rng
+        n_users = len(user_ids)
+        count = self.counts['projects']
+        authors = [user_ids[skewed_index(rng, n_users)] for _ in range(count)]
+        types = [choice for choice, _ in Project.TYPE_CHOICES]
+        project_ids = self.insert(
+            Project,
+            ('title', 'description', 'type', 'author_id', 'created_time'),
+            (
+                (f"Projet {i}", "Projet généré pour les benchmarks", rng.choice(types), author_id, self.created_time())
+                for i, author_id in enumerate(authors)
+            ),
+            count,
+        )
+        # Membres de chaque projet : l'auteur puis quelques contributeurs, les plus actifs étant favorisés
+        members = []
+        for author_id in authors:
+            team = {author_id}
+            for _ in range(1 + skewed_index(rng, 50)):
+                team.add(user_ids[skewed_index(rng, n_users)])
+            members.append(array('q', sorted(team)))
+        return project_ids, members
+
+    def create_contributors(self, project_ids, members):
+        self.insert(
+            Contributor,
+            ('user_id', 'project_id', 'created_time'),
+            (
+                (user_id, project_id, self.created_time())
+                for project_id, team in zip(project_ids, members)
+                for user_id in team
+            ),
+            sum(len(team) for team in members),
+        )
+
+    def create_issues(self, project_ids, members):
+        rng = self.rng
+        n_projects = len(project_ids)
+        count = self.counts['issues']
+        issue_projects = array('l', (skewed_index(rng, n_projects) for _ in range(count)))
+        priorities = [choice for choice, _ in Issue.PRIORITY_CHOICES]
+        tags = [choice for choice, _ in Issue.TAG_CHOICES]
+        statuses = [choice for choice, _ in Issue.STATUS_CHOICES]
+        issue_ids = self.insert(
+            Issue,
+            ('title', 'description', 'priority', 'tag', 'status', 'project_id', 'author_id', 'assignee_id', 'created_time'),
+            (
+                (
+                    f"Issue {i}",
+                    "Issue générée pour les benchmarks",
+                    rng.choice(priorities),
+                    rng.choice(tags),
+                    rng.choice(statuses),
+                    project_ids[project_index],
+                    rng.choice(members[project_index]),
+                    rng.choice(members[project_index]) if rng.random() < 0.7 else None,
+                    self.created_time(),
+                )
+                for i, project_index in enumerate(issue_projects)
+            ),
+            count,
+        )
+        return issue_ids, issue_projects
+
+    def create_comments(self, issue_ids, issue_projects, members):
+        rng = self.rng
+        n_issues = len(issue_ids)
+        if not n_issues:
+            return
+        count = self.counts['comments']
+        self.insert(
+            Comment,
+            ('description', 'uuid', 'issue_id', 'author_id', 'created_time'),
+            (
+                (
+                    "Commentaire généré pour les benchmarks",
+                    uuid.UUID(int=rng.getrandbits(128), version=4),
+                    issue_ids[issue_index],
+                    rng.choice(members[issue_projects[issue_index]]),
+                    self.created_time(),
+                )
+                for issue_index in (skewed_index(rng, n_issues) for _ in range(count))
+            ),
+            count,
+        )
@@ -1,14 +1,45 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from softdesk.serializers import ChangedFieldsUpdateMixin
 from users.models import User
+from users.serializers import PublicUserSerializer
 
-from .models import Comment, Contributor, Issue, Project
+from .denormalization import denormalization_enabled, with_display_update_fields
+from .expansion import ExpandableFieldsMixin
+from .activity import unpack_changes
+from .models import ActivityEvent, ActivityVerb, Comment, Contributor, Issue, Project, Tombstone
+from .onboarding import CONTRIBUTOR_BULK_MAX
 
 User = get_user_model()
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class DisplayFieldsMixin(ChangedFieldsUpdateMixin):
+    """
+    Les champs listés dans display_fields sont lus via la relation (source='author.username'...)
+    ou, en mode dénormalisé, directement sur la colonne du même nom de la ligne.
+    Une mise à jour n'écrit que les colonnes modifiées, plus les colonnes dénormalisées
+    des relations modifiées (assignee -> assignee_username).
+    """
+    display_fields = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if denormalization_enabled():
+            for name in self.display_fields:
+                fields[name] = serializers.CharField(read_only=True)
+        return fields
+
+    def get_update_fields(self, instance, changed):
+        return with_display_update_fields(type(instance), changed)
+
+
+class ProjectSerializer(ExpandableFieldsMixin, ChangedFieldsUpdateMixin, serializers.ModelSerializer):
+    expandable_fields = {
+        'author': lambda: PublicUserSerializer(read_only=True),
+        'contributors': lambda: ContributorSerializer(many=True, read_only=True),
+    }
+
     class Meta:
         model = Project
         fields = ['id', 'title', 'description', 'type', 'author', 'created_time']
@@ -16,7 +47,8 @@ class ProjectSerializer(serializers.ModelSerializer):
 
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+class ContributorSerializer(DisplayFieldsMixin, serializers.ModelSerializer):
+    display_fields = ('username',)
     username = serializers.CharField(source='user.username', read_only=True)
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
 
@@ -31,7 +63,22 @@ class ContributorSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Cet utilisateur est déjà contributeur du projet")
         return value
 
-class IssueSerializer(serializers.ModelSerializer):
+class ContributorBulkSerializer(serializers.Serializer):
+    """Corps de l'ajout de contributeurs en masse"""
+    users = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=CONTRIBUTOR_BULK_MAX
+    )
+
+
+class IssueSerializer(ExpandableFieldsMixin, DisplayFieldsMixin, serializers.ModelSerializer):
+    display_fields = ('author_username', 'assignee_username')
+    expandable_fields = {
+        'project': lambda: ProjectSerializer(read_only=True),
+        'author': lambda: PublicUserSerializer(read_only=True),
+        'assignee': lambda: PublicUserSerializer(read_only=True),
+        # issue.latest_comments : préchargé par expansion.latest_comments
+        'comments': lambda: CommentSerializer(source='latest_comments', many=True, read_only=True),
+    }
     author_username = serializers.CharField(source='author.username', read_only=True)
     assignee_username = serializers.CharField(source='assignee.username', read_only=True)
 
@@ -49,9 +96,10 @@ class IssueSerializer(serializers.ModelSerializer):
             'author_username',
             'assignee',
             'assignee_username',
-            'created_time'
+            'created_time',
+            'version',
         ]
-        read_only_fields = ['author', 'created_time', 'project']
+        read_only_fields = ['author', 'created_time', 'project', 'version']
 
     def validate_assignee(self, value):
         """
@@ -70,7 +118,8 @@ class IssueSerializer(serializers.ModelSerializer):
                 )
         return value
     
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DisplayFieldsMixin, serializers.ModelSerializer):
+    display_fields = ('author_username', 'issue_title')
     author_username = serializers.CharField(source='author.username', read_only=True)
     issue_title = serializers.CharField(source='issue.title', read_only=True)
 
@@ -84,9 +133,10 @@ class CommentSerializer(serializers.ModelSerializer):
             'author_username',
             'issue',
             'issue_title',
-            'created_time'
+            'created_time',
+            'version',
         ]
-        read_only_fields = ['author', 'uuid', 'created_time', 'issue']
+        read_only_fields = ['author', 'uuid', 'created_time', 'issue', 'version']
 
     def validate_issue(self, value):
         """
@@ -107,4 +157,29 @@ class CommentSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError(
                     "Vous devez être contributeur du projet pour commenter"
                 )
-        return value
\ No newline at end of file
+        return value
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tombstone
+        fields = ['id', 'model', 'object_id', 'project_id', 'deleted_at']
+        read_only_fields = fields
+
+
+class ActivityEventSerializer(serializers.ModelSerializer):
+    """Événement d'activité (table chaude ou archive) avec verbe et modifications lisibles."""
+    verb = serializers.SerializerMethodField()
+    actor = serializers.IntegerField(source='actor_id', read_only=True)
+    changes = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ActivityEvent
+        fields = ['id', 'verb', 'actor', 'object_id', 'changes', 'created_at']
+        read_only_fields = fields
+
+    def get_verb(self, obj):
+        return ActivityVerb(obj.verb).name.lower()
+
+    def get_changes(self, obj):
+        return unpack_changes(obj.changes)
@@ -0,0 +1,43 @@
+"""
+Tâches de fond du module projets (exécutées par manage.py runworker).
+"""
+from jobs.registry import task
+
+from .activity import archive_activity
+from .deletion import delete_project, purge_cutoff, purge_deleted
+from .denormalization import propagate_issue_title, propagate_username
+from .models import Project
+
+
+@task('projects.purge_project')
+def purge_project(project_id):
+    """Purge physiquement un projet supprimé logiquement (s'il n'a pas été restauré entre-temps)."""
+    project = Project.all_objects.filter(pk=project_id, deleted_at__isnull=False).first()
+    if project is None:
+        return {'purged': False}
+    delete_project(project)
+    return {'purged': True}
+
+
+@task('projects.purge_deleted')
+def purge_expired(days=None):
+    """Purge toutes les suppressions logiques plus anciennes que la rétention."""
+    return {'purged': purge_deleted(purge_cutoff(days))}
+
+
+@task('projects.propagate_username')
+def propagate_username_task(user_id):
+    """Recopie un nom d'utilisateur modifié sur les lignes dénormalisées."""
+    return {'updated': propagate_username(user_id)}
+
+
+@task('projects.propagate_issue_title')
+def propagate_issue_title_task(issue_id):
+    """Recopie un titre d'issue modifié sur les commentaires dénormalisés."""
+    return {'updated': propagate_issue_title(issue_id)}
+
+
+@task('projects.archive_activity')
+def archive_activity_task(days=None):
+    """Déplace les événements d'activité anciens vers la table d'archive."""
+    return {'archived': archive_activity(days)}
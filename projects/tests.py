@@ -1,43 +1,113 @@
-import time
+import gzip
+import io
+import itertools
+import json
+import os
 import unittest
+import zlib
+from datetime import timedelta
+from unittest import mock
 
 from colorama import Fore, Style, init
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, connection, models
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.exceptions import ParseError
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-from .models import Comment, Contributor, Issue, Project
+from jobs.models import Job
+from jobs.worker import run_pending
+from softdesk.admin_tools import EstimatedCountPaginator, estimate_row_count
+from softdesk.compression import CompressionMiddleware, negotiate_encoding
+from softdesk.metrics import HISTOGRAMS
+from softdesk.parsers import BodyReader, iter_json_array
+from softdesk.querycheck import QueryBudgetMixin, record_queries
+from softdesk.routers import ReplicaRouter, is_pinned_to_primary, replica_reads
+
+from .benchmarks import compare_to_baseline, run_load
+from .bulk import import_issues
+from . import activity
+from .activity import archive_activity, flush_activity
+from .caching import cache_key, get_object_cache
+from .deletion import delete_project, purge_deleted
+from .expansion import EXPAND_COMMENTS_LIMIT
+from .models import (
+    ActivityArchive,
+    ActivityEvent,
+    Comment,
+    Contributor,
+    Issue,
+    Project,
+    Tombstone,
+    VersionConflict,
+)
+from .seeding import BENCH_USER_PREFIX, DatasetGenerator
 
 init()
 User = get_user_model()
 
+# Les traces décorées ralentissent la suite et noient la sortie de --parallel :
+# elles ne sont affichées qu'avec TESTS_VERBOSE=1.
+VERBOSE = os.getenv('TESTS_VERBOSE', '') == '1'
+DEFAULT_PASSWORD = 'Password123!'
+
+
+def say(*args, **kwargs):
+    if VERBOSE:
+        print(*args, **kwargs)
+
+def make_user(username, **extra):
+    """Crée un utilisateur majeur avec le mot de passe commun des tests"""
+    extra.setdefault('date_of_birth', '1990-01-01')
+    return User.objects.create_user(username=username, password=DEFAULT_PASSWORD, **extra)
+
+def make_project(author, title="Projet Test", **extra):
+    """Crée un projet et son auteur comme contributeur, comme le fait l'API"""
+    extra.setdefault('description', "Description")
+    extra.setdefault('type', 'back-end')
+    project = Project.objects.create(title=title, author=author, **extra)
+    Contributor.objects.create(user=author, project=project)
+    return project
+
+def make_issue(project, author, title="Issue Test", **extra):
+    """Crée une issue avec des valeurs par défaut valides"""
+    extra.setdefault('description', "Description")
+    extra.setdefault('priority', 'HIGH')
+    extra.setdefault('tag', 'BUG')
+    return Issue.objects.create(title=title, project=project, author=author, **extra)
+
 def print_test_header(test_name):
-    print(f"\n{Fore.CYAN}{'=' * 50}")
-    print(f"Test: {test_name}")
-    print(f"{'=' * 50}{Style.RESET_ALL}")
+    say(f"\n{Fore.CYAN}{'=' * 50}")
+    say(f"Test: {test_name}")
+    say(f"{'=' * 50}{Style.RESET_ALL}")
 
 def print_step(message):
-    print(f"{Fore.WHITE}➤ {message}{Style.RESET_ALL}")
+    say(f"{Fore.WHITE}➤ {message}{Style.RESET_ALL}")
 
 def print_result(success, message=""):
     if success:
-        print(f"{Fore.GREEN}✅ Test réussi - {message}{Style.RESET_ALL}")
+        say(f"{Fore.GREEN}✅ Test réussi - {message}{Style.RESET_ALL}")
     else:
-        print(f"{Fore.RED}❌ Test échoué - {message}{Style.RESET_ALL}")
+        say(f"{Fore.RED}❌ Test échoué - {message}{Style.RESET_ALL}")
         
 
 class UserTestCase(APITestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        print(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS UTILISATEURS{Style.RESET_ALL}\n")
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS UTILISATEURS{Style.RESET_ALL}\n")
 
     def setUp(self):
         """Configuration initiale pour chaque test"""
-        self.start_time = time.time()
         test_name = self._testMethodName
         print_test_header(test_name)
-        print(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
 
     def test_01_user_creation_success(self):
         """Test la création d'un utilisateur avec des données valides"""
@@ -79,11 +149,7 @@ class UserTestCase(APITestCase):
         """Test la modification de son propre profil"""
         try:
             # Création d'un utilisateur
-            user = User.objects.create_user(
-                username='update_user',
-                password='Password123!',
-                date_of_birth='1990-01-01'
-            )
+            user = make_user('update_user')
             self.client.force_authenticate(user=user)
             
             print_step("Tentative de modification de son propre profil")
@@ -102,16 +168,8 @@ class UserTestCase(APITestCase):
         """Test la modification du profil d'un autre utilisateur (doit échouer)"""
         try:
             # Création de deux utilisateurs
-            user1 = User.objects.create_user(
-                username='user1',
-                password='Password123!',
-                date_of_birth='1990-01-01'
-            )
-            user2 = User.objects.create_user(
-                username='user2',
-                password='Password123!',
-                date_of_birth='1990-01-01'
-            )
+            user1 = make_user('user1')
+            user2 = make_user('user2')
             self.client.force_authenticate(user=user1)
             
             print_step("Tentative de modification du profil d'un autre utilisateur")
@@ -128,51 +186,111 @@ class UserTestCase(APITestCase):
     def test_05_user_delete_own_profile(self):
         """Test la suppression de son propre profil"""
         try:
-            user = User.objects.create_user(
-                username='delete_user',
-                password='Password123!',
-                date_of_birth='1990-01-01'
-            )
+            user = make_user('delete_user')
             self.client.force_authenticate(user=user)
             
             print_step("Tentative de suppression de son propre profil")
             response = self.client.delete(f'/api/users/{user.id}/')
-            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            user.refresh_from_db()
+            self.assertFalse(user.is_active)
+
+            print_step("Exécution de la tâche de suppression")
+            self.assertEqual(Job.objects.get(pk=response.data['job']).name, 'users.delete_user')
+            run_pending()
+            self.assertFalse(User.objects.filter(pk=user.pk).exists())
             print_result(True, "L'utilisateur peut supprimer son propre profil")
         except AssertionError as e:
             print_result(False, str(e))
             raise
+
+    def test_06_staff_user_search(self):
+        """Test la recherche d'utilisateurs par préfixe et sous-chaîne avec pagination par id"""
+        try:
+            staff = make_user('staff_search', is_staff=True)
+            for username in ('alice', 'alicia', 'Alison', 'malik', 'bob'):
+                make_user(username)
+            self.client.force_authenticate(user=staff)
+
+            print_step("Recherche par préfixe, une page d'un résultat")
+            with record_queries() as recorder:
+                response = self.client.get('/api/users/', {'search': 'ali', 'page_size': 1})
+            self.assertEqual([u['username'] for u in response.data['results']], ['alice'])
+            self.assertIsNotNone(response.data['next'])
+            response = self.client.get(response.data['next'])
+            self.assertEqual([u['username'] for u in response.data['results']], ['alicia'])
+            user_query = next(shape.sql for shape in recorder.shapes.values() if 'FROM "users_user"' in shape.sql)
+            self.assertNotIn('"password"', user_query)
+
+            print_step("Préfixe terminé par le dernier point de code Unicode")
+            response = self.client.get('/api/users/', {'search': 'ali\U0010ffff'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['results'], [])
+
+            print_step("Recherche par sous-chaîne")
+            response = self.client.get('/api/users/', {'contains': 'LIK'})
+            self.assertEqual([u['username'] for u in response.data['results']], ['malik'])
+            response = self.client.get('/api/users/', {'contains': 'li'})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            print_step("Liste refusée à un utilisateur standard")
+            self.client.force_authenticate(user=User.objects.get(username='bob'))
+            self.assertEqual(self.client.get('/api/users/').status_code, status.HTTP_403_FORBIDDEN)
+            print_result(True, "La recherche staff est paginée par id et sans colonnes inutiles")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_07_batch_lookup(self):
+        """Test la résolution d'ids en noms d'utilisateur en une requête"""
+        try:
+            sharing = make_user('sharing_user', can_data_be_shared=True)
+            private = make_user('private_user')
+            self.client.force_authenticate(user=private)
+
+            print_step("Résolution de trois ids dont un inexistant")
+            with self.assertNumQueries(1):
+                response = self.client.get('/api/users/batch/', {'ids': f'{private.id},{sharing.id},999999'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                response.data['results'],
+                [{'id': private.id, 'username': 'private_user'}, {'id': sharing.id, 'username': 'sharing_user'}],
+            )
+            self.assertEqual(response.data['missing'], [999999])
+            # Réponse authentifiée : jamais stockée par un cache partagé
+            self.assertIn('private', response['Cache-Control'])
+            self.assertNotIn('public', response['Cache-Control'])
+            self.assertIn('Authorization', response['Vary'])
+
+            print_step("Revalidation par ETag puis ids invalides")
+            response = self.client.get(
+                '/api/users/batch/', {'ids': f'{private.id},{sharing.id},999999'}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(self.client.get('/api/users/batch/', {'ids': 'a,b'}).status_code, status.HTTP_400_BAD_REQUEST)
+            print_result(True, "Les ids sont résolus en une requête, avec en-têtes de cache")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
         
 class ProjectTestCase(APITestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        print(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS PROJETS{Style.RESET_ALL}\n")
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS PROJETS{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateurs partagés par tous les tests de la classe"""
+        cls.user1 = make_user('project_creator')
+        cls.user2 = make_user('project_contributor')
+        cls.user3 = make_user('non_contributor')
 
     def setUp(self):
         """Configuration initiale pour chaque test"""
-        self.start_time = time.time()
         test_name = self._testMethodName
         print_test_header(test_name)
-        print(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
-
-        # Création des utilisateurs de test
-        print_step("Création des utilisateurs de test")
-        self.user1 = User.objects.create_user(
-            username='project_creator',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.user2 = User.objects.create_user(
-            username='project_contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.user3 = User.objects.create_user(
-            username='non_contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
 
     def test_01_project_creation_authenticated(self):
         """Test la création d'un projet par un utilisateur authentifié"""
@@ -276,48 +394,69 @@ class ProjectTestCase(APITestCase):
         except AssertionError as e:
             print_result(False, str(e))
             raise
+
+    def test_06_project_expand(self):
+        """Test ?expand=author,contributors sur le détail d'un projet"""
+        try:
+            project = make_project(self.user1, "Projet Étendu")
+            Contributor.objects.create(user=self.user2, project=project)
+            self.client.force_authenticate(user=self.user2)
+
+            print_step("Détail du projet avec auteur et contributeurs")
+            response = self.client.get(f'/api/projects/{project.id}/', {'expand': 'author,contributors'})
+            self.assertEqual(response.data['author']['username'], 'project_creator')
+            self.assertEqual(
+                [c['username'] for c in response.data['contributors']], ['project_creator', 'project_contributor']
+            )
+            print_result(True, "L'auteur et les contributeurs sont embarqués")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_07_atomic_creation(self):
+        """Test la création du projet et de son auteur contributeur en une transaction"""
+        try:
+            self.client.force_authenticate(user=self.user1)
+            data = {"title": "Projet Atomique", "description": "Description", "type": "back-end"}
+
+            print_step("Création : deux INSERT seulement")
+            with record_queries() as recorder:
+                response = self.client.post('/api/projects/', data)
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            inserts = [shape.sql for shape in recorder.shapes.values() if shape.sql.startswith('INSERT')]
+            self.assertEqual(len(inserts), 2)
+            self.assertTrue(Contributor.objects.filter(project_id=response.data['id'], user=self.user1).exists())
+
+            print_step("Échec de l'INSERT du contributeur : le projet est annulé")
+            with mock.patch.object(Contributor.objects, 'create', side_effect=IntegrityError("échec simulé")):
+                with self.assertRaises(IntegrityError):
+                    self.client.post('/api/projects/', {**data, "title": "Projet Orphelin"})
+            self.assertFalse(Project.objects.filter(title="Projet Orphelin").exists())
+            print_result(True, "Aucun projet orphelin n'est laissé en cas d'échec")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
         
 class ContributorTestCase(APITestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        print(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS CONTRIBUTEURS{Style.RESET_ALL}\n")
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS CONTRIBUTEURS{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateurs et projet partagés par tous les tests de la classe"""
+        cls.project_author = make_user('project_author')
+        cls.contributor = make_user('contributor')
+        cls.new_user = make_user('new_user')
+        cls.project = make_project(cls.project_author, "Projet Test Contributeurs")
 
     def setUp(self):
         """Configuration initiale pour chaque test"""
-        self.start_time = time.time()
         test_name = self._testMethodName
         print_test_header(test_name)
-        print(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
-
-        # Création des utilisateurs de test
-        print_step("Création des utilisateurs de test")
-        self.project_author = User.objects.create_user(
-            username='project_author',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.contributor = User.objects.create_user(
-            username='contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.new_user = User.objects.create_user(
-            username='new_user',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-
-        # Création du projet test
-        print_step("Création du projet test")
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
         self.client.force_authenticate(user=self.project_author)
-        project_data = {
-            "title": "Projet Test Contributeurs",
-            "description": "Description",
-            "type": "back-end"
-        }
-        response = self.client.post('/api/projects/', project_data)
-        self.project = Project.objects.get(id=response.data['id'])
 
     def test_01_add_contributor_by_author(self):
         """Test l'ajout d'un contributeur par l'auteur du projet"""
@@ -393,51 +532,61 @@ class ContributorTestCase(APITestCase):
         except AssertionError as e:
             print_result(False, str(e))
             raise
+
+    def test_06_bulk_onboarding(self):
+        """Test l'ajout de contributeurs en masse en un nombre fixe de requêtes"""
+        try:
+            newcomers = User.objects.bulk_create(
+                User(username=f'newcomer_{i}', date_of_birth='1990-01-01') for i in range(10)
+            )
+            Contributor.objects.create(user=self.contributor, project=self.project)
+            ids = [user.id for user in newcomers] + [self.contributor.id, 999999]
+            url = f'/api/projects/{self.project.id}/contributors/bulk/'
+
+            print_step("Ajout de 10 nouveaux utilisateurs, d'un contributeur existant et d'un inconnu")
+            with record_queries() as recorder:
+                response = self.client.post(url, {'users': ids}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['added'], ids[:10])
+            self.assertEqual(response.data['already_contributors'], [self.contributor.id])
+            self.assertEqual(response.data['missing'], [999999])
+            statements = sum(
+                shape.count for shape in recorder.shapes.values()
+                if not shape.sql.startswith(('SAVEPOINT', 'RELEASE'))
+            )
+            self.assertEqual(statements, 4)  # projet, utilisateurs, contributeurs existants, INSERT
+            self.assertEqual(Contributor.objects.filter(project=self.project).count(), 12)
+
+            print_step("Tentative par un contributeur")
+            self.client.force_authenticate(user=self.contributor)
+            response = self.client.post(url, {'users': [self.new_user.id]}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            print_result(True, "Les contributeurs sont ajoutés en une seule écriture")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
         
-class IssueTestCase(APITestCase):
+class IssueTestCase(QueryBudgetMixin, APITestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        print(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS ISSUES{Style.RESET_ALL}\n")
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS ISSUES{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateurs et projet partagés par tous les tests de la classe"""
+        cls.project_author = make_user('project_author')
+        cls.contributor = make_user('contributor')
+        cls.non_contributor = make_user('non_contributor')
+        cls.project = make_project(cls.project_author, "Projet Test Issues")
+        Contributor.objects.create(user=cls.contributor, project=cls.project)
 
     def setUp(self):
         """Configuration initiale pour chaque test"""
-        self.start_time = time.time()
         test_name = self._testMethodName
         print_test_header(test_name)
-        print(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
-
-        # Création des utilisateurs de test
-        print_step("Création des utilisateurs de test")
-        self.project_author = User.objects.create_user(
-            username='project_author',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.contributor = User.objects.create_user(
-            username='contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.non_contributor = User.objects.create_user(
-            username='non_contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-
-        # Création du projet test
-        print_step("Création du projet test")
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
         self.client.force_authenticate(user=self.project_author)
-        project_data = {
-            "title": "Projet Test Issues",
-            "description": "Description",
-            "type": "back-end"
-        }
-        response = self.client.post('/api/projects/', project_data)
-        self.project = Project.objects.get(id=response.data['id'])
-
-        # Ajout du contributeur
-        Contributor.objects.create(user=self.contributor, project=self.project)
 
     def test_01_create_issue_by_contributor(self):
         """Test la création d'une issue par un contributeur"""
@@ -549,63 +698,141 @@ class IssueTestCase(APITestCase):
         except AssertionError as e:
             print_result(False, str(e))
             raise
+
+    def test_06_list_issues_query_budget(self):
+        """Test le nombre de requêtes SQL de la liste des issues (pas de N+1)"""
+        try:
+            for i in range(5):
+                Issue.objects.create(
+                    title=f"Issue {i}", description="Description", priority='LOW', tag='TASK',
+                    project=self.project, author=self.contributor, assignee=self.project_author
+                )
+
+            print_step("Liste des issues avec auteur et assigné")
+            self.client.force_authenticate(user=self.contributor)
+            with self.assertQueryBudget(4, max_repeats=1):
+                response = self.client.get(f'/api/projects/{self.project.id}/issues/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            print_result(True, "La liste des issues reste dans son budget de requêtes")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_07_expand_related_resources(self):
+        """Test ?expand= : issue, projet, auteur, assigné et derniers commentaires en une requête HTTP"""
+        try:
+            issues = [
+                make_issue(self.project, self.contributor, f"Issue {i}", assignee=self.project_author)
+                for i in range(3)
+            ]
+            for issue in issues:
+                Comment.objects.bulk_create(
+                    Comment(description=f"Commentaire {i}", issue=issue, author=self.contributor)
+                    for i in range(EXPAND_COMMENTS_LIMIT + 2)
+                )
+            self.client.force_authenticate(user=self.contributor)
+            expand = {'expand': 'project,author,assignee,comments'}
+
+            print_step("Détail d'une issue avec toutes ses relations")
+            with self.assertQueryBudget(4, max_repeats=1):
+                response = self.client.get(f'/api/projects/{self.project.id}/issues/{issues[0].id}/', expand)
+            self.assertEqual(response.data['project']['title'], "Projet Test Issues")
+            self.assertEqual(response.data['author']['username'], 'contributor')
+            self.assertEqual(response.data['assignee']['username'], 'project_author')
+            self.assertEqual(len(response.data['comments']), EXPAND_COMMENTS_LIMIT)
+            self.assertEqual(response.data['comments'][0]['issue_title'], "Issue 0")
+
+            print_step("Liste des issues étendue : nombre de requêtes indépendant du nombre d'issues")
+            with self.assertQueryBudget(5, max_repeats=1):
+                response = self.client.get(f'/api/projects/{self.project.id}/issues/', expand)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                self.client.get(f'/api/projects/{self.project.id}/issues/', {'expand': 'inconnu'}).status_code,
+                status.HTTP_400_BAD_REQUEST,
+            )
+            print_result(True, "Les relations sont embarquées avec un nombre de requêtes borné")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_08_optimistic_concurrency(self):
+        """Test le contrôle de version par If-Match : un seul UPDATE conditionnel, 412 en cas de conflit"""
+        try:
+            issue = make_issue(self.project, self.project_author)
+            url = f'/api/projects/{self.project.id}/issues/{issue.id}/'
+
+            print_step("Lecture de l'ETag puis modification avec If-Match")
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(etag, '"1"')
+            with record_queries() as recorder:
+                response = self.client.patch(url, {'status': 'In Progress'}, HTTP_IF_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual((response.data['version'], response['ETag']), (2, '"2"'))
+            updates = [shape for shape in recorder.shapes.values() if shape.sql.startswith('UPDATE')]
+            self.assertEqual(len(updates), 1)
+            self.assertIn('"version" =', updates[0].sql.split('WHERE')[1])
+
+            print_step("Seconde modification avec l'ancien ETag")
+            response = self.client.patch(url, {'status': 'Finished'}, HTTP_IF_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+            issue.refresh_from_db()
+            self.assertEqual((issue.status, issue.version), ('In Progress', 2))
+
+            print_step("Enregistrement d'une instance périmée côté modèle")
+            stale = Issue.objects.get(pk=issue.pk)
+            issue.save()
+            with self.assertRaises(VersionConflict):
+                stale.save()
+            self.assertEqual(stale.version, 2)
+            print_result(True, "Les modifications concurrentes sont détectées sans verrou")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_09_partial_update_columns(self):
+        """Test qu'un PATCH n'écrit que les colonnes modifiées"""
+        try:
+            issue = make_issue(self.project, self.project_author)
+            url = f'/api/projects/{self.project.id}/issues/{issue.id}/'
+
+            print_step("PATCH du statut seul, puis PATCH sans changement")
+            with record_queries() as recorder:
+                response = self.client.patch(url, {'status': 'Finished', 'priority': 'HIGH'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            update = next(shape.sql for shape in recorder.shapes.values() if shape.sql.startswith('UPDATE'))
+            self.assertEqual(update.split(' SET ')[1].split(' WHERE ')[0].count(' = '), 2)  # status, version
+            self.assertNotIn('"description"', update)
+            with record_queries() as recorder:
+                response = self.client.patch(url, {'status': 'Finished'})
+            self.assertEqual(response.data['version'], 2)
+            self.assertFalse(any(shape.sql.startswith('UPDATE') for shape in recorder.shapes.values()))
+            print_result(True, "Les écritures se limitent aux colonnes qui changent")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
         
-class CommentTestCase(APITestCase):
+class CommentTestCase(QueryBudgetMixin, APITestCase):
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
-        print(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS COMMENTAIRES{Style.RESET_ALL}\n")
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS COMMENTAIRES{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateurs et projet partagés par tous les tests de la classe"""
+        cls.project_author = make_user('project_author')
+        cls.contributor = make_user('contributor')
+        cls.non_contributor = make_user('non_contributor')
+        cls.project = make_project(cls.project_author, "Projet Test Commentaires")
+        Contributor.objects.create(user=cls.contributor, project=cls.project)
+        cls.issue = make_issue(cls.project, cls.project_author, status='To Do')
 
     def setUp(self):
         """Configuration initiale pour chaque test"""
-        self.start_time = time.time()
         test_name = self._testMethodName
         print_test_header(test_name)
-        print(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
-
-        # Création des utilisateurs de test
-        print_step("Création des utilisateurs de test")
-        self.project_author = User.objects.create_user(
-            username='project_author',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.contributor = User.objects.create_user(
-            username='contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-        self.non_contributor = User.objects.create_user(
-            username='non_contributor',
-            password='Password123!',
-            date_of_birth='1990-01-01'
-        )
-
-        # Création du projet test
-        print_step("Création du projet test")
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
         self.client.force_authenticate(user=self.project_author)
-        project_data = {
-            "title": "Projet Test Commentaires",
-            "description": "Description",
-            "type": "back-end"
-        }
-        response = self.client.post('/api/projects/', project_data)
-        self.project = Project.objects.get(id=response.data['id'])
-
-        # Ajout du contributeur
-        Contributor.objects.create(user=self.contributor, project=self.project)
-
-        # Création d'une issue pour les tests
-        print_step("Création d'une issue pour les tests")
-        issue_data = {
-            "title": "Issue Test",
-            "description": "Description",
-            "priority": "HIGH",
-            "tag": "BUG",
-            "status": "To Do"
-        }
-        response = self.client.post(f'/api/projects/{self.project.id}/issues/', issue_data)
-        self.issue = Issue.objects.get(id=response.data['id'])
 
     def test_01_create_comment_by_contributor(self):
         """Test la création d'un commentaire par un contributeur"""
@@ -724,17 +951,1176 @@ class CommentTestCase(APITestCase):
         except AssertionError as e:
             print_result(False, str(e))
             raise
+
+    def test_06_list_comments_query_budget(self):
+        """Test le nombre de requêtes SQL de la liste des commentaires (pas de N+1)"""
+        try:
+            for i in range(5):
+                Comment.objects.create(description=f"Commentaire {i}", issue=self.issue, author=self.contributor)
+
+            print_step("Liste des commentaires avec auteur et issue")
+            self.client.force_authenticate(user=self.contributor)
+            with self.assertQueryBudget(5, max_repeats=1):
+                response = self.client.get(
+                    f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            print_result(True, "La liste des commentaires reste dans son budget de requêtes")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_07_version_in_body(self):
+        """Test le contrôle de version par le champ "version" du corps"""
+        try:
+            comment = Comment.objects.create(description="Original", issue=self.issue, author=self.project_author)
+            url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/{comment.id}/'
+
+            print_step("Modification avec une version périmée puis avec la version courante")
+            response = self.client.patch(url, {'description': "Périmé", 'version': 5})
+            self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+            response = self.client.patch(url, {'description': "À jour", 'version': 1})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['version'], 2)
+            self.assertEqual(
+                self.client.patch(url, {'description': "Invalide", 'version': 'x'}).status_code,
+                status.HTTP_400_BAD_REQUEST,
+            )
+            print_result(True, "La version du corps est vérifiée comme If-Match")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
         
+class MyIssuesTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS MES ISSUES{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateurs et projets partagés par tous les tests de la classe"""
+        cls.author = make_user('issue_author')
+        cls.assignee = make_user('assignee')
+        cls.projects = [
+            Project.objects.create(title=f"Projet {i}", description="Description", type='back-end', author=cls.author)
+            for i in range(2)
+        ]
+        for project in cls.projects:
+            Contributor.objects.create(user=cls.assignee, project=project)
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+
+    def _create_issue(self, project, status_value, assignee):
+        return Issue.objects.create(
+            title=f"Issue {status_value}", description="Description", priority='HIGH', tag='BUG',
+            status=status_value, project=project, author=self.author, assignee=assignee
+        )
+
+    def test_01_list_open_assigned_issues(self):
+        """Test la liste des issues ouvertes assignées, tous projets confondus"""
+        try:
+            todo = self._create_issue(self.projects[0], 'To Do', self.assignee)
+            in_progress = self._create_issue(self.projects[1], 'In Progress', self.assignee)
+            self._create_issue(self.projects[0], 'Finished', self.assignee)
+            self._create_issue(self.projects[1], 'To Do', self.author)
+
+            print_step("Récupération de /api/me/issues/")
+            self.client.force_authenticate(user=self.assignee)
+            response = self.client.get('/api/me/issues/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids = {issue['id'] for issue in response.data['results']}
+            self.assertEqual(ids, {todo.id, in_progress.id})
+            print_result(True, "Seules les issues ouvertes assignées sont listées")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_keyset_pagination(self):
+        """Test la pagination par curseur de la boîte de travail"""
+        try:
+            for _ in range(3):
+                self._create_issue(self.projects[0], 'To Do', self.assignee)
+
+            print_step("Parcours des pages via le curseur")
+            self.client.force_authenticate(user=self.assignee)
+            response = self.client.get('/api/me/issues/', {'page_size': 2})
+            self.assertEqual(len(response.data['results']), 2)
+            self.assertNotIn('count', response.data)
+            next_page = self.client.get(response.data['next'])
+            self.assertEqual(len(next_page.data['results']), 1)
+            self.assertIsNone(next_page.data['next'])
+            print_result(True, "La pagination par curseur parcourt toutes les issues")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_unauthenticated(self):
+        """Test l'accès à la boîte de travail sans authentification"""
+        try:
+            print_step("Tentative d'accès sans authentification")
+            response = self.client.get('/api/me/issues/')
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+            print_result(True, "L'accès anonyme est refusé")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class DeletionTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS SUPPRESSION PAR LOTS{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec issues et commentaires partagé par tous les tests de la classe"""
+        cls.author = make_user('deletion_author')
+        cls.other = make_user('deletion_other')
+        cls.project = make_project(cls.author, "Projet volumineux")
+        Contributor.objects.create(user=cls.other, project=cls.project)
+        for i in range(5):
+            issue = make_issue(
+                cls.project, cls.author, f"Issue {i}", priority='LOW', tag='TASK', assignee=cls.other
+            )
+            Comment.objects.bulk_create(
+                Comment(description="Commentaire", issue=issue, author=cls.other) for _ in range(3)
+            )
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+
+    def test_01_delete_project_in_batches(self):
+        """Test la suppression d'un projet et de tout son contenu par lots"""
+        try:
+            print_step("Suppression du projet avec des lots de 2 lignes")
+            delete_project(self.project, batch_size=2)
+            self.assertFalse(Project.objects.filter(id=self.project.id).exists())
+            self.assertEqual(Issue.objects.count(), 0)
+            self.assertEqual(Comment.objects.count(), 0)
+            self.assertEqual(Contributor.objects.count(), 0)
+            print_result(True, "Le projet et son contenu ont été supprimés")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_delete_user_in_batches(self):
+        """Test la suppression d'un utilisateur assigné et commentateur"""
+        try:
+            # Nom dénormalisé et représentation en cache de l'issue assignée
+            issue = Issue.objects.filter(assignee=self.other).first()
+            Issue.objects.filter(assignee=self.other).update(assignee_username=self.other.username)
+            get_object_cache().set(cache_key(Issue, issue.pk), {'assignee_username': self.other.username})
+
+            print_step("Suppression de l'utilisateur via l'API")
+            self.client.force_authenticate(user=self.other)
+            response = self.client.delete(f'/api/users/{self.other.id}/')
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(run_pending(), 1)
+            self.assertEqual(Issue.objects.count(), 5)
+            self.assertFalse(Issue.objects.filter(assignee__isnull=False).exists())
+            self.assertFalse(Issue.objects.filter(assignee_username__isnull=False).exists())
+            self.assertIsNone(get_object_cache().get(cache_key(Issue, issue.pk)))
+            self.assertEqual(Comment.objects.count(), 0)
+            self.assertEqual(Contributor.objects.filter(project=self.project).count(), 1)
+            print_result(True, "Les données de l'utilisateur ont été supprimées ou détachées")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class SoftDeleteTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS SUPPRESSION LOGIQUE{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec une issue et un commentaire partagé par tous les tests de la classe"""
+        cls.author = make_user('soft_author')
+        cls.project = make_project(cls.author, "Projet")
+        cls.issue = make_issue(cls.project, cls.author, "Issue", priority='LOW', tag='TASK')
+        cls.comment = Comment.objects.create(description="Commentaire", issue=cls.issue, author=cls.author)
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        self.client.force_authenticate(user=self.author)
+
+    def test_01_soft_delete_issue(self):
+        """Test la suppression logique d'une issue et sa pierre tombale"""
+        try:
+            print_step("Suppression de l'issue via l'API")
+            response = self.client.delete(f'/api/projects/{self.project.id}/issues/{self.issue.id}/')
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            self.assertFalse(Issue.objects.filter(id=self.issue.id).exists())
+            self.assertTrue(Issue.all_objects.filter(id=self.issue.id).exists())
+
+            response = self.client.get('/api/tombstones/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            tombstone = response.data['results'][0]
+            self.assertEqual((tombstone['model'], tombstone['object_id']), ('issue', self.issue.id))
+            print_result(True, "L'issue est masquée et une pierre tombale est publiée")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_soft_delete_project(self):
+        """Test la suppression logique d'un projet et l'accès à son contenu"""
+        try:
+            print_step("Suppression du projet via l'API")
+            response = self.client.delete(f'/api/projects/{self.project.id}/')
+            self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+            response = self.client.get(f'/api/projects/{self.project.id}/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            response = self.client.get(f'/api/projects/{self.project.id}/issues/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            comments_url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+            response = self.client.get(comments_url)
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            response = self.client.get(f'{comments_url}{self.comment.id}/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            print_result(True, "Le projet, ses issues et leurs commentaires ne sont plus accessibles")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_purge_deleted(self):
+        """Test la purge physique des objets supprimés logiquement"""
+        try:
+            print_step("Suppression logique puis purge")
+            self.project.soft_delete()
+            purge_deleted(timezone.now() + timedelta(seconds=1), batch_size=1)
+            self.assertFalse(Project.all_objects.filter(id=self.project.id).exists())
+            self.assertFalse(Issue.all_objects.exists())
+            self.assertFalse(Comment.all_objects.exists())
+            self.assertFalse(Tombstone.objects.exists())
+            print_result(True, "Les objets supprimés ont été purgés")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class JobTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS TÂCHES DE FOND{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateurs partagés par tous les tests de la classe"""
+        cls.author = make_user('job_author')
+        cls.other = make_user('job_other')
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+
+    def test_01_project_purge_job(self):
+        """Test la purge d'un projet supprimé par une tâche de fond"""
+        try:
+            self.client.force_authenticate(user=self.author)
+            response = self.client.post(
+                '/api/projects/', {"title": "Projet", "description": "Description", "type": "back-end"}
+            )
+            project_id = response.data['id']
+            self.client.delete(f'/api/projects/{project_id}/')
+            job = Job.objects.get(name='projects.purge_project')
+
+            print_step("Exécution de la tâche une fois la rétention écoulée")
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            self.assertEqual(run_pending(), 1)
+            self.assertFalse(Project.all_objects.filter(id=project_id).exists())
+
+            response = self.client.get(f'/api/jobs/{job.id}/')
+            self.assertEqual(response.data['status'], Job.SUCCEEDED)
+            self.client.force_authenticate(user=self.other)
+            response = self.client.get(f'/api/jobs/{job.id}/')
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            print_result(True, "Le projet est purgé et le statut n'est visible que par son auteur")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class ReplicaRoutingTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS ROUTAGE RÉPLICAS{Style.RESET_ALL}\n")
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        caches['replica_pins'].clear()
+
+    @override_settings(REPLICA_DATABASES=['replica_1'])
+    def test_01_router_targets(self):
+        """Test le choix de la base par le router"""
+        try:
+            router = ReplicaRouter()
+            print_step("Lecture hors et dans un bloc replica_reads")
+            self.assertIsNone(router.db_for_read(Project))
+            with replica_reads():
+                self.assertEqual(router.db_for_read(Project), 'replica_1')
+                self.assertEqual(router.db_for_write(Project), 'default')
+            print_result(True, "Seules les lectures marquées vont sur le réplica")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    @override_settings(REPLICA_DATABASES=['default'])
+    def test_02_read_your_writes(self):
+        """Test l'épinglage sur la base principale après une écriture"""
+        try:
+            user = make_user('replica_user')
+            self.client.force_authenticate(user=user)
+            self.assertFalse(is_pinned_to_primary(user))
+
+            print_step("Création d'un projet puis relecture")
+            self.client.post('/api/projects/', {"title": "Projet", "description": "Description", "type": "iOS"})
+            self.assertTrue(is_pinned_to_primary(user))
+            # Épinglage dans le cache partagé entre processus, pas dans le cache local
+            self.assertTrue(caches['replica_pins'].get(f'replica-pin:{user.pk}'))
+            response = self.client.get('/api/projects/')
+            self.assertEqual(response.data['count'], 1)
+            print_result(True, "L'utilisateur relit ses propres écritures sur la base principale")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class MetricsTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS MÉTRIQUES{Style.RESET_ALL}\n")
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        for histogram in HISTOGRAMS:
+            histogram.clear()
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_01_endpoint_histograms(self):
+        """Test l'enregistrement des métriques par nom d'URL"""
+        try:
+            user = make_user('metrics_user')
+            self.client.force_authenticate(user=user)
+
+            print_step("Appel de la liste des projets puis lecture de /metrics")
+            self.client.get('/api/projects/')
+            body = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret').content.decode()
+            self.assertIn('softdesk_request_duration_seconds_count{endpoint="project-list"} 1', body)
+            self.assertIn('softdesk_db_queries_per_request_count{endpoint="project-list"} 1', body)
+            self.assertIn('softdesk_response_size_bytes_count{endpoint="project-list"} 1', body)
+            print_result(True, "Les histogrammes sont exposés au format Prometheus")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_02_metrics_token(self):
+        """Test la protection de /metrics par jeton"""
+        try:
+            print_step("Lecture de /metrics sans puis avec le jeton")
+            self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_403_FORBIDDEN)
+            response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            print_step("Sans jeton configuré, hors DEBUG")
+            with override_settings(METRICS_TOKEN=''):
+                self.assertEqual(self.client.get('/metrics').status_code, status.HTTP_404_NOT_FOUND)
+            print_result(True, "Le jeton est exigé, et l'endpoint est fermé sans jeton configuré")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class ProfilingTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS PROFILAGE{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Administrateur et utilisateur partagés par tous les tests de la classe"""
+        cls.staff = make_user('staff_user', is_staff=True)
+        cls.user = make_user('regular_user')
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+
+    def test_01_staff_profile(self):
+        """Test la capture et la lecture d'un profil par un administrateur"""
+        try:
+            # Le middleware lit le jeton lui-même : force_authenticate() ne lui est pas visible
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.staff)}')
+            print_step("Requête profilée puis lecture du profil")
+            response = self.client.get('/api/projects/', HTTP_X_PROFILE='sample')
+            profile_id = response['X-Profile-Id']
+            response = self.client.get(f'/api/profiles/{profile_id}/')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('text/plain', response['Content-Type'])
+            print_result(True, "Le profil est disponible au format flamegraph")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_regular_user_not_profiled(self):
+        """Test qu'un utilisateur non administrateur ne peut pas profiler"""
+        try:
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+            print_step("Requêtes avec ?profile= d'un utilisateur standard puis anonyme")
+            with mock.patch('softdesk.profiling.cProfile.Profile') as profiler:
+                response = self.client.get('/api/projects/', {'profile': 'cprofile'})
+                self.assertNotIn('X-Profile-Id', response)
+                self.client.credentials()
+                response = self.client.get('/api/projects/', {'profile': 'cprofile'})
+                self.assertNotIn('X-Profile-Id', response)
+            # Le profileur n'est même pas démarré
+            profiler.assert_not_called()
+            self.client.force_authenticate(user=self.user)
+            response = self.client.get('/api/profiles/')
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+            print_result(True, "Le profilage est réservé aux administrateurs")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class ObjectCacheTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS CACHE DES REPRÉSENTATIONS{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec une issue partagé par tous les tests de la classe"""
+        cls.author = make_user('cache_author')
+        cls.outsider = make_user('cache_outsider')
+        cls.project = make_project(cls.author, "Projet Cache")
+        cls.issue = make_issue(cls.project, cls.author, assignee=cls.author)
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        get_object_cache().clear()
+        self.client.force_authenticate(user=self.author)
+
+    def test_01_hit_still_checks_access(self):
+        """Test que le contenu est partagé mais que l'accès est vérifié pour chaque utilisateur"""
+        try:
+            url = f'/api/projects/{self.project.id}/'
+            print_step("Deux lectures successives du projet")
+            first = self.client.get(url)
+            second = self.client.get(url)
+            self.assertEqual((first['X-Object-Cache'], second['X-Object-Cache']), ('MISS', 'HIT'))
+            self.assertEqual(first.data, second.data)
+
+            print_step("Lecture du projet en cache par un non-contributeur")
+            self.client.force_authenticate(user=self.outsider)
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+            print_result(True, "Le cache ne contourne pas le contrôle d'accès")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_invalidation(self):
+        """Test l'invalidation après modification, renommage de l'auteur et suppression"""
+        try:
+            url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/'
+            self.client.get(url)
+
+            print_step("Modification de l'issue")
+            self.client.patch(url, {'title': "Titre modifié"})
+            response = self.client.get(url)
+            self.assertEqual((response['X-Object-Cache'], response.data['title']), ('MISS', "Titre modifié"))
+
+            print_step("Renommage de l'auteur")
+            self.author.username = 'cache_author_renamed'
+            self.author.save()
+            response = self.client.get(url)
+            self.assertEqual(response.data['author_username'], 'cache_author_renamed')
+
+            print_step("Suppression de l'issue")
+            self.client.delete(url)
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+            self.assertIsNone(get_object_cache().get(cache_key(Issue, self.issue.id)))
+            print_result(True, "Les entrées sont invalidées par les signaux")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class DenormalizationTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS DÉNORMALISATION{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec une issue commentée, créés avant l'activation du mode"""
+        cls.author = make_user('denorm_author')
+        cls.project = make_project(cls.author, "Projet Dénormalisé")
+        cls.issue = make_issue(cls.project, cls.author, assignee=cls.author)
+        Comment.objects.create(description="Commentaire", issue=cls.issue, author=cls.author)
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        self.client.force_authenticate(user=self.author)
+
+    @override_settings(DENORMALIZE_DISPLAY_FIELDS=True)
+    def test_01_sync_and_single_table_reads(self):
+        """Test le remplissage initial puis la lecture des listes sans jointure"""
+        try:
+            print_step("Remplissage des colonnes existantes")
+            self.assertEqual(Comment.objects.get().author_username, None)
+            call_command('sync_display_fields', stdout=io.StringIO())
+
+            print_step("Liste des commentaires en mode dénormalisé")
+            url = f'/api/projects/{self.project.id}/issues/{self.issue.id}/comments/'
+            with record_queries() as recorder:
+                response = self.client.get(url)
+            self.assertEqual(response.data['results'][0]['author_username'], 'denorm_author')
+            self.assertEqual(response.data['results'][0]['issue_title'], "Issue Test")
+            comment_query = next(shape.sql for shape in recorder.shapes.values() if 'FROM "projects_comment"' in shape.sql)
+            self.assertNotIn('JOIN', comment_query)
+            print_result(True, "Les listes lisent une seule table")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    @override_settings(DENORMALIZE_DISPLAY_FIELDS=True)
+    def test_02_rename_propagation(self):
+        """Test la propagation par tâche de fond d'un renommage et d'un nouveau titre"""
+        try:
+            print_step("Renommage de l'utilisateur et du titre de l'issue")
+            self.author.username = 'denorm_renamed'
+            self.author.save()
+            response = self.client.patch(
+                f'/api/projects/{self.project.id}/issues/{self.issue.id}/', {'title': "Nouveau titre"}
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                set(Job.objects.values_list('name', flat=True)),
+                {'projects.propagate_username', 'projects.propagate_issue_title'},
+            )
+
+            print_step("Exécution des tâches de propagation")
+            run_pending()
+            comment = Comment.objects.get()
+            self.assertEqual((comment.author_username, comment.issue_title), ('denorm_renamed', "Nouveau titre"))
+            self.assertEqual(Contributor.objects.get(user=self.author).username, 'denorm_renamed')
+            self.assertEqual(Issue.objects.get().author_username, 'denorm_renamed')
+            print_result(True, "Les renommages sont propagés par lots")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    @override_settings(DENORMALIZE_DISPLAY_FIELDS=True)
+    def test_03_partial_update_display_fields(self):
+        """Test qu'un changement d'assigné écrit aussi assignee_username, et seulement lui"""
+        try:
+            other = make_user('denorm_other')
+            Contributor.objects.create(user=other, project=self.project)
+
+            print_step("Changement d'assigné par PATCH")
+            with record_queries() as recorder:
+                response = self.client.patch(
+                    f'/api/projects/{self.project.id}/issues/{self.issue.id}/', {'assignee': other.id}
+                )
+            self.assertEqual(response.data['assignee_username'], 'denorm_other')
+            update = next(shape.sql for shape in recorder.shapes.values() if shape.sql.startswith('UPDATE'))
+            assignments = update.split(' SET ')[1].split(' WHERE ')[0]
+            self.assertEqual(
+                sorted(part.split(' = ')[0] for part in assignments.split(', ')),
+                ['"assignee_id"', '"assignee_username"', '"version"'],
+            )
+            print_result(True, "Seules les colonnes modifiées et leurs valeurs dérivées sont écrites")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class AdminTestCase(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS ADMINISTRATION{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec 25 contributeurs, des issues et des commentaires"""
+        cls.admin = make_user('admin_user', is_staff=True, is_superuser=True)
+        cls.project = make_project(cls.admin, "Projet Admin")
+        users = User.objects.bulk_create(
+            User(username=f'admin_contrib_{i}', date_of_birth='1990-01-01') for i in range(24)
+        )
+        Contributor.objects.bulk_create(Contributor(user=user, project=cls.project) for user in users)
+        for i, user in enumerate(users[:5]):
+            issue = make_issue(cls.project, cls.admin, f"Issue {i}", assignee=user)
+            Comment.objects.create(description="Commentaire", issue=issue, author=user)
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        self.client.force_login(self.admin)
+
+    def test_01_changelists_query_budget(self):
+        """Test que les listes de l'admin n'exécutent pas une requête par ligne"""
+        try:
+            for model in ('project', 'contributor', 'issue', 'comment'):
+                print_step(f"Liste {model}")
+                with self.assertQueryBudget(10, max_repeats=1):
+                    response = self.client.get(f'/admin/projects/{model}/')
+                self.assertEqual(response.status_code, 200)
+            response = self.client.get('/admin/projects/issue/', {'project': self.project.id})
+            self.assertEqual(response.context['cl'].result_count, 5)
+            print_result(True, "Les listes restent à nombre de requêtes constant")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_paginated_inline(self):
+        """Test que l'inline des contributeurs est paginé"""
+        try:
+            url = f'/admin/projects/project/{self.project.id}/change/'
+            print_step("Première puis seconde page de contributeurs")
+            with record_queries() as recorder:
+                formset = self.client.get(url).context['inline_admin_formsets'][0].formset
+            self.assertEqual((formset.initial_form_count(), formset.page.paginator.count), (20, 25))
+            # Les utilisateurs affichés par l'autocomplétion viennent du select_related : pas de requête par ligne
+            self.assertEqual(max(shape.count for shape in recorder.shapes.values()), 1)
+            formset = self.client.get(url, {'contributor_page': 2}).context['inline_admin_formsets'][0].formset
+            self.assertEqual(formset.initial_form_count(), 5)
+            print_result(True, "Seule une page d'objets liés est chargée, en un nombre fixe de requêtes")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_estimated_count(self):
+        """Test le nombre estimé de lignes sur une liste non filtrée"""
+        try:
+            print_step("Estimation depuis le SGBD")
+            self.assertGreaterEqual(estimate_row_count(Contributor), Contributor.objects.count())
+            estimate = estimate_row_count(Contributor)
+            with mock.patch('softdesk.admin_tools.ADMIN_EXACT_COUNT_LIMIT', 0):
+                paginator = EstimatedCountPaginator(Contributor.objects.order_by('pk'), 10)
+                with self.assertNumQueries(1):
+                    self.assertEqual(paginator.count, estimate)
+            print_result(True, "Le total est estimé sans COUNT(*)")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class BenchmarkToolingTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS OUTILS DE BENCHMARK{Style.RESET_ALL}\n")
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+
+    def test_01_dataset_generation(self):
+        """Test la génération d'un petit jeu de données de benchmark"""
+        try:
+            print_step("Génération de 20 utilisateurs, 10 projets, 50 issues, 100 commentaires")
+            DatasetGenerator(users=20, projects=10, issues=50, comments=100, batch_size=7).run()
+            self.assertEqual(User.objects.filter(username__startswith=BENCH_USER_PREFIX).count(), 20)
+            self.assertEqual(Project.objects.count(), 10)
+            self.assertEqual(Issue.objects.count(), 50)
+            self.assertEqual(Comment.objects.count(), 100)
+            # L'auteur de chaque projet en est contributeur
+            self.assertFalse(Project.objects.exclude(contributors__user=models.F('author')).exists())
+            print_result(True, "Le jeu de données respecte les volumes et les relations")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_baseline_comparison(self):
+        """Test la détection des régressions par rapport à une référence"""
+        try:
+            print_step("Comparaison de résultats à une référence")
+            baseline = {'project_list': {'p95_ms': 10.0, 'throughput_rps': 100.0}}
+            self.assertEqual(compare_to_baseline({'project_list': {'p95_ms': 11.0, 'throughput_rps': 95.0}}, baseline, 0.2), [])
+            regressions = compare_to_baseline({'project_list': {'p95_ms': 15.0, 'throughput_rps': 50.0}}, baseline, 0.2)
+            self.assertEqual(len(regressions), 2)
+            print_result(True, "Les régressions au-delà de la tolérance sont signalées")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_worker_errors_fail_the_run(self):
+        """Test qu'une erreur dans un thread de charge fait échouer la mesure"""
+        try:
+            print_step("Un appel sur dix échoue dans un des quatre threads")
+            calls = itertools.count()
+
+            def make_worker():
+                def call():
+                    if next(calls) == 5:
+                        raise CommandError("GET /api/projects/ : statut 500")
+                return call
+
+            with self.assertRaisesMessage(CommandError, "statut 500"):
+                run_load(make_worker, 10, concurrency=4)
+            self.assertIn('throughput_rps', run_load(lambda: lambda: None, 10, concurrency=4))
+            print_result(True, "L'erreur remonte au lieu d'être perdue dans le thread")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class BulkImportTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS IMPORT EN MASSE{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec un auteur et un contributeur assignable"""
+        cls.author = make_user('bulk_author')
+        cls.contributor = make_user('bulk_contributor')
+        cls.project = make_project(cls.author)
+        Contributor.objects.create(user=cls.contributor, project=cls.project)
+        cls.url = f'/api/projects/{cls.project.id}/issues/bulk/'
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        self.client.force_authenticate(user=self.author)
+
+    def issue_payload(self, index, **extra):
+        return {'title': f"Import {index}", 'description': "Importée", 'priority': 'LOW', 'tag': 'TASK', **extra}
+
+    def test_01_bulk_json_array(self):
+        """Test l'import d'un tableau JSON inséré par paquets"""
+        try:
+            print_step("Import de 5 issues par paquets de 2")
+            items = [self.issue_payload(index) for index in range(4)]
+            items.append(self.issue_payload(4, assignee=self.contributor.id))
+            with mock.patch('projects.bulk.BULK_CHUNK_SIZE', 2), record_queries() as recorder:
+                response = self.client.post(self.url, json.dumps(items), content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data, {'created': 5})
+            inserts = sum(shape.count for shape in recorder.shapes.values()
+                          if shape.sql.startswith('INSERT INTO "projects_issue"'))
+            self.assertEqual(inserts, 3)
+            issue = Issue.objects.get(title="Import 4")
+            self.assertEqual((issue.author, issue.assignee), (self.author, self.contributor))
+
+            print_step("Le corps est lu hors de la transaction d'insertion")
+            depth = len(connection.atomic_blocks)
+            depths = []
+
+            def items():
+                for index in range(3):
+                    depths.append(len(connection.atomic_blocks))
+                    yield self.issue_payload(index)
+
+            self.assertEqual(import_issues(self.project, self.author, items()), 3)
+            self.assertEqual(depths, [depth] * 3)
+            print_result(True, "Les issues sont validées puis insérées par paquets")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_invalid_item_rolls_back(self):
+        """Test qu'un élément NDJSON invalide annule tout l'import"""
+        try:
+            print_step("NDJSON dont la troisième ligne a une priorité invalide")
+            lines = [self.issue_payload(0), self.issue_payload(1), self.issue_payload(2, priority='URGENT')]
+            body = '\n'.join(json.dumps(line) for line in lines) + '\n'
+            response = self.client.post(self.url, body, content_type='application/x-ndjson')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['index'], 2)
+            self.assertIn('priority', response.data['errors'])
+            self.assertFalse(Issue.objects.filter(title__startswith="Import").exists())
+            print_result(True, "L'élément fautif est signalé et rien n'est inséré")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_size_limits(self):
+        """Test les limites de taille du corps et du nombre d'éléments"""
+        try:
+            print_step("Dépassement du nombre d'éléments puis de la taille du corps")
+            body = json.dumps([self.issue_payload(index) for index in range(3)])
+            with override_settings(BULK_MAX_ITEMS=2):
+                response = self.client.post(self.url, body, content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            with override_settings(BULK_MAX_BODY_BYTES=100):
+                response = self.client.post(self.url, body, content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+            print_step("Élément trop volumineux contenu dans un seul bloc de lecture")
+            large = self.issue_payload(0, description="x" * 1000)
+            with override_settings(BULK_MAX_ITEM_BYTES=100):
+                response = self.client.post(self.url, json.dumps([large]), content_type='application/json')
+                self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+                response = self.client.post(self.url, json.dumps(large) + '\n', content_type='application/x-ndjson')
+                self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+            self.assertFalse(Issue.objects.filter(title__startswith="Import").exists())
+            print_result(True, "Les corps trop volumineux sont refusés (413)")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_04_incremental_parsing(self):
+        """Test le décodage élément par élément sur des blocs coupés n'importe où"""
+        try:
+            print_step("Tableau JSON lu par blocs de 7 octets")
+            items = [
+                {'title': "[crochet], virgule", 'n': 12345}, {'title': "accentué é \u2028"}, 42, [1, 2],
+                {'ok': True, 'none': None, 'x': -1.5e-3},
+            ]
+            raw = ('[ ' + ' ,\n'.join(json.dumps(item, ensure_ascii=False) for item in items) + ' ]  ').encode()
+            reader = BodyReader(io.BytesIO(raw), max_body_bytes=len(raw), read_size=7)
+            iterator = iter_json_array(reader, max_item_bytes=1024)
+            self.assertEqual(next(iterator), items[0])
+            # Le premier élément est disponible avant la lecture complète du corps
+            self.assertLess(reader.total, len(raw))
+            self.assertEqual(list(iterator), items[1:])
+            # Jetons coupés à toutes les positions possibles
+            for read_size in range(1, 12):
+                reader = BodyReader(io.BytesIO(raw), max_body_bytes=len(raw), read_size=read_size)
+                self.assertEqual(list(iter_json_array(reader, max_item_bytes=1024)), items)
+            with self.assertRaises(ParseError):
+                list(iter_json_array(BodyReader(io.BytesIO(b'[{"a": 1} {"b": 2}]'), 100), 1024))
+            print_result(True, "Les éléments sont décodés au fil de la lecture")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_05_invalid_item_fails_fast(self):
+        """Test qu'un élément invalide suivi de données est refusé (400) sans lire la suite"""
+        try:
+            print_step("Élément invalide en tête d'un corps de 20 000 éléments")
+            body = '[{"title": bad}, ' + ', '.join([json.dumps(self.issue_payload(0))] * 20000) + ']'
+            response = self.client.post(self.url, body, content_type='application/json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("JSON invalide", str(response.data['detail']))
+
+            reader = BodyReader(io.BytesIO(body.encode()), max_body_bytes=len(body))
+            with self.assertRaises(ParseError):
+                list(iter_json_array(reader, max_item_bytes=1024))
+            self.assertEqual(reader.total, 64 * 1024)
+            print_result(True, "L'erreur de syntaxe est signalée dès le premier bloc")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class CompressionTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS COMPRESSION{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Utilisateur avec une page de projets de plus de COMPRESSION_MIN_SIZE octets"""
+        cls.user = make_user('compression_user')
+        for index in range(10):
+            make_project(cls.user, f"Projet {index}", description="Description détaillée du projet. " * 10)
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        self.client.force_authenticate(user=self.user)
+
+    def test_01_gzip_json(self):
+        """Test la compression gzip d'une liste JSON et le contenu décompressé"""
+        try:
+            print_step("Liste des projets avec puis sans Accept-Encoding: gzip")
+            plain = self.client.get('/api/projects/')
+            response = self.client.get('/api/projects/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertIn('Accept-Encoding', response['Vary'])
+            self.assertLess(int(response['Content-Length']), len(plain.content))
+            self.assertEqual(gzip.decompress(response.content), plain.content)
+            self.assertFalse(plain.has_header('Content-Encoding'))
+            print_result(True, f"{len(plain.content)} octets compressés en {response['Content-Length']}")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_small_response_skipped(self):
+        """Test qu'une réponse sous le seuil n'est pas compressée"""
+        try:
+            print_step("Lecture d'un projet (réponse courte)")
+            project = Project.objects.filter(author=self.user).first()
+            response = self.client.get(f'/api/projects/{project.id}/', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertLess(len(response.content), 1024)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            print_result(True, "Les petites réponses sont servies telles quelles")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_streaming_response(self):
+        """Test la compression morceau par morceau d'une réponse en flux"""
+        try:
+            print_step("Flux NDJSON de trois morceaux compressé par le middleware")
+            lines = [json.dumps({'id': index, 'title': f"Issue {index}"}).encode() + b'\n' for index in range(3)]
+            middleware = CompressionMiddleware(
+                lambda request: StreamingHttpResponse(iter(lines), content_type='application/x-ndjson')
+            )
+            request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+            response = middleware(request)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            parts = list(response.streaming_content)
+            # Chaque morceau est vidé : il se décompresse sans attendre la fin du flux
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            self.assertEqual(decompressor.decompress(parts[0]), lines[0])
+            self.assertEqual(gzip.decompress(b''.join(parts)), b''.join(lines))
+            print_result(True, "Le flux est compressé sans être mis en mémoire tampon")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_04_encoding_negotiation(self):
+        """Test la négociation d'Accept-Encoding"""
+        try:
+            print_step("Préférence brotli, pondérations q et refus explicites")
+            both = ('br', 'gzip')
+            self.assertEqual(negotiate_encoding('gzip, deflate, br', both), 'br')
+            self.assertEqual(negotiate_encoding('br;q=0.5, gzip', both), 'gzip')
+            self.assertEqual(negotiate_encoding('gzip', both), 'gzip')
+            self.assertEqual(negotiate_encoding('*', ('gzip',)), 'gzip')
+            self.assertIsNone(negotiate_encoding('gzip;q=0', ('gzip',)))
+            self.assertIsNone(negotiate_encoding('', both))
+            print_result(True, "L'encodage retenu respecte les préférences du client")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_05_html_not_compressed(self):
+        """Test que les pages HTML (jeton CSRF) ne sont pas compressées"""
+        try:
+            print_step("Page de connexion de l'admin avec Accept-Encoding: gzip")
+            response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip')
+            self.assertGreater(len(response.content), 1024)
+            self.assertIn(b'csrfmiddlewaretoken', response.content)
+            self.assertFalse(response.has_header('Content-Encoding'))
+            print_result(True, "Le HTML est servi non compressé (BREACH)")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+class ActivityTestCase(APITestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        say(f"\n{Fore.CYAN}🚀 DÉMARRAGE DES TESTS HISTORIQUE D'ACTIVITÉ{Style.RESET_ALL}\n")
+
+    @classmethod
+    def setUpTestData(cls):
+        """Projet avec une issue, auteur et utilisateur extérieur"""
+        cls.user = make_user('activity_user')
+        cls.other = make_user('activity_other')
+        cls.project = make_project(cls.user, "Projet historique")
+        cls.issue = make_issue(cls.project, cls.user, "Issue historique")
+
+    def setUp(self):
+        """Configuration initiale pour chaque test"""
+        test_name = self._testMethodName
+        print_test_header(test_name)
+        say(f"{Fore.YELLOW}⏳ Démarrage du test...{Style.RESET_ALL}")
+        self.client.force_authenticate(user=self.user)
+        self.url = f'/api/projects/{self.project.id}/activity/'
+        # Le tampon est propre au processus : on écarte les événements laissés par d'autres tests
+        flush_activity()
+        ActivityEvent.objects.all().delete()
+
+    def test_01_compact_status_change(self):
+        """Test l'enregistrement compact d'un changement de statut et sa lecture"""
+        try:
+            print_step("Passage de l'issue à Finished")
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.patch(
+                    f'/api/projects/{self.project.id}/issues/{self.issue.id}/', {'status': 'Finished'}, format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            # Écrit par lots : rien en base avant le vidage du tampon
+            self.assertFalse(ActivityEvent.objects.exists())
+            self.assertEqual(flush_activity(), 1)
+            event = ActivityEvent.objects.get()
+            self.assertEqual(event.changes, {'s': [1, 3]})
+
+            print_step("Lecture de l'historique")
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['results'], [{
+                'id': event.id,
+                'verb': 'issue_updated',
+                'actor': self.user.id,
+                'object_id': self.issue.id,
+                'changes': {'status': ['To Do', 'Finished']},
+                'created_at': response.data['results'][0]['created_at'],
+            }])
+            print_result(True, "Le statut est stocké en entiers et relu en clair")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_02_contributor_events_and_access(self):
+        """Test l'événement d'ajout de contributeur et l'accès réservé aux contributeurs"""
+        try:
+            print_step("Accès refusé à un non-contributeur")
+            self.client.force_authenticate(user=self.other)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+            print_step("Ajout d'un contributeur puis lecture par ce contributeur")
+            self.client.force_authenticate(user=self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    f'/api/projects/{self.project.id}/contributors/', {'user': self.other.id}, format='json'
+                )
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            flush_activity()
+            self.client.force_authenticate(user=self.other)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            event = response.data['results'][0]
+            self.assertEqual(event['verb'], 'contributor_added')
+            self.assertEqual(event['object_id'], self.other.id)
+            self.assertIsNone(event['changes'])
+            print_result(True, "L'ajout est tracé et l'historique réservé aux contributeurs")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_03_archival(self):
+        """Test le déplacement des événements anciens vers l'archive"""
+        try:
+            print_step("Deux événements, dont un de plus de 90 jours")
+            with self.captureOnCommitCallbacks(execute=True):
+                for title in ("Ancienne", "Récente"):
+                    self.client.post(
+                        f'/api/projects/{self.project.id}/issues/',
+                        {'title': title, 'description': "Description", 'priority': 'LOW', 'tag': 'BUG'},
+                        format='json',
+                    )
+            flush_activity()
+            old = ActivityEvent.objects.order_by('id').first()
+            ActivityEvent.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=120))
+
+            print_step("Archivage par lots de 1")
+            self.assertEqual(archive_activity(batch_size=1), 1)
+            self.assertEqual(ActivityEvent.objects.count(), 1)
+            self.assertEqual(ActivityArchive.objects.get().pk, old.pk)
+
+            print_step("Lecture de l'archive")
+            response = self.client.get(self.url, {'archived': 'true'})
+            self.assertEqual([event['id'] for event in response.data['results']], [old.pk])
+            self.assertEqual(response.data['results'][0]['verb'], 'issue_created')
+            print_result(True, "Les événements anciens quittent la table chaude sans être perdus")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_04_ordered_by_event_time(self):
+        """Test le tri de l'historique sur l'heure de l'événement, pas sur l'ordre d'écriture"""
+        try:
+            print_step("Deux événements, le plus récent écrit en premier")
+            with self.captureOnCommitCallbacks(execute=True):
+                for title in ("Première", "Seconde"):
+                    self.client.post(
+                        f'/api/projects/{self.project.id}/issues/',
+                        {'title': title, 'description': "Description", 'priority': 'LOW', 'tag': 'BUG'},
+                        format='json',
+                    )
+            flush_activity()
+            first, second = ActivityEvent.objects.order_by('id')
+            # Tampon d'un autre processus vidé plus tard : identifiant plus grand, événement plus ancien
+            ActivityEvent.objects.filter(pk=second.pk).update(created_at=first.created_at - timedelta(minutes=5))
+
+            print_step("Lecture page par page")
+            response = self.client.get(self.url, {'page_size': 1})
+            self.assertEqual([event['id'] for event in response.data['results']], [first.pk])
+            response = self.client.get(response.data['next'])
+            self.assertEqual([event['id'] for event in response.data['results']], [second.pk])
+            print_result(True, "L'historique suit l'heure des événements")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
+    def test_05_background_flush(self):
+        """Test le vidage par minuteur et à l'arrêt du processus, sans nouvelle requête"""
+        try:
+            print_step("Premier événement d'un lot : minuteur armé")
+            with override_settings(ACTIVITY_BACKGROUND_FLUSH=True), \
+                    mock.patch('projects.activity.threading.Timer') as timer, \
+                    mock.patch('projects.activity.connections'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.patch(
+                        f'/api/projects/{self.project.id}/issues/{self.issue.id}/', {'status': 'Finished'}, format='json'
+                    )
+                timer.assert_called_once()
+                interval, callback = timer.call_args.args
+                self.assertEqual(interval, activity._buffer.interval)
+                timer.return_value.start.assert_called_once()
+                self.assertFalse(ActivityEvent.objects.exists())
+
+                print_step("Échéance du minuteur")
+                callback()
+                self.assertEqual(ActivityEvent.objects.count(), 1)
+
+                print_step("Arrêt du processus avec un événement en attente")
+                with self.captureOnCommitCallbacks(execute=True):
+                    self.client.patch(
+                        f'/api/projects/{self.project.id}/issues/{self.issue.id}/', {'status': 'To Do'}, format='json'
+                    )
+                activity.flush_activity_at_exit()
+                self.assertEqual(ActivityEvent.objects.count(), 2)
+            print_result(True, "Un processus inactif écrit son tampon")
+        except AssertionError as e:
+            print_result(False, str(e))
+            raise
+
 def print_test_summary(success_count, total_count):
-    print(f"\n{Fore.CYAN}{'=' * 50}")
-    print(f"📊 RÉSUMÉ DES TESTS")
-    print(f"{'=' * 50}")
-    print(f"Tests réussis: {Fore.GREEN}{success_count}{Style.RESET_ALL}")
-    print(f"Tests totaux: {total_count}")
+    say(f"\n{Fore.CYAN}{'=' * 50}")
+    say(f"📊 RÉSUMÉ DES TESTS")
+    say(f"{'=' * 50}")
+    say(f"Tests réussis: {Fore.GREEN}{success_count}{Style.RESET_ALL}")
+    say(f"Tests totaux: {total_count}")
     success_rate = (success_count / total_count) * 100
     color = Fore.GREEN if success_rate == 100 else Fore.YELLOW if success_rate >= 80 else Fore.RED
-    print(f"Taux de réussite: {color}{success_rate:.1f}%{Style.RESET_ALL}")
-    print(f"{'=' * 50}{Style.RESET_ALL}\n")
+    say(f"Taux de réussite: {color}{success_rate:.1f}%{Style.RESET_ALL}")
+    say(f"{'=' * 50}{Style.RESET_ALL}\n")
 
 class TestRunner(unittest.TextTestRunner):
     def run(self, test):
@@ -3,7 +3,15 @@
 from django.urls import include, path
 from rest_framework_nested import routers
 
-from .views import CommentViewSet, ContributorViewSet, IssueViewSet, ProjectViewSet
+from .views import (
+    CommentViewSet,
+    ContributorViewSet,
+    IssueViewSet,
+    MyIssueListView,
+    ProjectActivityListView,
+    ProjectViewSet,
+    TombstoneListView,
+)
 
 # Router principal pour les projets
 router = routers.DefaultRouter()
@@ -21,6 +29,9 @@ issues_router.register(r'comments', CommentViewSet, basename='issue-comments')
 
 
 urlpatterns = [
+    path('me/issues/', MyIssueListView.as_view(), name='my-issues'),
+    path('tombstones/', TombstoneListView.as_view(), name='tombstones'),
+    path('projects/<int:project_pk>/activity/', ProjectActivityListView.as_view(), name='project-activity'),
     path('', include(router.urls)),
     path('', include(projects_router.urls)),
     path('', include(issues_router.urls)),
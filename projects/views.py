@@ -1,16 +1,36 @@
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError, models
+from django.db import IntegrityError, models, transaction
 from django.shortcuts import get_object_or_404
-from rest_framework import permissions, serializers, status, viewsets
+from django.utils.dateparse import parse_datetime
+from rest_framework import generics, permissions, serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 
-from .models import Comment, Contributor, Issue, Project
+from jobs.registry import enqueue
+from softdesk.parsers import JSONArrayStreamParser, NDJSONStreamParser
+from softdesk.routers import ReplicaReadMixin
+
+from . import activity
+from .bulk import BulkItemError, import_issues
+from .caching import CachedRetrieveMixin
+from .concurrency import OptimisticConcurrencyMixin
+from .deletion import SOFT_DELETE_RETENTION_DAYS
+from .denormalization import with_display_relations
+from .expansion import ExpandViewMixin, contributors_with_users, latest_comments
+from .models import ActivityArchive, ActivityEvent, ActivityVerb, Comment, Contributor, Issue, Project, Tombstone
+from .onboarding import add_contributors
+from .pagination import ActivityCursorPagination, AssignedIssueCursorPagination, TombstoneCursorPagination
 from .serializers import (
+    ActivityEventSerializer,
     CommentSerializer,
+    ContributorBulkSerializer,
     ContributorSerializer,
     IssueSerializer,
     ProjectSerializer,
+    TombstoneSerializer,
 )
 
 User = get_user_model()
@@ -28,7 +48,7 @@ class IsAuthor(permissions.BasePermission):
             return obj.project.author == request.user
         return False
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ExpandViewMixin, CachedRetrieveMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des projets.
     Permet de créer, lire, mettre à jour et supprimer des projets.
@@ -37,6 +57,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated] 
+    expansions = {
+        'author': lambda queryset: queryset.select_related('author'),
+        'contributors': contributors_with_users,
+    }
 
     def get_permissions(self):
         """
@@ -53,28 +77,52 @@ class ProjectViewSet(viewsets.ModelViewSet):
         Retourne les projets dont l'utilisateur est l'auteur ou un contributeur.
         """
         user = self.request.user
-        return Project.objects.filter(models.Q(author=user) | models.Q(contributors__user=user)).distinct()
+        return self.expand_queryset(
+            Project.objects.filter(models.Q(author=user) | models.Q(contributors__user=user)).distinct()
+        )
 
     def perform_create(self, serializer):
         """Assigne automatiquement l'utilisateur connecté comme auteur du projet"""
-        project = serializer.save(author=self.request.user)
-        Contributor.objects.create(user=self.request.user, project=project)
+        # Deux INSERT dans une transaction : jamais de projet sans son auteur contributeur
+        with transaction.atomic():
+            project = serializer.save(author=self.request.user)
+            Contributor.objects.create(user=self.request.user, project=project)
+            activity.record(project.pk, self.request.user, ActivityVerb.PROJECT_CREATED, project.pk)
+
+    def perform_update(self, serializer):
+        before = activity.snapshot(serializer.instance)
+        project = serializer.save()
+        activity.record_update(project.pk, self.request.user, ActivityVerb.PROJECT_UPDATED, project, before)
 
     def destroy(self, request, *args, **kwargs):
         """Seul l'auteur peut supprimer le projet"""
         project = self.get_object()
         if project.author != request.user:
             raise PermissionDenied("Seul l'auteur du projet peut le supprimer")
-        return super().destroy(request, *args, **kwargs)
+        # Suppression logique : le contenu est purgé par lots en tâche de fond après la rétention.
+        # La tâche est créée dans la même transaction : pas de projet supprimé jamais purgé
+        with transaction.atomic():
+            project.soft_delete()
+            enqueue(
+                'projects.purge_project',
+                {'project_id': project.pk},
+                priority=-10,
+                user=request.user,
+                run_after=project.deleted_at + timedelta(days=SOFT_DELETE_RETENTION_DAYS),
+            )
+            activity.record(project.pk, request.user, ActivityVerb.PROJECT_DELETED, project.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class ContributorViewSet(viewsets.ModelViewSet):
+class ContributorViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = ContributorSerializer
     permission_classes = [permissions.IsAuthenticated, IsAuthor]
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_pk')
-        return Contributor.objects.filter(project_id=project_id)
+        return with_display_relations(
+            Contributor.objects.filter(project_id=project_id, project__deleted_at__isnull=True), 'user'
+        )
 
     def perform_create(self, serializer):
         project_id = self.kwargs.get('project_pk')
@@ -88,7 +136,27 @@ class ContributorViewSet(viewsets.ModelViewSet):
         if Contributor.objects.filter(project=project, user=user).exists():
             raise serializers.ValidationError("Cet utilisateur est déjà contributeur du projet.")
 
-        serializer.save(project=project)
+        contributor = serializer.save(project=project)
+        activity.record(project.pk, self.request.user, ActivityVerb.CONTRIBUTOR_ADDED, contributor.user_id)
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, project_pk=None):
+        """
+        Ajout de contributeurs en masse : {"users": [ids]}.
+        Trois requêtes SQL dans une transaction, quel que soit le nombre d'utilisateurs.
+        """
+        project = get_object_or_404(Project, id=project_pk, deleted_at__isnull=True)
+        if project.author_id != request.user.id:
+            raise PermissionDenied("Seul l'auteur du projet peut ajouter des contributeurs")
+        serializer = ContributorBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        added, existing, missing = add_contributors(project, serializer.validated_data['users'])
+        for user_id in added:
+            activity.record(project.pk, request.user, ActivityVerb.CONTRIBUTOR_ADDED, user_id)
+        return Response(
+            {'added': added, 'already_contributors': existing, 'missing': missing},
+            status=status.HTTP_201_CREATED if added else status.HTTP_200_OK,
+        )
 
     def destroy(self, request, *args, **kwargs):
         """
@@ -110,16 +178,29 @@ class ContributorViewSet(viewsets.ModelViewSet):
 
         # Supprimer le contributeur
         contributor.delete()
+        activity.record(project.pk, request.user, ActivityVerb.CONTRIBUTOR_REMOVED, contributor.user_id)
         return Response({"message": "Contributeur supprimé avec succès"}, status=status.HTTP_200_OK)
 
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(
+    OptimisticConcurrencyMixin, ExpandViewMixin, CachedRetrieveMixin, ReplicaReadMixin, viewsets.ModelViewSet
+):
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated]
+    expansions = {
+        'project': lambda queryset: queryset.select_related('project'),
+        'author': lambda queryset: queryset.select_related('author'),
+        'assignee': lambda queryset: queryset.select_related('assignee'),
+        'comments': latest_comments,
+    }
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_pk')
-        return Issue.objects.filter(project_id=project_id)
+        # author/assignee chargés dans la même requête (author_username, assignee_username),
+        # sauf en mode dénormalisé où ces valeurs sont sur la ligne
+        return self.expand_queryset(with_display_relations(
+            Issue.objects.filter(project_id=project_id, project__deleted_at__isnull=True), 'author', 'assignee'
+        ))
 
     def get_serializer_context(self):
         """
@@ -136,21 +217,47 @@ class IssueViewSet(viewsets.ModelViewSet):
         if not Contributor.objects.filter(project=project, user=self.request.user).exists():
             raise PermissionDenied("Vous devez être contributeur du projet pour créer une issue")
 
-        serializer.save(author=self.request.user, project=project)
+        issue = serializer.save(author=self.request.user, project=project)
+        activity.record(project.pk, self.request.user, ActivityVerb.ISSUE_CREATED, issue.pk)
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONArrayStreamParser, NDJSONStreamParser])
+    def bulk(self, request, project_pk=None):
+        """
+        Import en masse : tableau JSON ou NDJSON d'issues, lu en flux et validé hors
+        transaction, puis inséré par paquets. Tout ou rien : un élément invalide annule
+        l'import (400 avec son index).
+        """
+        project = get_object_or_404(Project, id=project_pk, deleted_at__isnull=True)
+        if not Contributor.objects.filter(project=project, user=request.user).exists():
+            raise PermissionDenied("Vous devez être contributeur du projet pour créer des issues")
+        if isinstance(request.data, dict):
+            # Corps vide : DRF ne fait pas appel au parser
+            raise serializers.ValidationError("Un tableau JSON ou du NDJSON est attendu")
+        try:
+            created = import_issues(project, request.user, request.data)
+        except BulkItemError as exc:
+            return Response({'index': exc.index, 'errors': exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+        # Un seul événement pour l'import, pas un par issue
+        activity.record_import(project.pk, request.user, created)
+        return Response({'created': created}, status=status.HTTP_201_CREATED)
 
     def perform_update(self, serializer):
         """Seul l'auteur peut modifier l'issue"""
         if serializer.instance.author != self.request.user:
             raise PermissionDenied("Seul l'auteur peut modifier cette issue")
-        serializer.save()
+        before = activity.snapshot(serializer.instance)
+        self.save_versioned(serializer)
+        issue = serializer.instance
+        activity.record_update(issue.project_id, self.request.user, ActivityVerb.ISSUE_UPDATED, issue, before)
 
     def perform_destroy(self, instance):
         """Seul l'auteur peut supprimer l'issue"""
         if instance.author != self.request.user:
             raise PermissionDenied("Seul l'auteur peut supprimer cette issue")
-        instance.delete()
+        instance.soft_delete()
+        activity.record(instance.project_id, self.request.user, ActivityVerb.ISSUE_DELETED, instance.pk)
         
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(OptimisticConcurrencyMixin, ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -163,7 +270,7 @@ class CommentViewSet(viewsets.ModelViewSet):
         project_id = self.kwargs.get('project_pk')
         
         # Vérifie que l'issue existe et appartient au bon projet
-        issue = get_object_or_404(Issue, id=issue_id, project_id=project_id)
+        issue = get_object_or_404(Issue, id=issue_id, project_id=project_id, project__deleted_at__isnull=True)
         
         # Vérifie que l'utilisateur est contributeur
         if not Contributor.objects.filter(
@@ -174,7 +281,7 @@ class CommentViewSet(viewsets.ModelViewSet):
                 "Vous devez être contributeur du projet pour voir les commentaires"
             )
             
-        return Comment.objects.filter(issue_id=issue_id)
+        return with_display_relations(Comment.objects.filter(issue_id=issue_id), 'author', 'issue')
 
     def perform_create(self, serializer):
         """
@@ -196,10 +303,11 @@ class CommentViewSet(viewsets.ModelViewSet):
                 "Vous devez être contributeur du projet pour commenter"
             )
 
-        serializer.save(
+        comment = serializer.save(
             author=self.request.user,
             issue=issue
         )
+        activity.record(project.pk, self.request.user, ActivityVerb.COMMENT_CREATED, comment.pk)
 
     def perform_update(self, serializer):
         """Seul l'auteur peut modifier le commentaire"""
@@ -207,7 +315,11 @@ class CommentViewSet(viewsets.ModelViewSet):
             raise PermissionDenied(
                 "Seul l'auteur peut modifier ce commentaire"
             )
-        serializer.save()
+        before = activity.snapshot(serializer.instance)
+        self.save_versioned(serializer)
+        activity.record_update(
+            int(self.kwargs['project_pk']), self.request.user, ActivityVerb.COMMENT_UPDATED, serializer.instance, before
+        )
 
     def perform_destroy(self, instance):
         """Seul l'auteur peut supprimer le commentaire"""
@@ -215,4 +327,64 @@ class CommentViewSet(viewsets.ModelViewSet):
             raise PermissionDenied(
                 "Seul l'auteur peut supprimer ce commentaire"
             )
-        instance.delete()
\ No newline at end of file
+        instance.soft_delete()
+        activity.record(int(self.kwargs['project_pk']), self.request.user, ActivityVerb.COMMENT_DELETED, instance.pk)
+
+
+class MyIssueListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Liste les issues ouvertes assignées à l'utilisateur connecté, tous projets confondus.
+    S'appuie sur l'index (assignee, status, created_time) et une pagination par curseur.
+    """
+    serializer_class = IssueSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = AssignedIssueCursorPagination
+
+    def get_queryset(self):
+        return with_display_relations(
+            Issue.objects.filter(
+                assignee=self.request.user,
+                status__in=Issue.OPEN_STATUSES,
+                project__deleted_at__isnull=True,
+            ),
+            'author', 'assignee',
+        )
+
+
+class TombstoneListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Liste les suppressions survenues dans les projets de l'utilisateur connecté.
+    Les clients de synchronisation passent ?since=<date ISO> pour ne récupérer que les nouvelles.
+    """
+    serializer_class = TombstoneSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TombstoneCursorPagination
+
+    def get_queryset(self):
+        project_ids = Contributor.objects.filter(user=self.request.user).values('project_id')
+        queryset = Tombstone.objects.filter(project_id__in=project_ids)
+        since = self.request.query_params.get('since')
+        if since:
+            since_date = parse_datetime(since)
+            if since_date is None:
+                raise serializers.ValidationError({'since': "Date invalide, format ISO 8601 attendu"})
+            queryset = queryset.filter(deleted_at__gt=since_date)
+        return queryset
+
+
+class ProjectActivityListView(ReplicaReadMixin, generics.ListAPIView):
+    """
+    Historique d'activité d'un projet, du plus récent au plus ancien (contributeurs uniquement).
+    ?archived=true lit les événements archivés (plus vieux que ACTIVITY_HOT_DAYS).
+    """
+    serializer_class = ActivityEventSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ActivityCursorPagination
+
+    def get_queryset(self):
+        project = get_object_or_404(Project, id=self.kwargs['project_pk'])
+        if not Contributor.objects.filter(project=project, user=self.request.user).exists():
+            raise PermissionDenied("Vous devez être contributeur du projet pour voir son activité")
+        archived = self.request.query_params.get('archived', '').lower() == 'true'
+        model = ActivityArchive if archived else ActivityEvent
+        return model.objects.filter(project_id=project.pk)
@@ -0,0 +1,194 @@
+"""
+Outils d'administration pour les grosses tables.
+
+- EstimatedCountPaginator : sur une liste non filtrée, le nombre de lignes vient
+  des statistiques du SGBD au lieu d'un COUNT(*) qui parcourt toute la table.
+- PaginatedTabularInline : les inlines n'affichent qu'une page d'objets liés.
+- PreloadedAutocompleteSelect : dans ces inlines, les widgets d'autocomplétion
+  affichent l'objet lié déjà chargé par la ligne au lieu de le relire.
+- related_id_filter : filtre sur une clé étrangère sans charger toutes les
+  valeurs possibles dans la barre latérale (?<champ>=<id>).
+"""
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.forms.models import BaseInlineFormSet
+from django.http import QueryDict
+from django.utils.functional import cached_property
+
+# En dessous de ce nombre estimé de lignes, le COUNT(*) exact reste bon marché
+ADMIN_EXACT_COUNT_LIMIT = getattr(settings, 'ADMIN_EXACT_COUNT_LIMIT', 10_000)
+
+
+def estimate_row_count(model, using='default'):
+    """Nombre approximatif de lignes de la table, ou None si le SGBD ne le fournit pas."""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # reltuples vaut -1 tant que la table n'a jamais été analysée
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+        elif connection.vendor == 'sqlite':
+            # Plus grand rowid : lecture de la dernière feuille du B-tree, surestime s'il y a des trous
+            cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+        else:
+            return None
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator de changelist : total estimé si la liste n'est pas filtrée et que la table est grosse."""
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """ModelAdmin de base pour les tables volumineuses."""
+    paginator = EstimatedCountPaginator
+    # Évite le second COUNT(*) non filtré ("x résultats sur y au total")
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class SoftDeleteAdminMixin:
+    """Affiche aussi les lignes supprimées logiquement, filtrables par deleted_at."""
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.get_queryset()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+
+class PreloadedAutocompleteSelect(AutocompleteSelect):
+    """
+    AutocompleteSelect qui affiche l'objet lié déjà chargé (select_related de la
+    ligne) : sans cela, chaque ligne de l'inline lit le libellé de sa valeur
+    sélectionnée par une requête, soit un N+1 par page.
+    """
+    preloaded = None
+
+    def optgroups(self, name, value, attr=None):
+        obj = self.preloaded
+        selected = [str(v) for v in value if str(v) not in self.choices.field.empty_values]
+        remote_opts = self.field.remote_field.model._meta
+        if (
+            obj is None
+            or selected != [str(obj.pk)]
+            or self.field.remote_field.field_name != remote_opts.pk.name
+        ):
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(
+            self.create_option(name, obj.pk, self.choices.field.label_from_instance(obj), True, len(options))
+        )
+        return [(None, options, 0)]
+
+
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    per_page = 20
+    page_number = 1
+    page_param = 'page'
+    query_params = QueryDict()
+
+    def get_queryset(self):
+        if not hasattr(self, '_page'):
+            paginator = Paginator(super().get_queryset(), self.per_page)
+            self._page = paginator.get_page(self.page_number)
+        return self._page.object_list
+
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        if form.instance.pk is not None:
+            for name, field in form.fields.items():
+                # Le widget admin est enveloppé par RelatedFieldWidgetWrapper
+                widget = getattr(field.widget, 'widget', field.widget)
+                if (
+                    isinstance(widget, PreloadedAutocompleteSelect)
+                    and form.instance._meta.get_field(name).is_cached(form.instance)
+                ):
+                    widget.preloaded = getattr(form.instance, name)
+        return form
+
+    @property
+    def page(self):
+        self.get_queryset()
+        return self._page
+
+    @property
+    def page_links(self):
+        """(numéro, querystring) des pages voisines, les autres paramètres GET sont conservés."""
+        links = []
+        for number in self.page.paginator.get_elided_page_range(self.page.number):
+            if number == Paginator.ELLIPSIS:
+                links.append((number, None))
+                continue
+            params = self.query_params.copy()
+            params[self.page_param] = number
+            links.append((number, '?' + params.urlencode()))
+        return links
+
+
+class PaginatedTabularInline(admin.TabularInline):
+    """TabularInline qui n'affiche qu'une page d'objets liés (?<modèle>_page=N)."""
+    formset = PaginatedInlineFormSet
+    template = 'admin/edit_inline/paginated_tabular.html'
+    per_page = 20
+    extra = 0
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Relations à sélectionner dans get_queryset() (select_related) pour éviter les relectures
+        if db_field.name in self.get_autocomplete_fields(request) and 'widget' not in kwargs:
+            kwargs['widget'] = PreloadedAutocompleteSelect(db_field, self.admin_site, using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        formset.per_page = self.per_page
+        formset.page_param = f'{self.model._meta.model_name}_page'
+        formset.page_number = request.GET.get(formset.page_param, 1)
+        formset.query_params = request.GET
+        return formset
+
+
+def related_id_filter(field_name, title):
+    """
+    Filtre de changelist sur une clé étrangère, par identifiant (?<champ>=<id>).
+    Contrairement à list_filter = ('project',), aucune liste de valeurs n'est chargée :
+    seule la valeur sélectionnée est affichée.
+    """
+
+    class RelatedIdFilter(admin.SimpleListFilter):
+        parameter_name = field_name
+
+        def lookups(self, request, model_admin):
+            value = self.value()
+            if not value or not value.isdigit():
+                return []
+            related_model = model_admin.model._meta.get_field(field_name).related_model
+            related = related_model._base_manager.filter(pk=value).first()
+            return [(value, str(related))] if related else []
+
+        def queryset(self, request, queryset):
+            value = self.value()
+            if value and value.isdigit():
+                return queryset.filter(**{f'{field_name}_id': value})
+            return queryset
+
+    RelatedIdFilter.title = title
+    return RelatedIdFilter
@@ -0,0 +1,168 @@
+"""
+Compression des réponses (gzip, ou brotli si le paquet `brotli` est installé).
+
+L'encodage est négocié sur Accept-Encoding (brotli préféré à qualité égale).
+Ne sont compressées que les réponses d'un type textuel (JSON, texte, XML...)
+d'au moins COMPRESSION_MIN_SIZE octets, sans Content-Encoding ni
+"Cache-Control: no-transform". Le HTML est exclu : les pages de l'admin et de
+connexion portent un jeton CSRF que la compression exposerait à BREACH
+(GZipMiddleware de Django le masque, pas ce middleware). Les réponses en flux (StreamingHttpResponse)
+sont compressées morceau par morceau : chaque morceau est vidé (sync flush)
+pour que le client le reçoive sans attendre la fin du flux.
+
+`manage.py bench_compression` compare taux de compression et débit CPU des
+niveaux gzip et qualités brotli sur des réponses JSON représentatives.
+"""
+import re
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # dépendance optionnelle
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(r'^(text/(?!html\b)|application/([\w.+-]*\+)?(json|javascript|xml|x-ndjson)\b)')
+NO_TRANSFORM = re.compile(r'\bno-transform\b', re.IGNORECASE)
+
+
+def available_encodings():
+    """Encodages proposés, par ordre de préférence."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate_encoding(accept_encoding, encodings=None):
+    """Encodage à utiliser selon l'en-tête Accept-Encoding, ou None (identity)."""
+    encodings = encodings or available_encodings()
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        match = re.search(r'q=([\d.]+)', params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = weights.get(encoding, weights.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class GzipEncoder:
+    def __init__(self, level):
+        # wbits = 16 + MAX_WBITS : en-tête et somme de contrôle gzip
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data)
+
+    def flush(self):
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data)
+
+    def flush(self):
+        return self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def get_encoder(encoding):
+    if encoding == 'br':
+        return BrotliEncoder(getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 4))
+    return GzipEncoder(getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6))
+
+
+def compress_bytes(encoding, data):
+    encoder = get_encoder(encoding)
+    return encoder.compress(data) + encoder.finish()
+
+
+def compress_stream(encoding, chunks):
+    encoder = get_encoder(encoding)
+    for chunk in chunks:
+        data = encoder.compress(chunk) + encoder.flush()
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+async def compress_async_stream(encoding, chunks):
+    encoder = get_encoder(encoding)
+    async for chunk in chunks:
+        data = encoder.compress(chunk) + encoder.flush()
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+def is_compressible(response):
+    if response.has_header('Content-Encoding'):
+        return False
+    if NO_TRANSFORM.search(response.get('Cache-Control', '')):
+        return False
+    return bool(COMPRESSIBLE_TYPES.match(response.get('Content-Type', '').lower()))
+
+
+class CompressionMiddleware:
+    """Compresse les réponses textuelles selon Accept-Encoding (COMPRESSION_ENABLED)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'COMPRESSION_ENABLED', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not is_compressible(response):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(encoding, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(encoding, response.streaming_content)
+            # Taille compressée inconnue avant la fin du flux
+            del response.headers['Content-Length']
+        else:
+            compressed = compress_bytes(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # Les octets changent : un ETag fort devient faible (RFC 9110, 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,138 @@
+"""
+Métriques par endpoint, exposées au format Prometheus sur /metrics.
+
+Pour chaque requête, le middleware enregistre, par nom d'URL résolu
+(ex. project-issues-list) : la latence, le nombre de requêtes SQL, leur durée
+totale et la taille de la réponse. Les histogrammes sont gardés en mémoire
+dans le processus (compteurs par tranche, sans conservation des mesures).
+
+METRICS_ENABLED=false retire le middleware de la chaîne (MiddlewareNotUsed) :
+aucun coût quand les métriques sont désactivées.
+"""
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    """Histogramme cumulatif à tranches fixes, une série par valeur d'étiquette."""
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label)
+            if series is None:
+                # [compteurs par tranche (+Inf en dernier), somme, nombre]
+                series = self._series[label] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        """Lignes au format texte Prometheus."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {label: (list(counts), total, count) for label, (counts, total, count) in self._series.items()}
+        for label, (counts, total, count) in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{endpoint="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{endpoint="{label}"}} {total}')
+            lines.append(f'{self.name}_count{{endpoint="{label}"}} {count}')
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    'softdesk_request_duration_seconds', "Durée de traitement de la requête", LATENCY_BUCKETS
+)
+DB_QUERY_COUNT = Histogram(
+    'softdesk_db_queries_per_request', "Nombre de requêtes SQL par requête HTTP", QUERY_COUNT_BUCKETS
+)
+DB_QUERY_TIME = Histogram(
+    'softdesk_db_query_duration_seconds', "Durée totale des requêtes SQL par requête HTTP", LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    'softdesk_response_size_bytes', "Taille du corps de la réponse", SIZE_BUCKETS
+)
+HISTOGRAMS = (REQUEST_LATENCY, DB_QUERY_COUNT, DB_QUERY_TIME, RESPONSE_SIZE)
+
+
+class QueryStats:
+    """execute_wrapper qui compte les requêtes SQL et cumule leur durée."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        endpoint = (match.url_name or match.view_name) if match else 'unmatched'
+        REQUEST_LATENCY.observe(endpoint, elapsed)
+        DB_QUERY_COUNT.observe(endpoint, stats.count)
+        DB_QUERY_TIME.observe(endpoint, stats.duration)
+        if not response.streaming:
+            RESPONSE_SIZE.observe(endpoint, len(response.content))
+        return response
+
+
+def metrics_view(request):
+    """
+    Exposition Prometheus, protégée par le jeton Bearer METRICS_TOKEN. Sans jeton
+    configuré, l'endpoint n'est ouvert qu'en DEBUG (404 sinon).
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            return HttpResponseNotFound()
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.expose())
+    return HttpResponse('\n'.join(lines) + '\n', content_type='text/plain; version=0.0.4; charset=utf-8')
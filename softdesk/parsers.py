@@ -0,0 +1,193 @@
+"""
+Parsers en flux pour les imports en masse.
+
+Le JSONParser de DRF lit tout le corps puis construit tous les objets Python.
+Ici, parse() renvoie un itérateur : le corps est lu par blocs de
+BULK_READ_SIZE octets et chaque élément est décodé à la demande, depuis un
+tableau JSON de premier niveau (application/json) ou du NDJSON (un objet par
+ligne, application/x-ndjson). La mémoire occupée est bornée par la taille d'un
+bloc et d'un élément, quelle que soit la taille du corps.
+
+Limites (réponse 413) : BULK_MAX_BODY_BYTES pour le corps, BULK_MAX_ITEM_BYTES
+pour un élément, BULK_MAX_ITEMS pour le nombre d'éléments. Les erreurs de
+syntaxe (400) sont détectées en arrivant à l'élément fautif : import_issues
+(projects/bulk.py) valide chaque élément et le recopie dans un fichier
+temporaire au fil de la lecture, puis n'ouvre la transaction d'insertion
+qu'une fois le corps entièrement lu et validé.
+"""
+import codecs
+import json
+import re
+
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.parsers import BaseParser
+
+BULK_READ_SIZE = 64 * 1024
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+# Une erreur de décodage plus loin que ceci de la fin du tampon ne peut pas venir d'une
+# valeur coupée entre deux blocs (plus longs jetons partiels : "-Infinity", "\uXXXX")
+TRUNCATION_SLACK = 16
+
+
+class PayloadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Corps de requête trop volumineux."
+    default_code = 'payload_too_large'
+
+
+def bulk_limits():
+    return {
+        'max_body_bytes': getattr(settings, 'BULK_MAX_BODY_BYTES', 50 * 1024 * 1024),
+        'max_item_bytes': getattr(settings, 'BULK_MAX_ITEM_BYTES', 64 * 1024),
+        'max_items': getattr(settings, 'BULK_MAX_ITEMS', 100_000),
+    }
+
+
+class BodyReader:
+    """Lit le flux par blocs, décode l'UTF-8 et compte les octets lus."""
+
+    def __init__(self, stream, max_body_bytes, read_size=BULK_READ_SIZE):
+        self.stream = stream
+        self.max_body_bytes = max_body_bytes
+        self.read_size = read_size
+        self.total = 0
+        self.eof = False
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def read(self):
+        data = self.stream.read(self.read_size)
+        self.eof = not data
+        self.total += len(data)
+        if self.total > self.max_body_bytes:
+            raise PayloadTooLarge(f"Le corps dépasse {self.max_body_bytes} octets.")
+        try:
+            return self._decoder.decode(data, final=self.eof)
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"Encodage invalide, UTF-8 attendu : {exc}")
+
+
+def iter_json_array(reader, max_item_bytes):
+    """Éléments d'un tableau JSON de premier niveau, décodés un à un."""
+    decoder = json.JSONDecoder()
+    buffer, pos = '', 0
+    state = 'start'  # start : '[' attendu ; first : valeur ou ']' ; next : ',' ou ']' ; item : valeur
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if reader.eof:
+                raise ParseError("JSON incomplet : tableau non terminé." if state != 'start' else "Corps vide.")
+            buffer, pos = reader.read(), 0
+            continue
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise ParseError("Un tableau JSON est attendu.")
+            pos += 1
+            state = 'first'
+        elif state in ('first', 'next') and char == ']':
+            _expect_end(reader, buffer[pos + 1:])
+            return
+        elif state == 'next':
+            if char != ',':
+                raise ParseError("',' ou ']' attendu entre les éléments.")
+            pos += 1
+            state = 'item'
+        else:
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    # Erreur au milieu du tampon : inutile de lire la suite du corps
+                    if reader.eof or not _may_be_truncated(exc, buffer):
+                        raise ParseError(f"JSON invalide : {exc}")
+                    end = None
+                # Une valeur qui touche la fin du tampon peut continuer dans le bloc suivant
+                if end is not None and (end < len(buffer) or reader.eof):
+                    break
+                if len(buffer) - pos > max_item_bytes:
+                    raise PayloadTooLarge(f"Un élément dépasse {max_item_bytes} octets.")
+                buffer, pos = buffer[pos:] + reader.read(), 0
+            # Un élément contenu dans un seul bloc n'est pas passé par le contrôle ci-dessus
+            if end - pos > max_item_bytes:
+                raise PayloadTooLarge(f"Un élément dépasse {max_item_bytes} octets.")
+            yield item
+            pos = end
+            state = 'next'
+
+
+def _may_be_truncated(exc, buffer):
+    """Vrai si l'erreur peut venir d'une valeur dont la suite est dans le bloc suivant."""
+    return exc.msg.startswith('Unterminated string') or len(buffer) - exc.pos <= TRUNCATION_SLACK
+
+
+def _expect_end(reader, rest):
+    while True:
+        if rest.strip():
+            raise ParseError("Données inattendues après le tableau JSON.")
+        if reader.eof:
+            return
+        rest = reader.read()
+
+
+def iter_ndjson(reader, max_item_bytes):
+    """Un objet JSON par ligne ; les lignes vides sont ignorées."""
+    buffer = ''
+    line_number = 0
+    while True:
+        newline = buffer.find('\n')
+        if newline == -1:
+            if len(buffer) > max_item_bytes:
+                raise PayloadTooLarge(f"Une ligne dépasse {max_item_bytes} octets.")
+            if reader.eof:
+                line, buffer = buffer, None
+            else:
+                buffer += reader.read()
+                continue
+        else:
+            line, buffer = buffer[:newline], buffer[newline + 1:]
+        if len(line) > max_item_bytes:
+            raise PayloadTooLarge(f"Une ligne dépasse {max_item_bytes} octets.")
+        line_number += 1
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ParseError(f"JSON invalide ligne {line_number} : {exc}")
+        if buffer is None:
+            return
+
+
+class StreamingParser(BaseParser):
+    """
+    parse() vérifie Content-Length puis renvoie un itérateur paresseux sur les éléments.
+    Les sous-classes déclarent iter_items, fonction (reader, max_item_bytes) -> itérateur.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        limits = bulk_limits()
+        request = (parser_context or {}).get('request')
+        content_length = request.META.get('CONTENT_LENGTH') if request is not None else None
+        if content_length and content_length.isdigit() and int(content_length) > limits['max_body_bytes']:
+            raise PayloadTooLarge(f"Le corps dépasse {limits['max_body_bytes']} octets.")
+        reader = BodyReader(stream, limits['max_body_bytes'])
+        return self._limit_count(self.iter_items(reader, limits['max_item_bytes']), limits['max_items'])
+
+    @staticmethod
+    def _limit_count(items, max_items):
+        for count, item in enumerate(items, start=1):
+            if count > max_items:
+                raise PayloadTooLarge(f"Plus de {max_items} éléments.")
+            yield item
+
+
+class JSONArrayStreamParser(StreamingParser):
+    media_type = 'application/json'
+    iter_items = staticmethod(iter_json_array)
+
+
+class NDJSONStreamParser(StreamingParser):
+    media_type = 'application/x-ndjson'
+    iter_items = staticmethod(iter_ndjson)
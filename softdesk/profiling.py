@@ -0,0 +1,167 @@
+"""
+Profilage à la demande de requêtes individuelles.
+
+Une requête est profilée si elle porte l'en-tête "X-Profile" ou le paramètre
+"?profile=" d'un administrateur authentifié par jeton JWT (vérifié avant de
+démarrer le profilage : pour les autres, l'en-tête est ignoré et la requête
+ne paie aucun surcoût), ou si elle est tirée au sort
+(PROFILING_SAMPLE_RATE). Deux modes :
+- "sample" (défaut) : échantillonnage statistique de la pile du thread de la
+  requête, restitué en piles repliées ("folded"), le format d'entrée de
+  flamegraph.pl / speedscope ;
+- "cprofile" : profil déterministe cProfile, restitué en texte pstats.
+
+Les derniers profils (PROFILING_MAX_PROFILES) sont gardés en mémoire et servis
+par /api/profiles/ aux administrateurs.
+"""
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404, HttpResponse
+from django.utils import timezone
+from rest_framework import permissions
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+PROFILE_MODES = ('sample', 'cprofile')
+
+_profiles = deque(maxlen=getattr(settings, 'PROFILING_MAX_PROFILES', 20))
+_profiles_lock = threading.Lock()
+_profile_ids = itertools.count(1)
+
+
+class StackSampler:
+    """Échantillonne périodiquement la pile d'un thread depuis un thread auxiliaire."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+
+    def folded(self):
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+def store_profile(request, mode, duration, output):
+    profile = {
+        'id': next(_profile_ids),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'mode': mode,
+        'duration_ms': round(duration * 1000, 2),
+        'created_time': timezone.now(),
+        'output': output,
+    }
+    with _profiles_lock:
+        _profiles.append(profile)
+    return profile
+
+
+def get_profiles():
+    with _profiles_lock:
+        return list(_profiles)
+
+
+def is_staff_request(request):
+    """
+    Vrai si la requête porte le jeton JWT d'un administrateur. Le middleware passe
+    avant l'authentification de DRF : le jeton est vérifié ici.
+    """
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return bool(authenticated and authenticated[0].is_staff)
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0.0)
+        self.interval = getattr(settings, 'PROFILING_INTERVAL_MS', 1) / 1000
+
+    def __call__(self, request):
+        requested = request.headers.get('X-Profile') or request.GET.get('profile')
+        if requested and not is_staff_request(request):
+            # Profil explicite réservé aux administrateurs : ignoré avant tout surcoût
+            requested = None
+        sampled = not requested and self.sample_rate and random.random() < self.sample_rate
+        if not (requested or sampled):
+            return self.get_response(request)
+
+        mode = requested if requested in PROFILE_MODES else 'sample'
+        start = time.perf_counter()
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+        else:
+            with StackSampler(threading.get_ident(), self.interval) as sampler:
+                response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        if mode == 'cprofile':
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(50)
+            output = stream.getvalue()
+        else:
+            output = sampler.folded()
+        profile = store_profile(request, mode, duration, output)
+        response['X-Profile-Id'] = str(profile['id'])
+        return response
+
+
+class ProfileListView(APIView):
+    """Liste des derniers profils capturés (sans leur contenu)."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response([
+            {key: value for key, value in profile.items() if key != 'output'}
+            for profile in reversed(get_profiles())
+        ])
+
+
+class ProfileDetailView(APIView):
+    """Contenu d'un profil : piles repliées (flamegraph) ou texte pstats."""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, profile_id):
+        for profile in get_profiles():
+            if profile['id'] == profile_id:
+                return HttpResponse(profile['output'], content_type='text/plain; charset=utf-8')
+        raise Http404("Profil introuvable ou expiré")
@@ -0,0 +1,166 @@
+"""
+Détection des requêtes SQL répétées (N+1) et lentes, pour le développement et la CI.
+
+- QueryRecorder : execute_wrapper qui regroupe les requêtes par "forme" SQL
+  (paramètres et listes IN normalisés) et mémorise la ligne de code du projet
+  qui a déclenché la première occurrence.
+- QueryCheckMiddleware : en développement, journalise les N+1 probables et les
+  requêtes lentes de chaque requête HTTP (QUERY_CHECK_ENABLED).
+- QueryBudgetMixin : pour les APITestCase, assertQueryBudget() fait échouer le
+  test quand un endpoint dépasse son budget de requêtes.
+"""
+import logging
+import os
+import re
+import time
+import traceback
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_NUMBER = re.compile(r'\b\d+\b')
+
+
+def get_n_plus_one_threshold():
+    return getattr(settings, 'QUERY_CHECK_N_PLUS_ONE_THRESHOLD', 3)
+
+
+def get_slow_query_seconds():
+    return getattr(settings, 'QUERY_CHECK_SLOW_MS', 100) / 1000
+
+
+def sql_shape(sql):
+    """Forme normalisée d'une requête : deux requêtes qui ne diffèrent que par leurs valeurs ont la même forme."""
+    return _NUMBER.sub('N', _IN_LIST.sub('IN (...)', sql))
+
+
+def _format_frame(frame):
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+def query_origin():
+    """
+    Origine d'une requête dans la pile d'appel : l'appelant le plus proche hors de
+    l'ORM (ex. rest_framework/fields.py pour un source='author.username') et, si
+    elle est différente, la ligne de code des applications du projet qui y mène.
+    """
+    base_dir = str(settings.BASE_DIR)
+    infrastructure = str(Path(settings.BASE_DIR) / 'softdesk')
+    caller = None
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename.startswith(infrastructure):
+            continue
+        if caller is None and f'{os.sep}django{os.sep}db{os.sep}' not in filename:
+            caller = frame
+        # Code des applications uniquement (pas manage.py ni les dépendances)
+        if (
+            filename.startswith(base_dir)
+            and os.path.dirname(filename) != base_dir
+            and 'site-packages' not in filename
+        ):
+            if frame is caller:
+                return _format_frame(frame)
+            return f"{_format_frame(caller)} (via {_format_frame(frame)})"
+    return _format_frame(caller) if caller else "origine inconnue"
+
+
+class QueryShape:
+    def __init__(self, sql, origin):
+        self.sql = sql
+        self.origin = origin
+        self.count = 0
+        self.duration = 0.0
+
+
+class QueryRecorder:
+    """execute_wrapper qui regroupe les requêtes exécutées par forme SQL."""
+
+    def __init__(self):
+        self.shapes = {}
+        self.slow = []
+        self.total = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            shape = sql_shape(sql)
+            entry = self.shapes.get(shape)
+            if entry is None:
+                entry = self.shapes[shape] = QueryShape(sql, query_origin())
+            entry.count += 1
+            entry.duration += duration
+            self.total += 1
+            if duration >= get_slow_query_seconds():
+                self.slow.append((duration, sql))
+
+    def repeated(self, threshold=None):
+        """Formes exécutées au moins `threshold` fois : N+1 probables."""
+        threshold = threshold or get_n_plus_one_threshold()
+        return sorted(
+            (shape for shape in self.shapes.values() if shape.count >= threshold),
+            key=lambda shape: shape.count,
+            reverse=True,
+        )
+
+    def report(self, threshold=None):
+        lines = [f"{self.total} requête(s) SQL"]
+        for shape in self.repeated(threshold):
+            lines.append(f"  N+1 probable : {shape.count}x ({shape.duration * 1000:.1f}ms) depuis {shape.origin}")
+            lines.append(f"    {shape.sql[:300]}")
+        for duration, sql in self.slow:
+            lines.append(f"  Requête lente ({duration * 1000:.1f}ms) : {sql[:300]}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def record_queries():
+    """Enregistre les requêtes exécutées sur toutes les bases pendant le bloc."""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+class QueryCheckMiddleware:
+    """Journalise les N+1 probables et requêtes lentes (outil de développement)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_CHECK_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        if recorder.repeated() or recorder.slow:
+            logger.warning("%s %s\n%s", request.method, request.path, recorder.report())
+        response['X-Query-Count'] = str(recorder.total)
+        return response
+
+
+class QueryBudgetMixin:
+    """Mixin d'APITestCase : vérifie le budget de requêtes SQL d'un bloc de code."""
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_repeats=None):
+        """
+        Échoue si le bloc exécute plus de `max_queries` requêtes, ou si une même
+        forme de requête est répétée plus de `max_repeats` fois (N+1).
+        """
+        with record_queries() as recorder:
+            yield recorder
+        if recorder.total > max_queries:
+            self.fail(f"Budget dépassé : {recorder.total} > {max_queries} requêtes\n{recorder.report()}")
+        if max_repeats is not None and recorder.repeated(max_repeats + 1):
+            self.fail(f"Requêtes répétées plus de {max_repeats} fois\n{recorder.report(max_repeats + 1)}")
@@ -0,0 +1,116 @@
+"""
+Routage des lectures vers les réplicas.
+
+Seules les actions list/retrieve des vues qui utilisent ReplicaReadMixin lisent
+sur un réplica. Après une écriture, l'utilisateur est "épinglé" sur la base
+principale pendant REPLICA_PIN_SECONDS pour relire ses propres écritures
+malgré le retard de réplication. L'épinglage est stocké dans le cache
+REPLICA_PIN_CACHE_ALIAS, partagé entre les processus.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_READ_ACTIONS = ('list', 'retrieve')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def get_replicas():
+    return getattr(settings, 'REPLICA_DATABASES', [])
+
+
+def get_pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+@contextmanager
+def replica_reads():
+    """Dans ce bloc, les lectures de l'ORM sont envoyées vers un réplica."""
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Dans ce bloc, les lectures de l'ORM restent sur la base principale."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def _pin_cache():
+    return caches[getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', 'default')]
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def pin_to_primary(user):
+    """Marqueur de courte durée : les prochaines lectures de l'utilisateur se font sur la base principale."""
+    if get_replicas():
+        _pin_cache().set(_pin_key(user.pk), True, get_pin_seconds())
+
+
+def is_pinned_to_primary(user):
+    return bool(get_replicas()) and _pin_cache().get(_pin_key(user.pk), False)
+
+
+class ReplicaRouter:
+    """Router Django : lectures vers un réplica dans replica_reads(), écritures toujours sur 'default'."""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if replicas and _use_replica.get():
+            return random.choice(replicas)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {'default', *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Mixin de vue DRF : les lectures list/retrieve passent par un réplica,
+    sauf si l'utilisateur vient d'écrire (lecture de ses propres écritures).
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        action = getattr(self, 'action', None) or 'list'
+        if (
+            request.method in SAFE_METHODS
+            and action in REPLICA_READ_ACTIONS
+            and not (request.user.is_authenticated and is_pinned_to_primary(request.user))
+        ):
+            self._replica_token = _use_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _use_replica.reset(token)
+            self._replica_token = None
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
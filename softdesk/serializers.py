@@ -0,0 +1,53 @@
+"""
+Outils de serializers partagés par les applications.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.utils import model_meta
+
+
+class ChangedFieldsUpdateMixin:
+    """
+    Mixin de ModelSerializer : update() n'écrit que les colonnes dont la valeur
+    change (save(update_fields=...)), et n'écrit rien si rien ne change. Un PATCH
+    de "status" n'envoie donc qu'un UPDATE de cette colonne : moins d'écritures,
+    de verrous et de trafic de réplication sur les lignes très modifiées.
+
+    get_update_fields() permet d'ajouter les colonnes dérivées des champs modifiés.
+    Les champs auto_now ne sont pas ajoutés automatiquement.
+    """
+
+    def update(self, instance, validated_data):
+        return self.save_changes(instance, validated_data)
+
+    def save_changes(self, instance, validated_data, changed=()):
+        """Applique validated_data ; `changed` : champs déjà modifiés par l'appelant."""
+        info = model_meta.get_field_info(instance)
+        changed = set(changed)
+        many_to_many = []
+        full_save = False
+        for attr, value in validated_data.items():
+            if attr in info.relations and info.relations[attr].to_many:
+                many_to_many.append((attr, value))
+                continue
+            try:
+                field = instance._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # Attribut calculé (propriété...) : colonnes touchées inconnues
+                setattr(instance, attr, value)
+                full_save = True
+                continue
+            before = getattr(instance, field.attname)
+            setattr(instance, attr, value)
+            if getattr(instance, field.attname) != before:
+                changed.add(field.name)
+
+        if full_save:
+            instance.save()
+        elif changed:
+            instance.save(update_fields=self.get_update_fields(instance, changed))
+        for attr, value in many_to_many:
+            getattr(instance, attr).set(value)
+        return instance
+
+    def get_update_fields(self, instance, changed):
+        return changed
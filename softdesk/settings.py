@@ -10,11 +10,19 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
+import sys
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+from dotenv import load_dotenv
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Variables d'environnement (profil de base de données, etc.) lues depuis le fichier .env
+load_dotenv(BASE_DIR / '.env')
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -42,6 +50,7 @@ INSTALLED_APPS = [
     'corsheaders',
     'users.apps.UsersConfig',
     'projects.apps.ProjectsConfig',
+    'jobs.apps.JobsConfig',
 ]
 
 
@@ -68,6 +77,13 @@ CORS_ALLOWED_ORIGINS = ['http://localhost:8000']
 AUTH_USER_MODEL = 'users.User'
 
 MIDDLEWARE = [
+    # En premier pour mesurer toute la chaîne (désactivable via METRICS_ENABLED)
+    'softdesk.metrics.MetricsMiddleware',
+    # Juste après les métriques : elles mesurent la taille compressée (COMPRESSION_ENABLED)
+    'softdesk.compression.CompressionMiddleware',
+    # Outil de développement : N+1 et requêtes lentes (QUERY_CHECK_ENABLED)
+    'softdesk.querycheck.QueryCheckMiddleware',
+    'softdesk.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -77,12 +93,52 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Métriques Prometheus exposées sur /metrics
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+# Jeton exigé pour lire /metrics (en-tête "Authorization: Bearer <jeton>") ; sans jeton, /metrics
+# n'est ouvert qu'avec DEBUG
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Imports en masse (POST .../issues/bulk/) : limites du corps lu en flux et taille des paquets insérés
+BULK_MAX_BODY_BYTES = int(os.getenv('BULK_MAX_BODY_BYTES', str(50 * 1024 * 1024)))
+BULK_MAX_ITEM_BYTES = int(os.getenv('BULK_MAX_ITEM_BYTES', str(64 * 1024)))
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '100000'))
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', '500'))
+# Ajout de contributeurs en masse (POST .../contributors/bulk/) : utilisateurs par appel
+CONTRIBUTOR_BULK_MAX = int(os.getenv('CONTRIBUTOR_BULK_MAX', '500'))
+
+# Historique d'activité : événements écrits par lots (taille du tampon, âge maximal en secondes)
+ACTIVITY_BUFFER_SIZE = int(os.getenv('ACTIVITY_BUFFER_SIZE', '100'))
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL', '2.0'))
+# Vidage par minuteur et à l'arrêt du processus (désactivé par le lanceur de tests)
+ACTIVITY_BACKGROUND_FLUSH = os.getenv('ACTIVITY_BACKGROUND_FLUSH', 'true').lower() == 'true'
+# Jours gardés dans la table chaude avant archivage (manage.py archive_activity)
+ACTIVITY_HOT_DAYS = int(os.getenv('ACTIVITY_HOT_DAYS', '90'))
+
+# Compression gzip/brotli des réponses textuelles (brotli si le paquet est installé)
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+
+# Détection des N+1 et requêtes lentes, activée par défaut en mode DEBUG
+QUERY_CHECK_ENABLED = os.getenv('QUERY_CHECK_ENABLED', str(DEBUG)).lower() == 'true'
+QUERY_CHECK_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_CHECK_N_PLUS_ONE_THRESHOLD', '3'))
+QUERY_CHECK_SLOW_MS = int(os.getenv('QUERY_CHECK_SLOW_MS', '100'))
+
+# Profilage de requêtes : X-Profile / ?profile= pour les administrateurs, ou tirage au sort
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'true').lower() == 'true'
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_INTERVAL_MS = float(os.getenv('PROFILING_INTERVAL_MS', '1'))
+PROFILING_MAX_PROFILES = int(os.getenv('PROFILING_MAX_PROFILES', '20'))
+
 ROOT_URLCONF = 'softdesk.urls'
 
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        # Gabarits partagés (inline paginé de softdesk/admin_tools.py)
+        'DIRS': [BASE_DIR / 'softdesk' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -101,8 +157,116 @@ WSGI_APPLICATION = 'softdesk.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': BASE_DIR / 'db.sqlite3'}}
+# Profil choisi par la variable DB_ENGINE : "sqlite" (par défaut, développement) ou "postgresql" (production).
+# Voir .env.example pour la liste des variables.
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+# "manage.py test" tourne sur SQLite en mémoire quel que soit le profil (la base de test
+# SQLite est créée en mémoire par Django), sauf TEST_DB_PROFILE=true pour tester le profil réel.
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+if TESTING and os.getenv('TEST_DB_PROFILE', 'false').lower() != 'true':
+    DB_ENGINE = 'sqlite'
+
+if DB_ENGINE == 'postgresql':
+    DB_POOL = os.getenv('DB_POOL', 'false').lower() == 'true'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.getenv('DB_NAME', 'softdesk'),
+            'USER': os.getenv('DB_USER', 'softdesk'),
+            'PASSWORD': os.getenv('DB_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # Connexions persistantes : incompatibles avec le pool natif de Django 5.1
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', '60')),
+            # Vérifie qu'une connexion réutilisée est toujours valide avant la requête
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if DB_POOL:
+        # Pool natif (psycopg 3 + psycopg_pool requis)
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+        }
+else:
+    DATABASES = {
+        'default': {
+            # Backend SQLite avec file d'écriture par processus (softdesk/sqlite/base.py)
+            'ENGINE': 'softdesk.sqlite',
+            'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '0')),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                # Réglages appliqués à chaque ouverture de connexion
+                'init_command': ';'.join([
+                    'PRAGMA journal_mode=WAL',
+                    'PRAGMA synchronous=NORMAL',
+                    f"PRAGMA mmap_size={os.getenv('DB_SQLITE_MMAP_SIZE', str(256 * 1024 * 1024))}",
+                    # Valeur négative : taille du cache en Kio
+                    f"PRAGMA cache_size={os.getenv('DB_SQLITE_CACHE_SIZE', '-65536')}",
+                    f"PRAGMA busy_timeout={os.getenv('DB_SQLITE_BUSY_TIMEOUT', '5000')}",
+                    'PRAGMA temp_store=MEMORY',
+                ]),
+                # Le verrou d'écriture est pris dès le BEGIN : pas d'échec lors du passage lecture -> écriture
+                'transaction_mode': 'IMMEDIATE',
+                'serialize_writes': os.getenv('DB_SQLITE_SERIALIZE_WRITES', 'true').lower() == 'true',
+            },
+        }
+    }
 
+# Réplicas en lecture : DB_REPLICAS liste, séparés par des virgules, les fichiers SQLite
+# (profil sqlite) ou les hôtes PostgreSQL (profil postgresql) à utiliser en lecture.
+REPLICA_DATABASES = []
+for index, replica in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(',')), start=1):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        ('HOST' if DB_ENGINE == 'postgresql' else 'NAME'): replica.strip(),
+        # En test, les réplicas pointent sur la base de test principale
+        'TEST': {'MIRROR': 'default'},
+    }
+    REPLICA_DATABASES.append(alias)
+
+DATABASE_ROUTERS = ['softdesk.routers.ReplicaRouter']
+# Durée (s) pendant laquelle un utilisateur relit sur la base principale après une écriture
+REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '5'))
+
+# Caches : "default", "replica_pins" (épinglage sur la base principale, softdesk/routers.py)
+# et "objects" (représentations sérialisées, projects/caching.py). Les variables *_BACKEND
+# et *_LOCATION permettent de les passer sur Redis ou Memcached pour les partager entre processus.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'replica_pins': {
+        'BACKEND': os.getenv('REPLICA_PIN_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('REPLICA_PIN_CACHE_LOCATION', 'replica-pins'),
+    },
+    'objects': {
+        'BACKEND': os.getenv('OBJECT_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('OBJECT_CACHE_LOCATION', 'objects'),
+        'TIMEOUT': int(os.getenv('OBJECT_CACHE_TIMEOUT', '300')),
+        # LocMemCache : éviction LRU au-delà de MAX_ENTRIES
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('OBJECT_CACHE_MAX_ENTRIES', '10000'))},
+    },
+}
+OBJECT_CACHE_ALIAS = 'objects'
+REPLICA_PIN_CACHE_ALIAS = 'replica_pins'
+# L'épinglage doit être vu par tous les processus : un cache propre au processus ne
+# garantirait la relecture de ses écritures que si la requête suivante tombe sur le même
+if REPLICA_DATABASES and CACHES[REPLICA_PIN_CACHE_ALIAS]['BACKEND'].endswith('LocMemCache'):
+    raise ImproperlyConfigured(
+        "DB_REPLICAS exige un cache partagé entre processus pour l'épinglage : "
+        "définir REPLICA_PIN_CACHE_BACKEND et REPLICA_PIN_CACHE_LOCATION (Redis, Memcached, fichiers...)"
+    )
+
+# Noms d'utilisateur / titres d'issue recopiés sur les lignes enfants (projects/denormalization.py).
+# Après activation : python manage.py sync_display_fields
+DENORMALIZE_DISPLAY_FIELDS = os.getenv('DENORMALIZE_DISPLAY_FIELDS', 'false').lower() == 'true'
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -115,6 +279,13 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+if TESTING:
+    # Hachage volontairement faible : create_user() est appelé dans presque chaque test
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+TEST_RUNNER = 'softdesk.test_runner.SoftdeskTestRunner'
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
@@ -0,0 +1,94 @@
+"""
+Backend SQLite avec file d'écriture au niveau du processus.
+
+SQLite n'accepte qu'un écrivain à la fois : plusieurs threads qui écrivent en
+même temps finissent en "database is locked". Ce backend fait patienter les
+écritures d'un même processus derrière un verrou, de BEGIN jusqu'au COMMIT/ROLLBACK
+pour les transactions, et autour de la requête pour les écritures en autocommit.
+Les lectures ne sont jamais bloquées (mode WAL).
+
+Options supplémentaires dans DATABASES[...]['OPTIONS'] :
+- serialize_writes (bool, True par défaut) : active la file d'écriture ;
+- write_lock_timeout (secondes, 5 par défaut) : attente maximum du verrou.
+"""
+import threading
+
+from django.db.backends.sqlite3 import base
+from django.db.utils import OperationalError
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def get_write_lock(name):
+    """Verrou d'écriture partagé par toutes les connexions du processus vers la même base."""
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(name), threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        options = self.settings_dict['OPTIONS']
+        self.serialize_writes = options.get('serialize_writes', True)
+        self.write_lock_timeout = options.get('write_lock_timeout', 5)
+        self.write_lock = get_write_lock(self.settings_dict['NAME'])
+        self.holds_write_lock = False
+        if self.serialize_writes:
+            self.execute_wrappers.append(self._serialize_autocommit_write)
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        kwargs.pop('serialize_writes', None)
+        kwargs.pop('write_lock_timeout', None)
+        return kwargs
+
+    def _acquire_write_lock(self):
+        if not self.write_lock.acquire(timeout=self.write_lock_timeout):
+            raise OperationalError("database is locked (file d'écriture saturée)")
+        self.holds_write_lock = True
+
+    def _release_write_lock(self):
+        if self.holds_write_lock:
+            self.holds_write_lock = False
+            self.write_lock.release()
+
+    def _serialize_autocommit_write(self, execute, sql, params, many, context):
+        # Dans une transaction, le verrou est déjà détenu depuis le BEGIN
+        if not self.autocommit or not sql.lstrip()[:7].upper().startswith(WRITE_STATEMENTS):
+            return execute(sql, params, many, context)
+        self._acquire_write_lock()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self._release_write_lock()
+
+    def _start_transaction_under_autocommit(self):
+        if not self.serialize_writes:
+            return super()._start_transaction_under_autocommit()
+        self._acquire_write_lock()
+        try:
+            super()._start_transaction_under_autocommit()
+        except Exception:
+            self._release_write_lock()
+            raise
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self._release_write_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self._release_write_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self._release_write_lock()
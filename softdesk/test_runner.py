@@ -0,0 +1,106 @@
+"""
+Lanceur de tests du projet : DiscoverRunner de Django + rapport des tests les plus lents.
+
+Les durées sont mesurées dans le processus qui exécute le test ; avec --parallel,
+elles remontent au processus principal via les événements du RemoteTestResult.
+"""
+import time
+import unittest
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner, ParallelTestSuite, RemoteTestResult, RemoteTestRunner
+
+# Python >= 3.12 appelle lui-même addDuration() à la fin de chaque test
+NATIVE_DURATIONS = hasattr(unittest.TestResult, 'addDuration')
+
+
+class TimingMixin:
+    """Chronomètre chaque test et transmet la durée à addDuration()"""
+    # Vrai dans le processus principal avec --parallel : startTest/stopTest y sont rejoués
+    # à partir des événements des workers, qui envoient déjà leurs durées
+    remote_replay = False
+
+    def startTest(self, test):
+        self._test_started = time.perf_counter()
+        super().startTest(test)
+
+    def stopTest(self, test):
+        if not NATIVE_DURATIONS and not self.remote_replay:
+            self.addDuration(test, time.perf_counter() - self._test_started)
+        super().stopTest(test)
+
+
+class TimedTextTestResult(TimingMixin, unittest.TextTestResult):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.test_durations = []
+
+    def addDuration(self, test, elapsed):
+        if NATIVE_DURATIONS:
+            super().addDuration(test, elapsed)
+        self.test_durations.append((test.id(), elapsed))
+
+
+class TimedRemoteTestResult(TimingMixin, RemoteTestResult):
+    def addDuration(self, test, elapsed):
+        if NATIVE_DURATIONS:
+            super().addDuration(test, elapsed)
+        else:
+            self.events.append(('addDuration', self.test_index, elapsed))
+
+
+class TimedRemoteTestRunner(RemoteTestRunner):
+    resultclass = TimedRemoteTestResult
+
+
+class TimedParallelTestSuite(ParallelTestSuite):
+    runner_class = TimedRemoteTestRunner
+
+    def run(self, result):
+        result.remote_replay = True
+        return super().run(result)
+
+
+class SoftdeskTestRunner(DiscoverRunner):
+    """DiscoverRunner qui affiche les N tests les plus lents (--slowest N, 0 pour désactiver)"""
+
+    parallel_test_suite = TimedParallelTestSuite
+
+    def __init__(self, slowest=10, **kwargs):
+        super().__init__(**kwargs)
+        self.slowest = slowest
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--slowest', type=int, default=10,
+            help="Nombre de tests les plus lents à afficher (0 pour désactiver).",
+        )
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        # Le détecteur de N+1 (activé par DEBUG) écrirait ses avertissements dans la sortie
+        # de la suite ; les tests vérifient les requêtes avec assertQueryBudget()
+        settings.QUERY_CHECK_ENABLED = False
+        # Un minuteur écrirait l'historique depuis un autre thread, et le vidage à l'arrêt
+        # viserait la base de développement une fois la base de test détruite
+        settings.ACTIVITY_BACKGROUND_FLUSH = False
+
+    def get_resultclass(self):
+        return super().get_resultclass() or TimedTextTestResult
+
+    def run_suite(self, suite, **kwargs):
+        result = super().run_suite(suite, **kwargs)
+        durations = getattr(result, 'test_durations', None)
+        if self.slowest and durations:
+            self.log(self.format_slowest(durations, self.slowest))
+        return result
+
+    @staticmethod
+    def format_slowest(durations, count):
+        lines = [f"\nTests les plus lents ({min(count, len(durations))}/{len(durations)}) :"]
+        for test_id, elapsed in sorted(durations, key=lambda item: item[1], reverse=True)[:count]:
+            lines.append(f"  {elapsed * 1000:8.1f} ms  {test_id}")
+        lines.append(f"  Total mesuré : {sum(elapsed for _, elapsed in durations):.2f} s")
+        return '\n'.join(lines)
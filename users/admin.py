@@ -1,7 +1,18 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
+from softdesk.admin_tools import EstimatedCountPaginator
 from users.models import User
 
 # Register your models here.
 
-admin.site.register(User)
+
+@admin.register(User)
+class UserAdmin(BaseUserAdmin):
+    fieldsets = BaseUserAdmin.fieldsets + (
+        ("Profil", {'fields': ('date_of_birth', 'can_be_contacted', 'can_data_be_shared')}),
+    )
+    # search_fields sert aussi aux widgets d'autocomplétion des autres admins
+    search_fields = ('username', 'email')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,12 @@
+from rest_framework.pagination import CursorPagination
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Pagination keyset par id pour la liste des utilisateurs (staff).
+    Pas de OFFSET ni de COUNT(*) : une page coûte le même prix sur des millions de comptes.
+    """
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    ordering = ('id',)
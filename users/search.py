@@ -0,0 +1,51 @@
+"""
+Recherche d'utilisateurs par nom (liste staff de /api/users/).
+
+- ?search=<préfixe> : username__startswith. Sur PostgreSQL, le LIKE 'abc%' est servi
+  par l'index varchar_pattern_ops (*_like) que Django crée pour la colonne unique.
+  Sur SQLite, LIKE ignore la casse et n'utilise pas l'index : on y emploie l'intervalle
+  username >= préfixe AND username < borne, exact sous la collation binaire de SQLite
+  (il ne l'est pas sous une collation de locale, d'où son usage réservé à SQLite).
+- ?contains=<texte> : sous-chaîne insensible à la casse, servie par l'index trigramme
+  (pg_trgm) sur PostgreSQL ; parcours de table sur SQLite.
+"""
+import sys
+
+from django.db import connections
+from rest_framework.exceptions import ValidationError
+
+CONTAINS_MIN_LENGTH = 3
+SURROGATES = range(0xD800, 0xE000)
+
+
+def prefix_upper_bound(prefix):
+    """
+    Plus petite chaîne supérieure à toutes celles qui commencent par `prefix`,
+    ou None s'il n'y en a pas (préfixe fait uniquement de U+10FFFF).
+    """
+    prefix = prefix.rstrip(chr(sys.maxunicode))
+    if not prefix:
+        return None
+    code = ord(prefix[-1]) + 1
+    # Les demi-codets ne sont pas encodables en UTF-8 : on passe au premier caractère suivant
+    if code in SURROGATES:
+        code = SURROGATES.stop
+    return prefix[:-1] + chr(code)
+
+
+def filter_by_username(queryset, search=None, contains=None):
+    if search:
+        if connections[queryset.db].vendor == 'sqlite':
+            queryset = queryset.filter(username__gte=search)
+            bound = prefix_upper_bound(search)
+            if bound is not None:
+                queryset = queryset.filter(username__lt=bound)
+        else:
+            queryset = queryset.filter(username__startswith=search)
+    if contains:
+        if len(contains) < CONTAINS_MIN_LENGTH:
+            raise ValidationError(
+                {'contains': f"Au moins {CONTAINS_MIN_LENGTH} caractères (recherche par trigrammes)"}
+            )
+        queryset = queryset.filter(username__icontains=contains)
+    return queryset
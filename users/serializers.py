@@ -3,9 +3,11 @@ from datetime import date
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
+from softdesk.serializers import ChangedFieldsUpdateMixin
+
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(ChangedFieldsUpdateMixin, serializers.ModelSerializer):
     id = serializers.IntegerField(read_only=True)
     username = serializers.CharField(
         required=True,
@@ -93,13 +95,23 @@ class UserSerializer(serializers.ModelSerializer):
         """
         Mise à jour d'un utilisateur avec hashage du mot de passe si fourni
         """
+        changed = set()
         if 'password' in validated_data:
             password = validated_data.pop('password')
             instance.set_password(password)  # Hash le mot de passe grâce à Django
-        
-        # Pour chaque champ dans l'obj validated_data je met a jour l'instance 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        
-        instance.save()
-        return instance
\ No newline at end of file
+            changed.add('password')
+
+        # Seules les colonnes dont la valeur change sont écrites (save(update_fields=...))
+        return self.save_changes(instance, validated_data, changed)
+
+
+class PublicUserSerializer(serializers.ModelSerializer):
+    """
+    Représentation publique d'un utilisateur (/api/users/batch/, ?expand=author/assignee),
+    visible de tout utilisateur authentifié : aucune donnée personnelle.
+    """
+
+    class Meta:
+        model = User
+        fields = ('id', 'username')
+        read_only_fields = fields
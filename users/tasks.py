@@ -0,0 +1,19 @@
+"""
+Tâches de fond du module utilisateurs (exécutées par manage.py runworker).
+"""
+from django.contrib.auth import get_user_model
+
+from jobs.registry import task
+from projects.deletion import delete_user
+
+User = get_user_model()
+
+
+@task('users.delete_user')
+def delete_user_task(user_id):
+    """Supprime par lots un utilisateur désactivé et ses données liées."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None:
+        return {'deleted': False}
+    delete_user(user)
+    return {'deleted': True}
@@ -1,20 +1,52 @@
+import hashlib
+import json
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from .serializers import UserSerializer
+from jobs.registry import enqueue
+from softdesk.routers import ReplicaReadMixin
+
+from .pagination import UserCursorPagination
+from .search import filter_by_username
+from .serializers import PublicUserSerializer, UserSerializer
 
 User = get_user_model()
 
+LIST_FIELDS = ('id', 'username', 'date_of_birth', 'can_be_contacted', 'can_data_be_shared')
+PUBLIC_FIELDS = ('id', 'username')
+# /api/users/batch/ : nombre maximal d'ids par requête et durée de mise en cache (s)
+USER_BATCH_MAX_IDS = getattr(settings, 'USER_BATCH_MAX_IDS', 100)
+USER_BATCH_MAX_AGE = getattr(settings, 'USER_BATCH_MAX_AGE', 3600)
+
+
+def parse_ids(raw):
+    """'1,2,3' -> [1, 2, 3] (sans doublons, ordre conservé)"""
+    try:
+        ids = list(dict.fromkeys(int(value) for value in raw.split(',') if value.strip()))
+    except ValueError:
+        raise ValidationError({'ids': "Liste d'identifiants entiers séparés par des virgules attendue"})
+    if not ids:
+        raise ValidationError({'ids': "Paramètre obligatoire"})
+    if len(ids) > USER_BATCH_MAX_IDS:
+        raise ValidationError({'ids': f"{USER_BATCH_MAX_IDS} identifiants au maximum"})
+    return ids
+
 class IsOwnerOrAdmin(IsAuthenticated):
     def has_object_permission(self, request, view, obj):
         return request.user == obj or request.user.is_staff
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    pagination_class = UserCursorPagination
 
     def get_permissions(self):
         if self.action == 'create':
@@ -42,6 +74,40 @@ class UserViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'status': 'error', 'message': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Projection légère : seules les colonnes du serializer, sans les colonnes inutilisées d'AbstractUser
+            queryset = filter_by_username(
+                queryset.only(*LIST_FIELDS),
+                search=self.request.query_params.get('search'),
+                contains=self.request.query_params.get('contains'),
+            )
+        return queryset
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def batch(self, request):
+        """
+        Résout une liste d'ids (?ids=1,2,3) en une seule requête IN.
+        Réponse d'un endpoint authentifié : mise en cache par le client seulement
+        (private, Vary: Authorization), jamais par un proxy partagé ; revalidée par ETag.
+        """
+        ids = parse_ids(request.query_params.get('ids', ''))
+        queryset = User.objects.filter(pk__in=ids).only(*PUBLIC_FIELDS)
+        users = {user.pk: user for user in queryset}
+        results = PublicUserSerializer([users[pk] for pk in ids if pk in users], many=True).data
+        payload = {'results': results, 'missing': [pk for pk in ids if pk not in users]}
+
+        etag = '"%s"' % hashlib.md5(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+        if etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(payload)
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, max_age=USER_BATCH_MAX_AGE)
+        patch_vary_headers(response, ['Authorization'])
+        return response
+
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -79,6 +145,16 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    def perform_destroy(self, instance):
+        """
+        Désactive l'utilisateur (plus de connexion possible) et planifie la suppression
+        de ses données par lots en tâche de fond. Renvoie la tâche créée.
+        """
+        with transaction.atomic():
+            instance.is_active = False
+            instance.save(update_fields=['is_active'])
+            return enqueue('users.delete_user', {'user_id': instance.pk}, user=self.request.user)
+
     def destroy(self, request, *args, **kwargs):
         try:
             instance = self.get_object()
@@ -89,10 +165,10 @@ class UserViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
                 
-            self.perform_destroy(instance)
+            job = self.perform_destroy(instance)
             return Response(
-                {'status': 'success', 'message': 'Utilisateur supprimé avec succès'},
-                status=status.HTTP_204_NO_CONTENT
+                {'status': 'success', 'message': 'Suppression de l\'utilisateur planifiée', 'job': job.pk},
+                status=status.HTTP_202_ACCEPTED
             )
         except Exception as e:
             return Response(